@@ -18,12 +18,14 @@
 # In[1]:
 
 
+import tempfile
 from pathlib import Path
 import pandas as pd
 import pandas.tseries.offsets as pd_offsets
 import numpy as np
 import plotly.graph_objects as go
 from dateutil.relativedelta import relativedelta
+from functools import partial
 from typing import Dict
 
 
@@ -31,7 +33,7 @@ from typing import Dict
 
 
 from utils.math import reindex_and_fill, reindex_and_interpolate, calc_growth, normalize
-from utils.data import download_from_fred, read_csv, merge_series
+from utils.data import download_from_fred, read_csv, merge_series, write_frame, get_download_manager, SeriesStore
 from utils.plots import draw_growth_chart, draw_telltale_chart
 
 
@@ -42,6 +44,7 @@ from utils.plots import draw_growth_chart, draw_telltale_chart
 
 raw_data_path = Path("raw_data")
 clean_data_path = Path("clean_data")
+export_excel = False
 bogleheads_yield_curve_path = raw_data_path / "bogleheads_yield_curves.xlsx"
 gs1_path = raw_data_path / "DGS1.csv"
 gs3_path = raw_data_path / "DGS3.csv"
@@ -80,6 +83,36 @@ bg_yield_curve.head()
 # 
 # On the days, where the values are missing, even through the market should have been open, there is just a dot `.` inside the dataframe. We must substitute this dot by a `NAN` value, before we fill up the gaps.
 
+# All FRED series are downloaded at once in parallel. The series are kept in a local store, so later runs only download the days, which are missing in the store.
+
+# In[ ]:
+
+
+series_store = SeriesStore(Path("cached_data") / "series")
+fred_names = ["DGS1", "DGS3", "DGS5", "DGS7", "DGS10", "DGS20", "DGS30"]
+fred_data = get_download_manager().download_all(
+    {name: partial(series_store.update, name, partial(download_from_fred, name)) for name in fred_names}
+)
+
+
+# An interrupted append can leave the values file of a series longer than its dates file. The store cuts both files to their common length before it appends again, so every value keeps its date. We check this here with a small series in a temporary store, which gets two values without dates.
+
+# In[ ]:
+
+
+with tempfile.TemporaryDirectory() as check_path:
+    check_series = pd.Series(np.arange(30.0), index=pd.date_range("2000-01-01", periods=30))
+    def fetch_check_series(length, start_date=None, refresh=False):
+        return check_series.iloc[:length].loc[start_date:]
+
+    check_store = SeriesStore(Path(check_path))
+    check_store.update("check", partial(fetch_check_series, 20))
+    with (Path(check_path) / "check.values").open("ab") as f:
+        np.array([20.0, 21.0]).tofile(f)
+    checked = check_store.update("check", partial(fetch_check_series, 25))
+    assert checked.equals(check_series.iloc[:25].rename("check")), "The store pairs values with the wrong dates."
+
+
 # In[6]:
 
 
@@ -90,7 +123,7 @@ def read_and_clean_fred_data(file_path, column_name, fred_name = None):
     gs_a = read_csv(file_path, column_name=column_name)
     gs_a = reindex_and_fill(gs_a, min(gs_a.index), max(gs_a.index), freq="D")
     
-    gs_b = download_from_fred(fred_name)
+    gs_b = fred_data[fred_name]
     gs_b = reindex_and_fill(gs_b, min(gs_b.index), max(gs_b.index), freq="D")
         
     return merge_series(gs_a, gs_b)
@@ -516,6 +549,6 @@ draw_growth_chart(
 # In[45]:
 
 
-output_file_path = clean_data_path / "yield_curve.xlsx"
-yield_curve.to_excel(output_file_path)
+output_file_path = clean_data_path / "yield_curve.npz"
+write_frame(yield_curve, output_file_path, excel=export_excel)
 
@@ -25,8 +25,9 @@ from typing import List, Optional, Dict
 
 
 from utils.plots import draw_growth_chart, draw_telltale_chart
-from utils.data import cached, read_csv
+from utils.data import read_csv, read_frame, write_frame
 from utils.math import normalize, reindex_and_fill
+from utils.bonds import simulate_bond_funds, fractional_years
 
 
 # In order to check our simulated values, we have to compare those values, with the simulated values from the backtest (https://www.bogleheads.org/forum/viewtopic.php?p=5815123#p5815123), available at bogleheads. I combined the interesting long term treasury (ltt), intermediate term treasury (itt) and short term treasury (stt) in a single excel file. The first step is to load this file and to restrict the values to the time period, which fits to our treasury yield curves.
@@ -36,6 +37,8 @@ from utils.math import normalize, reindex_and_fill
 
 raw_data_path = Path("raw_data")
 clean_data_path = Path("clean_data")
+export_excel = False
+verify_day_count = False
 cached_data_path = Path("cached_clean_data")
 
 simba_path = raw_data_path  / "simba_data.xlsx"
@@ -82,8 +85,8 @@ draw_growth_chart(
 # In[6]:
 
 
-yield_curves_path = clean_data_path / "yield_curve.xlsx"
-yields = pd.read_excel(yield_curves_path, index_col=0)
+yield_curves_path = clean_data_path / "yield_curve.npz"
+yields = read_frame(yield_curves_path)
 yields.head()
 
 
@@ -621,36 +624,56 @@ draw_telltale_chart(
 # 
 # Our bond fund simulator needs to collect only 1/365 of the coupon each tick (day) and it must buy a new bond every new day and sell bonds, which are out of the bond maturity range. The current class, should already provide all those changes, we simply need to test it against the current data.
 # 
-# Let's start with the 3-1 year bond fund simulation.
+# With daily ticks a fund holds thousands of bonds, so iterating over a list of bond objects gets very slow. Therefore the daily simulation uses the same model from `utils.bonds`, which stores the bond ladder in numpy arrays and updates all bonds of a tick at once.
+# 
+# The array based simulation does not use `relativedelta` anymore. It stores all dates as integer day numbers and calculates the fractional years with integer arithmetic. Its default day-count convention `YMD` reproduces `Bond._get_fractional_years` exactly, which we check here for a few hundred random date pairs from our yield curve. When `verify_day_count` is set, 10000 pairs are checked (it takes a while, since it uses `relativedelta` for every pair). Other conventions (`ACT/365.25`, `ACT/ACT` and `30/360`) can be selected with the `day_count` parameter.
+
+# In[ ]:
+
+
+rng = np.random.default_rng(0)
+check_start = yields.index[rng.integers(0, len(yields.index), 10000 if verify_day_count else 300)]
+check_end = check_start + pd.to_timedelta(rng.integers(0, 30 * 366, len(check_start)), unit="D")
+check_bond = Bond(check_start[0], 100, 1, 1)
+
+relativedelta_years = np.array([check_bond._get_fractional_years(s, e) for s, e in zip(check_start, check_end)])
+day_count_years = fractional_years(
+    check_start.to_numpy().astype("datetime64[D]").astype(np.int64),
+    check_end.to_numpy().astype("datetime64[D]").astype(np.int64),
+)
+assert np.array_equal(relativedelta_years, day_count_years)
+print(f"max. difference: {np.max(np.abs(relativedelta_years - day_count_years))}")
+
+
+# All our bond funds walk through the same daily yield curve, thus we define all of them once and simulate them together in a single pass over the yields. The state of the simulation is stored together with the results, so when new yields are added, only the new days have to be simulated. Only if already simulated yields have changed, the whole simulation is done again. Let's start with the 3-1 year bond fund simulation.
 
 # In[27]:
 
 
-bond_fund_sim = pd.DataFrame(index=yields.index)
+bond_fund_specs = {
+    'stt_us': (3, 1),
+    'itt_us': (10, 5),
+    'ltt_us': (30, 10),
+    'stt_eu': (3, 1),
+    'itt_eu': (10, 7),
+    'ltt_eu': (30, 20),
+}
 
 
 # In[28]:
 
 
-def simulate_bond_fund(start_years, end_years):
-    bond_fund_series = pd.Series(index=yields.index, dtype=np.float64)
-    bond_fund = BondFundSimulator(100, start_years, end_years)
-
-    last_print = None
-    for i, row in yields.iterrows():
-        income = bond_fund.calculate_tick(row.name, row[f'{start_years}y'], row[f'{end_years}y'])
-        bond_fund_series.loc[i] = bond_fund.current_value
-        if (last_print is None) or (relativedelta(row.name, last_print).months > 0):
-            last_print = row.name
-            print(f"{row.name}: income: ${income:.2f}, value: ${bond_fund.current_value:.2f}")
-            
-    return bond_fund_series
+bond_fund_sim = simulate_bond_funds(
+    yields,
+    bond_fund_specs,
+    progress_output=True,
+    state_path=cached_data_path / "02_bond_funds_state.pkl",
+)
 
 
 # In[29]:
 
 
-bond_fund_sim['stt_us'] = cached(cached_data_path / "02_stt_us_bond.pkl")(simulate_bond_fund)(3, 1)    
 bond_fund_sim['stt_us']
 
 
@@ -671,7 +694,6 @@ draw_growth_chart(
 # In[31]:
 
 
-bond_fund_sim['itt_us'] = cached(cached_data_path / "02_itt_us_bond.pkl")(simulate_bond_fund)(10, 5)    
 bond_fund_sim['itt_us']
 
 
@@ -692,7 +714,6 @@ draw_growth_chart(
 # In[33]:
 
 
-bond_fund_sim['ltt_us'] = cached(cached_data_path / "02_ltt_us_bond.pkl")(simulate_bond_fund)(30, 10)    
 bond_fund_sim['ltt_us']
 
 
@@ -733,7 +754,6 @@ ibta
 # In[36]:
 
 
-bond_fund_sim['stt_eu'] = cached(cached_data_path / "02_stt_eu_bond.pkl")(simulate_bond_fund)(3, 1)    
 bond_fund_sim['stt_eu']
 
 
@@ -774,7 +794,6 @@ sxrm
 # In[39]:
 
 
-bond_fund_sim['itt_eu'] = cached(cached_data_path / "02_itt_eu_bond.pkl")(simulate_bond_fund)(10, 7)    
 bond_fund_sim['itt_eu']
 
 
@@ -815,7 +834,6 @@ dtla
 # In[42]:
 
 
-bond_fund_sim['ltt_eu'] = cached(cached_data_path / "02_ltt_eu_bond.pkl")(simulate_bond_fund)(30, 20)    
 bond_fund_sim['ltt_eu']
 
 
@@ -854,6 +872,6 @@ bond_fund_sim.head()
 # In[45]:
 
 
-output_path = clean_data_path / "bond_funds.xlsx"
-bond_fund_sim.to_excel(output_path)
+output_path = clean_data_path / "bond_funds.npz"
+write_frame(bond_fund_sim, output_path, excel=export_excel)
 
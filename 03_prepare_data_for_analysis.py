@@ -12,6 +12,7 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 import pandas.tseries.offsets as pd_offsets
+from functools import partial
 from dateutil.relativedelta import relativedelta
 
 
@@ -19,8 +20,8 @@ from dateutil.relativedelta import relativedelta
 
 
 from utils.plots import draw_growth_chart, draw_telltale_chart
-from utils.data import read_csv, download_from_yahoo, download_from_investing, read_excel, download_from_nasdaq
-from utils.data import download_from_fred
+from utils.data import read_csv, download_from_yahoo, download_from_investing, read_excel, download_from_nasdaq, read_frame, write_frame
+from utils.data import download_from_fred, get_download_manager, LowFrequencySeries, SeriesStore
 from utils.math import reindex_and_fill, normalize, calc_growth, calc_returns, add_dividends, to_float, gmean
 from utils.math import reindex_and_interpolate
 
@@ -37,14 +38,143 @@ data = pd.DataFrame()
 
 
 clean_data_path = Path("clean_data")
+export_excel = False
 raw_data_path = Path("raw_data")
+series_store = SeriesStore(Path("cached_data") / "series")
+
+
+# All data sources are independent of each other and loading them is dominated by downloads and parsing. Thus we load the sources of all branches (S&P 500, Nasdaq-100, gold, inflation, ...) at once with the download manager, which runs them in its thread pool and keeps the rate limits per host. Yahoo and Nasdaq downloads are still serialized, since their client libraries are not thread-safe. The downloaded series from Yahoo and FRED are kept in a local store, so later runs only download the days, which are missing in the store. The following sections then just assemble the loaded sources, so the whole loading takes about as long as the slowest branch.
+
+# In[ ]:
+
+
+def load_bonds_sources():
+    return dict(
+        bonds=read_frame(clean_data_path / "bond_funds.npz"),
+    )
+
+
+def load_sp500_sources():
+    return dict(
+        sp500_1=read_csv(raw_data_path / "s&p500_raw.csv", "Adj Close**", sep=";", date_format="%b %d, %Y"),
+        sp500_2=series_store.update("s&p500_raw", partial(download_from_yahoo, "^GSPC", name="s&p500_raw")),
+    )
+
+
+def load_sp500_tr_sources():
+    return dict(
+        sp500_tr_1=series_store.update("s&p500_tr", partial(download_from_yahoo, "^SP500TR", name="s&p500_tr")),
+        sp500_div=read_csv(
+            raw_data_path / "s&p500_dividends.csv",
+            column_name = 'percent',
+            sep = ";",
+            date_format = "%b %d, %Y",
+            percent = True,
+        ),
+    )
+
+
+def load_nd100_sources():
+    return dict(
+        nd100_1=read_csv(raw_data_path / "nasdaq-100.csv", "Adj Close"),
+        nd100_2=series_store.update("NDX", partial(download_from_yahoo, "NDX")),
+    )
+
+
+def load_nd100_tr_sources():
+    return dict(
+        nd100_tr_1=read_csv(raw_data_path / "nasdaq-100-tr_1.csv", column_name="Price", date_format="%b %d, %Y"),
+        nd100_tr_2=read_csv(raw_data_path / "nasdaq-100-tr_2.csv", column_name="Price", date_format="%b %d, %Y"),
+        nd100_tr_3=download_from_investing('nasdaq-100-tr', start_date="01-01-2019"),
+    )
+
+
+def load_gold_sources():
+    return dict(
+        gold1=read_excel(
+            raw_data_path / "gold_yearly.xlsx",
+            column_name="gold",
+            index_mapping= lambda v: pd.to_datetime(v, format="%Y"),
+            skiprows=1,
+        ),
+        gold2=read_excel(
+            raw_data_path / "gold_web.xlsx",
+            column_name="value",
+            index_mapping=lambda v: pd.to_datetime(pd.to_datetime(v).date)
+        ),
+        gold3=download_from_nasdaq("LBMA/GOLD", column_name="USD (PM)"),
+    )
+
+
+def load_inflation_sources():
+    return dict(
+        inflation1=pd.read_csv(raw_data_path / "us_inflation.csv", sep=';', index_col=0),
+        inflation2=download_from_nasdaq("RATEINF/INFLATION_USA", column_name="Value"),
+        cpi1=read_csv(raw_data_path / "CPIAUCNS.csv", column_name="CPIAUCNS"),
+        cpi2=series_store.update("CPIAUCNS", partial(download_from_fred, "CPIAUCNS")),
+    )
+
+
+def load_ffr_sources():
+    return dict(
+        effr1=read_csv(raw_data_path / "FEDFUNDS.csv", column_name="FEDFUNDS"),
+        effr2=series_store.update("FEDFUNDS", partial(download_from_fred, "FEDFUNDS")),
+        lffr=read_csv(raw_data_path / "FFWSJLOW.csv", column_name="FFWSJLOW"),
+    )
+
+
+def load_borrowing_rate_sources():
+    return dict(
+        libor1=read_csv(raw_data_path / "USDONTD156N.csv", column_name="USDONTD156N"),
+        libor2=series_store.update("USDONTD156N", partial(download_from_fred, "USDONTD156N")),
+    )
+
+
+def load_hfea_sources():
+    return dict(
+        upro=read_csv(
+            raw_data_path / "UPROSIM.csv",
+            column_name="UPRO",
+            date_format="%m/%d/%y",
+            percent=True,
+        ),
+        tmf=read_csv(
+            raw_data_path / "TMFSIM.csv",
+            column_name="TMF",
+            date_format="%m/%d/%y",
+            percent=True,
+        ),
+    )
+
+
+source_loaders = [
+    load_bonds_sources,
+    load_sp500_sources,
+    load_sp500_tr_sources,
+    load_nd100_sources,
+    load_nd100_tr_sources,
+    load_gold_sources,
+    load_inflation_sources,
+    load_ffr_sources,
+    load_borrowing_rate_sources,
+    load_hfea_sources,
+]
+
+
+# In[ ]:
+
+
+download_manager = get_download_manager()
+sources = {}
+for branch_sources in download_manager.download_all({load.__name__: load for load in source_loaders}).values():
+    sources.update(branch_sources)
+list(sources.keys())
 
 
 # In[5]:
 
 
-bonds_path = clean_data_path / "bond_funds.xlsx"
-bonds = pd.read_excel(bonds_path, index_col = 0)
+bonds = sources['bonds']
 bonds.index = pd.to_datetime(bonds.index)
 bonds.head()
 
@@ -92,14 +222,14 @@ draw_growth_chart(
 # In[9]:
 
 
-sp500_1 = read_csv(raw_data_path / "s&p500_raw.csv", "Adj Close**", sep=";")
+sp500_1 = sources['sp500_1']
 sp500_1
 
 
 # In[10]:
 
 
-sp500_2 = download_from_yahoo("^GSPC", name="s&p500_raw")
+sp500_2 = sources['sp500_2']
 sp500_2
 
 
@@ -193,7 +323,7 @@ draw_growth_chart(
 # In[17]:
 
 
-sp500_tr_1 = download_from_yahoo("^SP500TR", name="s&p500_tr")
+sp500_tr_1 = sources['sp500_tr_1']
 sp500_tr_1
 
 
@@ -211,41 +341,7 @@ sp500_tr_1
 # In[19]:
 
 
-def map_month_names(indices):
-    month={
-        'Jan': 1,
-        'Feb': 2,
-        'Mar': 3,
-        'Apr': 4,
-        'May': 5,
-        'Jun': 6,
-        'Jul': 7,
-        'Aug': 8,
-        'Sep': 9,
-        'Oct': 10,
-        'Nov': 11,
-        'Dec': 12,
-    }
-    def map_single_index(index):
-        index = str(index)
-        for month_name, month_number in month.items():
-            if month_name in index:
-                return index.replace(month_name, str(month_number)+',').strip()
-        return index.strip()
-    return pd.to_datetime([map_single_index(i) for i in indices], format="%m, %d, %Y")
-    
-
-def convert_percent(value):
-    return float(str(value).replace("%",""))/100
-    
-
-sp500_div = read_csv(
-    raw_data_path / "s&p500_dividends.csv", 
-    column_name = 'percent',
-    sep = ";", 
-    index_mapping = map_month_names,
-    value_mapping = convert_percent,
-)
+sp500_div = sources['sp500_div']
 sp500_div
 
 
@@ -375,7 +471,7 @@ draw_growth_chart(
 # In[28]:
 
 
-nd100_1 = read_csv(raw_data_path / "nasdaq-100.csv", "Adj Close")
+nd100_1 = sources['nd100_1']
 nd100_1
 
 
@@ -389,7 +485,7 @@ nd100_1
 # In[30]:
 
 
-nd100_2 = download_from_yahoo("NDX")
+nd100_2 = sources['nd100_2']
 nd100_2
 
 
@@ -480,21 +576,21 @@ draw_growth_chart(
 # In[37]:
 
 
-nd100_tr_1 = read_csv(raw_data_path / "nasdaq-100-tr_1.csv", column_name="Price")
+nd100_tr_1 = sources['nd100_tr_1']
 nd100_tr_1
 
 
 # In[38]:
 
 
-nd100_tr_2 = read_csv(raw_data_path / "nasdaq-100-tr_2.csv", column_name="Price")
+nd100_tr_2 = sources['nd100_tr_2']
 nd100_tr_2
 
 
 # In[39]:
 
 
-nd100_tr_3 = download_from_investing('nasdaq-100-tr', start_date="01-01-2019")
+nd100_tr_3 = sources['nd100_tr_3']
 nd100_tr_3
 
 
@@ -688,12 +784,7 @@ gold = pd.DataFrame()
 # In[56]:
 
 
-gold1 = read_excel(
-    raw_data_path / "gold_yearly.xlsx", 
-    column_name="gold",
-    index_mapping= lambda v: pd.to_datetime(v, format="%Y"),
-    skiprows=1,
-)
+gold1 = sources['gold1']
 gold1
 
 
@@ -727,11 +818,7 @@ gold
 # In[60]:
 
 
-gold2 = read_excel(
-    raw_data_path / "gold_web.xlsx", 
-    column_name="value",
-    index_mapping=lambda v: pd.to_datetime(pd.to_datetime(v).date)
-)
+gold2 = sources['gold2']
 gold2 = reindex_and_fill(gold2, min(gold2.index), max(gold2.index), "D")
 gold2
 
@@ -774,7 +861,7 @@ gold
 # In[66]:
 
 
-gold3 = download_from_nasdaq("LBMA/GOLD", column_name="USD (PM)")
+gold3 = sources['gold3']
 gold3 = reindex_and_fill(gold3, min(gold3.index), max(gold3.index), "D")
 gold3
 
@@ -842,8 +929,8 @@ draw_growth_chart(
 # In[74]:
 
 
-assets_output_path = clean_data_path / "assets.xlsx"
-data.to_excel(assets_output_path)
+assets_output_path = clean_data_path / "assets.npz"
+write_frame(data, assets_output_path, excel=export_excel)
 
 
 # ## Inflation Rate
@@ -859,8 +946,7 @@ data.to_excel(assets_output_path)
 # In[76]:
 
 
-inflation_path = raw_data_path / "us_inflation.csv"
-inflation1 = pd.read_csv(inflation_path, sep=';', index_col=0)
+inflation1 = sources['inflation1']
 inflation1
 
 
@@ -907,34 +993,25 @@ inflation1
 
 inflation1.name = "yoy"
 inflation1 = inflation1.apply(to_float)
-inflation1 = reindex_and_interpolate(inflation1, min(inflation1.index), max(inflation1.index), freq="D")
-inflation1
+inflation1 = LowFrequencySeries(inflation1, rule="linear")
+inflation1.observations
 
 
-# Now we load the most recent data from Nasdaq and combine it with this inflation data.
+# Now we load the most recent data from Nasdaq and combine it with this inflation data. Both series are kept as monthly observations, which are linearly interpolated to daily values only when needed.
 
 # In[81]:
 
 
-inflation2 = download_from_nasdaq("RATEINF/INFLATION_USA", column_name="Value")
-inflation2 = reindex_and_interpolate(inflation2, min(inflation2.index), max(inflation2.index), freq="D")
-inflation2
+inflation2 = sources['inflation2']
+inflation2 = LowFrequencySeries(inflation2, rule="linear")
+inflation2.observations
 
 
 # In[82]:
 
 
-inflation_yoy = pd.Series(
-    index = pd.date_range(
-        min(min(inflation1.index), min(inflation2.index)),
-        max(max(inflation2.index), max(inflation2.index)),
-        freq="D",
-    ),
-    name = "yoy",
-    dtype = np.float64,
-)
-inflation_yoy.loc[min(inflation1.index):max(inflation1.index)] = inflation1
-inflation_yoy.loc[min(inflation2.index):max(inflation2.index)] = inflation2
+inflation_yoy = inflation1.merge(inflation2).to_daily()
+inflation_yoy.name = "yoy"
 inflation_yoy
 
 
@@ -959,9 +1036,9 @@ draw_growth_chart(
 # In[85]:
 
 
-cpi1 = read_csv(raw_data_path / "CPIAUCNS.csv", column_name="CPIAUCNS")
-cpi1 = reindex_and_interpolate(cpi1, min(cpi1.index), max(cpi1.index), freq="D")
-cpi1
+cpi1 = sources['cpi1']
+cpi1 = LowFrequencySeries(cpi1, rule="linear")
+cpi1.observations
 
 
 # Now we load the most recent data directly from FRED.
@@ -969,25 +1046,16 @@ cpi1
 # In[86]:
 
 
-cpi2 = download_from_fred("CPIAUCNS")
-cpi2 = reindex_and_interpolate(cpi2, min(cpi2.index), max(cpi2.index), freq="D")
-cpi2
+cpi2 = sources['cpi2']
+cpi2 = LowFrequencySeries(cpi2, rule="linear")
+cpi2.observations
 
 
 # In[87]:
 
 
-cpi = pd.Series(
-    index=pd.date_range(
-        min(min(cpi1.index), min(cpi2.index)),
-        max(max(cpi1.index), max(cpi2.index)),
-        freq="D",
-    ),
-    name="cpi",
-    dtype=np.float64,
-)
-cpi.loc[min(cpi1.index):max(cpi1.index)] = cpi1
-cpi.loc[min(cpi2.index):max(cpi2.index)] = cpi2
+cpi = cpi1.merge(cpi2).to_daily()
+cpi.name = "cpi"
 cpi
 
 
@@ -1030,8 +1098,10 @@ draw_growth_chart(
 # In[90]:
 
 
-inflation_output_path = clean_data_path / "inflation.xlsx"
-inflation.to_excel(inflation_output_path)
+inflation_output_path = clean_data_path / "inflation.lfs.npz"
+LowFrequencySeries.from_daily(inflation, rule="linear").save(inflation_output_path)
+if export_excel:
+    inflation.to_excel(clean_data_path / "inflation.xlsx")
 
 
 # ## Federal Funds Rate (U.S. base interest rate)
@@ -1044,17 +1114,17 @@ inflation.to_excel(inflation_output_path)
 # In[91]:
 
 
-effr1 = read_csv(raw_data_path / "FEDFUNDS.csv", column_name="FEDFUNDS")
-effr1 = reindex_and_interpolate(effr1, min(effr1.index), max(effr1.index), freq="D")
-effr1
+effr1 = sources['effr1']
+effr1 = LowFrequencySeries(effr1, rule="linear")
+effr1.observations
 
 
 # In[92]:
 
 
-effr2 = download_from_fred("FEDFUNDS")
-effr2 = reindex_and_interpolate(effr2, min(effr2.index), max(effr2.index), freq="D")
-effr2
+effr2 = sources['effr2']
+effr2 = LowFrequencySeries(effr2, rule="linear")
+effr2.observations
 
 
 # In[93]:
@@ -1062,8 +1132,8 @@ effr2
 
 draw_growth_chart(
     {
-        'effr1': effr1,
-        'effr2': effr2,
+        'effr1': effr1.to_daily(),
+        'effr2': effr2.to_daily(),
     },
     "The effective federal funds rate (comparison of sources)"
 )
@@ -1072,17 +1142,8 @@ draw_growth_chart(
 # In[94]:
 
 
-effr = pd.Series(
-    index=pd.date_range(
-        min(min(effr1.index), min(effr2.index)),
-        max(max(effr1.index), max(effr2.index)),
-        freq="D",
-    ),
-    dtype=np.float64,
-    name="effr"
-)
-effr.loc[min(effr1.index):max(effr1.index)] = effr1
-effr.loc[min(effr2.index):max(effr2.index)] = effr2
+effr = effr1.merge(effr2).to_daily()
+effr.name = "effr"
 effr
 
 
@@ -1091,7 +1152,7 @@ effr
 # In[95]:
 
 
-lffr = read_csv(raw_data_path / "FFWSJLOW.csv", column_name="FFWSJLOW")
+lffr = sources['lffr']
 lffr = lffr.ffill().bfill()
 lffr
 
@@ -1116,7 +1177,7 @@ lffr
 # In[98]:
 
 
-lffr = reindex_and_interpolate(lffr, min(lffr.index), max(lffr.index), freq="D")
+lffr = LowFrequencySeries(lffr, rule="linear").to_daily()
 lffr
 
 
@@ -1174,8 +1235,10 @@ draw_growth_chart(
 # In[103]:
 
 
-ffr_output_path = clean_data_path / "ffr.xlsx"
-ffr.to_excel(ffr_output_path)
+ffr_output_path = clean_data_path / "ffr.lfs.npz"
+LowFrequencySeries.from_daily(ffr, rule="linear").save(ffr_output_path)
+if export_excel:
+    ffr.to_excel(clean_data_path / "ffr.xlsx")
 
 
 # ## The Overnight Borrowing Rate
@@ -1187,7 +1250,7 @@ ffr.to_excel(ffr_output_path)
 # In[105]:
 
 
-libor1 = read_csv(raw_data_path / "USDONTD156N.csv", column_name="USDONTD156N")
+libor1 = sources['libor1']
 libor1 = reindex_and_fill(libor1, min(libor1.index), max(libor1.index), freq="D")
 libor1
 
@@ -1195,7 +1258,7 @@ libor1
 # In[106]:
 
 
-libor2 = download_from_fred("USDONTD156N")
+libor2 = sources['libor2']
 libor2 = reindex_and_fill(libor2, min(libor2.index), max(libor2.index), freq="D")
 libor2
 
@@ -1256,7 +1319,7 @@ draw_telltale_chart(
 # In[110]:
 
 
-borrowing_rate.to_excel(clean_data_path / "borrowing_rate.xlsx")
+write_frame(borrowing_rate, clean_data_path / "borrowing_rate.npz", excel=export_excel)
 
 
 # ## Original HFEA Data
@@ -1266,11 +1329,7 @@ borrowing_rate.to_excel(clean_data_path / "borrowing_rate.xlsx")
 # In[112]:
 
 
-upro = read_csv(
-    raw_data_path / "UPROSIM.csv", 
-    column_name="UPRO", 
-    value_mapping=lambda v: to_float(v.replace("%", ""))/100
-)
+upro = sources['upro']
 upro = upro.reindex(pd.date_range(min(upro.index), max(upro.index), freq="D"))
 upro = upro.fillna(value=0)
 upro = calc_growth(upro)
@@ -1281,12 +1340,7 @@ upro
 # In[113]:
 
 
-raw_data_path = Path("raw_data")
-tmf = read_csv(
-    raw_data_path / "TMFSIM.csv", 
-    column_name="TMF", 
-    value_mapping=lambda v: to_float(v.replace("%", ""))/100
-)
+tmf = sources['tmf']
 tmf = tmf.reindex(pd.date_range(min(upro.index), max(upro.index), freq="D"))
 tmf = tmf.fillna(value=0)
 tmf = calc_growth(tmf)
@@ -1306,5 +1360,5 @@ hfea_data
 # In[115]:
 
 
-hfea_data.to_excel(clean_data_path / "hfea_data.xlsx")
+write_frame(hfea_data, clean_data_path / "hfea_data.npz", excel=export_excel)
 
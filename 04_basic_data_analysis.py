@@ -23,10 +23,10 @@ from dateutil.relativedelta import relativedelta
 
 
 from utils.plots import draw_growth_chart, draw_telltale_chart, draw_risk_reward_chart, draw_periodic_return
-from utils.plots import draw_correlations
+from utils.plots import draw_correlations, report_figure
 from utils.math import gmean, calc_min_returns, calc_max_drawdown, calc_correlations_over_time
 from utils.math import calc_average_return_over_time
-from utils.data import cached
+from utils.data import cached, load_dataset
 
 
 # The first step is to load the data, we have prepared for our backtest.
@@ -41,25 +41,21 @@ cache_path = Path("cached_clean_data")
 # In[4]:
 
 
-input_path = clean_data_path / "assets.xlsx"
-assets = pd.read_excel(input_path, index_col=0)
-assets.index = pd.to_datetime(assets.index)
+assets = load_dataset("assets")
 assets
 
 
 # In[5]:
 
 
-inflation = pd.read_excel(clean_data_path / "inflation.xlsx", index_col=0)
-inflation.index = pd.to_datetime(inflation.index)
+inflation = load_dataset("inflation")
 inflation
 
 
 # In[6]:
 
 
-ffr = pd.read_excel(clean_data_path / "ffr.xlsx", index_col=0)
-ffr.index = pd.to_datetime(ffr.index)
+ffr = load_dataset("ffr", columns=["ffr"])
 ffr
 
 
@@ -91,7 +87,7 @@ draw_growth_chart(
 # In[8]:
 
 
-min_returns, min_returns_date = cached(cache_path / "04_min_retruns.pkl")(calc_min_returns)(
+min_returns, min_returns_date = cached(cache_path)(calc_min_returns)(
     assets,
     list(range(1,31)),
 )
@@ -150,7 +146,7 @@ min_returns_date
 # In[11]:
 
 
-max_drawdown, max_drawdown_start, max_drawdown_end = cached(cache_path / "04_max_drawdown.pkl")(calc_max_drawdown)(
+max_drawdown, max_drawdown_start, max_drawdown_end = cached(cache_path)(calc_max_drawdown)(
     assets
 )
 
@@ -319,7 +315,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # In this graph we can see, that gold had extremly high gains in those years where the inflation was increasing a lot. On years where the inflation was decreasing, gold has very small or even negative returns. This might be important in case the inflation is further increasing in the upcomming years. 
@@ -366,7 +362,7 @@ fig = draw_periodic_return(
 
 month = 2
 month_returns = monthly_returns_corrected.loc[monthly_returns_corrected.groupby(monthly_returns_corrected.index.month).groups[month], :]
-returns_over_time = cached(cache_path / "04_average_return_over_time_feb.pkl")(calc_average_return_over_time)(
+returns_over_time = cached(cache_path)(calc_average_return_over_time)(
     month_returns,
     relativedelta(years=10),
     relativedelta(months=1),
@@ -390,7 +386,7 @@ draw_growth_chart(
 
 month = 12
 month_returns = monthly_returns_corrected.loc[monthly_returns_corrected.groupby(monthly_returns_corrected.index.month).groups[month], :]
-returns_over_time = cached(cache_path / "04_average_return_over_time_dec.pkl")(calc_average_return_over_time)(
+returns_over_time = cached(cache_path)(calc_average_return_over_time)(
     month_returns,
     relativedelta(years=10),
     relativedelta(months=1),
@@ -549,7 +545,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # On a first glance, it looks like small inflation is better for S&P 500 and high inflation is better for Gold. Let's now calculate the correlation.
@@ -591,7 +587,7 @@ fig.add_trace(
     ),
     secondary_y=False
 )
-fig.show()
+report_figure(fig)
 
 
 # It looks like when the interest rate is decreasing, also Gold returns are decreasing. Furthermore the S&P 500 returns seems to increase at the same time. This makes sense, because of the small negative correlation between Gold and S&P 500 on yearly returns data. 
@@ -612,7 +608,7 @@ draw_correlations(correlation.corr(), correlation, "yearly", ['ltt_eu', 'gold',
 # In[51]:
 
 
-correlations_over_time = cached(cache_path / "04_correlation_over_time_5_years.pkl")(calc_correlations_over_time)(
+correlations_over_time = cached(cache_path)(calc_correlations_over_time)(
     daily_returns,
     relativedelta(years=5),
     relativedelta(months=1),
@@ -645,7 +641,7 @@ draw_growth_chart(
 # In[53]:
 
 
-correlations_over_time = cached(cache_path / "04_correlation_over_time_3_month.pkl")(calc_correlations_over_time)(
+correlations_over_time = cached(cache_path)(calc_correlations_over_time)(
     daily_returns,
     relativedelta(months=3),
     relativedelta(months=1),
@@ -32,59 +32,49 @@
 
 import numpy as np
 import pandas as pd
+from functools import partial
 from pathlib import Path
 
 
 # In[2]:
 
 
-from utils.data import download_from_yahoo, download_from_investing, read_csv
-from utils.math import calc_returns, calc_growth, normalize, reindex_and_fill, to_float
+from utils.data import download_from_yahoo, download_from_investing, read_csv, FxRates, load_dataset, write_prices, SeriesStore
+from utils.math import calc_returns, calc_growth, normalize, reindex_and_fill, to_float, calc_letf, calc_letfs, calibrate_letfs
 from utils.plots import draw_growth_chart, draw_telltale_chart
 
 
-# In[3]:
+# In[4]:
 
 
-def calc_letf(daily_returns, er, borrowing_rate=None, leverage = 1, adjustment_factor = 0, days_in_year = 365, percent=100):
-    def gmean(x):
-        return (x + 1)**(1 / days_in_year) - 1
-    
-    assert (leverage == 1) or (borrowing_rate is not None), "If leverage is not 1, you must provide the ffr argument!"
-    
-    if borrowing_rate is not None:
-        daily_borrowing_rate = (leverage - 1) * gmean(-borrowing_rate/percent)
-    else:
-        daily_borrowing_rate = 0
-        
-    daily_adjustment_factor = gmean(adjustment_factor/percent)
-    daily_er = gmean(-er/percent)
-    
-    return daily_returns * leverage + daily_er + daily_borrowing_rate + daily_adjustment_factor
-    
+clean_data_path = Path("clean_data")
+export_excel = False
+raw_data_path = Path("raw_data")
 
 
-# In[4]:
+# The prices of the real ETFs and the FX rates are kept in a local store, so later runs only download the days, which are missing in the store.
 
+# In[ ]:
 
-clean_data_path = Path("clean_data")
-raw_data_path = Path("raw_data")
+
+series_store = SeriesStore(Path("cached_data") / "series")
+
+
+def load_from_yahoo(ticker, adjust=True):
+    return series_store.update(ticker, partial(download_from_yahoo, ticker, adjust=adjust))
 
 
 # In[5]:
 
 
-assets_path = clean_data_path / "assets.xlsx"
-assets = pd.read_excel(assets_path, index_col = 0)
-assets.index = pd.to_datetime(assets.index)
+assets = load_dataset("assets")
 assets
 
 
 # In[6]:
 
 
-borrowing = pd.read_excel(clean_data_path / "borrowing_rate.xlsx", index_col = 0)
-borrowing.index = pd.to_datetime(borrowing.index)
+borrowing = load_dataset("borrowing_rate", columns=['borrowing_rate'])
 borrowing = borrowing['borrowing_rate']
 borrowing
 
@@ -106,7 +96,7 @@ assets_daily_returns
 # In[8]:
 
 
-spy = download_from_yahoo("SPY", adjust=True)
+spy = load_from_yahoo("SPY")
 spy = reindex_and_fill(spy, min(spy.index), max(spy.index), freq="D")
 spy
 
@@ -218,7 +208,7 @@ draw_telltale_chart(
 # In[15]:
 
 
-ulpix = download_from_yahoo("ULPIX", adjust=True)
+ulpix = load_from_yahoo("ULPIX")
 ulpix = reindex_and_fill(ulpix, min(ulpix.index), max(ulpix.index), freq="D")
 ulpix
 
@@ -330,7 +320,7 @@ draw_telltale_chart(
 # In[22]:
 
 
-upro = download_from_yahoo("UPRO", adjust=True)
+upro = load_from_yahoo("UPRO")
 upro
 
 
@@ -441,24 +431,22 @@ draw_telltale_chart(
 # 
 # __*) Keep in mind that the WisdomTree is not an ETF, but an ETN. This includes a higher risk when the emittent gets bunkrupt.__
 # 
-# Since all those ETP prices are given in EUR, we have to calculate the USD price out of it, before we can use it to compare our modelling. The following function will help us with that.
+# Since all those ETP prices are given in EUR, we have to calculate the USD price out of it, before we can use it to compare our modelling. For this we use an FX service, which loads every currency only once and converts whole time-series (or dataframes with columns in different currencies) with a single multiplication.
 
 # In[28]:
 
 
-eurusd = download_from_yahoo("EURUSD=X")
-eurusd
-
-def to_usd(data):
-    assert min(data.index) >= min(eurusd.index)
-    assert max(data.index) <= max(eurusd.index)
-    return data * eurusd.loc[min(data.index):max(data.index)]
+fx_rates = FxRates(
+    pd.date_range(min(assets.index), pd.Timestamp.today().normalize(), freq="D"),
+    loader=lambda currency, base: load_from_yahoo(f"{currency}{base}=X", adjust=False),
+)
+fx_rates.get_rates("EUR")
 
 
 # In[29]:
 
 
-sxr8 = to_usd(download_from_yahoo("SXR8.DE", adjust=True))
+sxr8 = fx_rates.convert(load_from_yahoo("SXR8.DE"), "EUR")
 sxr8
 
 
@@ -481,7 +469,7 @@ draw_growth_chart(
 # In[31]:
 
 
-sxr8 = to_usd(download_from_yahoo("SXR8.DE", adjust=True)).loc['2011':]
+sxr8 = fx_rates.convert(load_from_yahoo("SXR8.DE"), "EUR").loc['2011':]
 sxr8
 
 
@@ -578,7 +566,7 @@ draw_telltale_chart(
 # In[38]:
 
 
-dbpg = to_usd(download_from_yahoo("DBPG.DE", adjust=True))
+dbpg = fx_rates.convert(load_from_yahoo("DBPG.DE"), "EUR")
 dbpg
 
 
@@ -601,7 +589,7 @@ draw_growth_chart(
 # In[40]:
 
 
-dbpg = to_usd(download_from_yahoo("DBPG.DE", adjust=True)).loc['2012':]
+dbpg = fx_rates.convert(load_from_yahoo("DBPG.DE"), "EUR").loc['2012':]
 dbpg
 
 
@@ -702,7 +690,7 @@ draw_telltale_chart(
 # In[46]:
 
 
-usl3 = to_usd(download_from_yahoo("3USL.MI", adjust=True))
+usl3 = fx_rates.convert(load_from_yahoo("3USL.MI"), "EUR")
 usl3
 
 
@@ -808,7 +796,7 @@ draw_telltale_chart(
 # In[52]:
 
 
-qqq = download_from_yahoo("QQQ", adjust=True)
+qqq = load_from_yahoo("QQQ")
 qqq
 
 
@@ -907,7 +895,7 @@ draw_telltale_chart(
 # In[58]:
 
 
-qld = download_from_yahoo("QLD", adjust=True)
+qld = load_from_yahoo("QLD")
 qld
 
 
@@ -1008,7 +996,7 @@ draw_telltale_chart(
 # In[64]:
 
 
-tqqq = download_from_yahoo("TQQQ", adjust=True)
+tqqq = load_from_yahoo("TQQQ")
 tqqq
 
 
@@ -1118,7 +1106,7 @@ draw_telltale_chart(
 # In[70]:
 
 
-eqqq = to_usd(download_from_yahoo("EQQQ.MI", adjust=True))
+eqqq = fx_rates.convert(load_from_yahoo("EQQQ.MI"), "EUR")
 eqqq 
 
 
@@ -1217,7 +1205,7 @@ draw_telltale_chart(
 # In[76]:
 
 
-l8i7 = to_usd(download_from_yahoo("L8I7.DE", adjust=True))
+l8i7 = fx_rates.convert(load_from_yahoo("L8I7.DE"), "EUR")
 l8i7
 
 
@@ -1318,7 +1306,7 @@ draw_telltale_chart(
 
 qqq3 = download_from_investing("boost-nasdaq-100-3x-leverage", start_date="2014-02-26", category="etfs")
 qqq3 = reindex_and_fill(qqq3, min(qqq3.index), max(qqq3.index), freq="D")
-qqq3 = to_usd(qqq3)
+qqq3 = fx_rates.convert(qqq3, "EUR")
 qqq3
 
 
@@ -1424,7 +1412,7 @@ draw_telltale_chart(
 # In[88]:
 
 
-gld = download_from_yahoo("GLD", adjust=True)
+gld = load_from_yahoo("GLD")
 gld
 
 
@@ -1487,7 +1475,7 @@ draw_telltale_chart(
 # In[93]:
 
 
-ugl = download_from_yahoo("UGL", adjust=True)
+ugl = load_from_yahoo("UGL")
 ugl
 
 
@@ -1595,7 +1583,7 @@ draw_telltale_chart(
 # In[100]:
 
 
-sgld = download_from_yahoo("SGLD.L", adjust=True).loc[:'2021-01-01']
+sgld = load_from_yahoo("SGLD.L").loc[:'2021-01-01']
 sgld
 
 
@@ -1694,7 +1682,7 @@ draw_telltale_chart(
 # In[106]:
 
 
-gol3 = to_usd(download_from_yahoo("3GOL.MI", adjust=True))
+gol3 = fx_rates.convert(load_from_yahoo("3GOL.MI"), "EUR")
 gol3
 
 
@@ -1831,7 +1819,7 @@ draw_telltale_chart(
 # In[114]:
 
 
-shy = download_from_yahoo("SHY", adjust=True)
+shy = load_from_yahoo("SHY")
 shy
 
 
@@ -1999,7 +1987,7 @@ draw_growth_chart(
 # In[120]:
 
 
-ibta = download_from_yahoo("IBTA.L", adjust=True)
+ibta = load_from_yahoo("IBTA.L")
 ibta
 
 
@@ -2134,7 +2122,7 @@ draw_growth_chart(
 # In[126]:
 
 
-vfitx = download_from_yahoo("VFITX", adjust=True)
+vfitx = load_from_yahoo("VFITX")
 vfitx
 
 
@@ -2233,7 +2221,7 @@ draw_telltale_chart(
 # In[132]:
 
 
-ust = download_from_yahoo("UST", adjust=True)
+ust = load_from_yahoo("UST")
 ust
 
 
@@ -2334,7 +2322,7 @@ draw_telltale_chart(
 # In[138]:
 
 
-tyd = download_from_yahoo("TYD", adjust=True)
+tyd = load_from_yahoo("TYD")
 tyd
 
 
@@ -2432,7 +2420,7 @@ draw_telltale_chart(
 # In[144]:
 
 
-sxrm = download_from_yahoo("SXRM.DE", adjust=True)
+sxrm = load_from_yahoo("SXRM.DE")
 sxrm
 
 
@@ -2543,7 +2531,7 @@ etfs['2x_itt_eu'] = etfs['2x_itt_us'].copy()
 # In[152]:
 
 
-tyl3 = to_usd(download_from_yahoo("3TYL.L", adjust=True))
+tyl3 = fx_rates.convert(load_from_yahoo("3TYL.L"), "EUR")
 tyl3
 
 
@@ -2674,7 +2662,7 @@ draw_telltale_chart(
 # In[160]:
 
 
-vustx = download_from_yahoo("VUSTX", adjust=True)
+vustx = load_from_yahoo("VUSTX")
 vustx
 
 
@@ -2737,7 +2725,7 @@ draw_telltale_chart(
 # In[164]:
 
 
-ubt = download_from_yahoo("UBT", adjust=True)
+ubt = load_from_yahoo("UBT")
 ubt
 
 
@@ -2798,7 +2786,7 @@ draw_telltale_chart(
 # In[168]:
 
 
-tmf = download_from_yahoo("TMF", adjust=True)
+tmf = load_from_yahoo("TMF")
 tmf
 
 
@@ -2929,7 +2917,7 @@ draw_telltale_chart(
 # In[176]:
 
 
-dtla = download_from_yahoo("DTLA.L", adjust=True)
+dtla = load_from_yahoo("DTLA.L")
 dtla
 
 
@@ -2994,6 +2982,108 @@ etfs['2x_ltt_eu'] = etfs['2x_ltt_us']
 etfs['3x_ltt_eu'] = etfs['3x_ltt_us']
 
 
+# All ETFs are now modelled and we know the final parameters for every one of them. To rebuild all ETFs at once (for example, when the assets are updated), we collect those parameters in a single spec table. Every row describes one ETF by its underlying, leverage, expense ratio, adjustment factor, borrowing rate and currency. Keep in mind, that some ETFs use the EU bonds as underlying and that the 2x ITT and 2x/3x LTT ETFs in Europe are just copies of the US versions.
+
+# In[ ]:
+
+
+letf_specs = pd.DataFrame(
+    [
+        # name,          underlying,   leverage, er,   adjustment_factor
+        ('1x_sp500_us',  'sp500+div',  1,        0.09, -0.04),
+        ('2x_sp500_us',  'sp500+div',  2,        1.51, -1.1),
+        ('3x_sp500_us',  'sp500+div',  3,        0.91, -1.0),
+        ('1x_sp500_eu',  'sp500+div',  1,        0.07, -0.3),
+        ('2x_sp500_eu',  'sp500+div',  2,        0.6,  -1.2),
+        ('3x_sp500_eu',  'sp500+div',  3,        0.75, -2.75),
+        ('1x_ndx100_us', 'ndx100+div', 1,        0.2,  -0.01),
+        ('2x_ndx100_us', 'ndx100+div', 2,        0.95, -0.55),
+        ('3x_ndx100_us', 'ndx100+div', 3,        0.95, -1.1),
+        ('1x_ndx100_eu', 'ndx100+div', 1,        0.33, -0.8),
+        ('2x_ndx100_eu', 'ndx100+div', 2,        0.6,  -0.2),
+        ('3x_ndx100_eu', 'ndx100+div', 3,        0.75, -2.1),
+        ('1x_gold_us',   'gold',       1,        0.4,  0.0),
+        ('2x_gold_us',   'gold',       2,        0.95, -2.0),
+        ('1x_gold_eu',   'gold',       1,        0.12, -0.28),
+        ('3x_gold_eu',   'gold',       3,        0.99, -4.0),
+        ('1x_stt_us',    'stt_us',     1,        0.15, -0.15),
+        ('2x_stt_us',    'stt_us',     2,        0.95, -0.5),
+        ('3x_stt_us',    'stt_us',     3,        0.95, -1.0),
+        ('1x_stt_eu',    'stt_eu',     1,        0.07, 0.0),
+        ('2x_stt_eu',    'stt_eu',     2,        0.95, -0.5),
+        ('3x_stt_eu',    'stt_eu',     2,        0.95, -1.0),
+        ('1x_itt_us',    'itt_us',     1,        0.2,  -0.5),
+        ('2x_itt_us',    'itt_eu',     2,        0.95, 0.1),
+        ('3x_itt_us',    'itt_eu',     3,        1.09, 0.0),
+        ('1x_itt_eu',    'itt_eu',     1,        0.07, -0.15),
+        ('2x_itt_eu',    'itt_eu',     2,        0.95, 0.1),
+        ('3x_itt_eu',    'itt_eu',     3,        0.3,  -2.5),
+        ('1x_ltt_us',    'ltt_us',     1,        0.2,  0.0),
+        ('2x_ltt_us',    'ltt_eu',     2,        0.95, 0.0),
+        ('3x_ltt_us',    'ltt_eu',     3,        1.06, -1.0),
+        ('1x_ltt_eu',    'ltt_eu',     1,        0.07, 0.0),
+        ('2x_ltt_eu',    'ltt_eu',     2,        0.95, 0.0),
+        ('3x_ltt_eu',    'ltt_eu',     3,        1.06, -1.0),
+    ],
+    columns=['name', 'underlying', 'leverage', 'er', 'adjustment_factor'],
+).set_index('name')
+letf_specs['borrowing'] = 'borrowing_rate'
+letf_specs['currency'] = 'USD'
+letf_specs
+
+
+# The whole spec table is calculated with `calc_letfs` as one matrix operation over all days and ETFs. Its results are the same as the ETFs we calculated one by one above.
+
+# In[ ]:
+
+
+etfs = calc_letfs(assets_daily_returns, letf_specs, borrowing_rates=borrowing.to_frame())
+etfs
+
+
+# Instead of tuning the adjustment factors by hand, we can also let `calibrate_letfs` search them. For every ETF with a reference, it evaluates a whole grid of adjustment factors at once against the reference (keeping the published expense ratio) and chooses the one with the smallest tracking error. The report shows the fitted values next to our hand-tuned values together with the tracking error and the remaining yearly drift of both (in percent). Expense ratio and adjustment factor are almost collinear, thus it makes no sense to search both at the same time.
+
+# In[ ]:
+
+
+letf_references = {
+    '1x_sp500_us': spy,
+    '2x_sp500_us': ulpix,
+    '3x_sp500_us': upro,
+    '1x_sp500_eu': sxr8,
+    '2x_sp500_eu': dbpg,
+    '3x_sp500_eu': usl3,
+    '1x_ndx100_us': qqq,
+    '2x_ndx100_us': qld,
+    '3x_ndx100_us': tqqq,
+    '1x_ndx100_eu': eqqq,
+    '2x_ndx100_eu': l8i7,
+    '3x_ndx100_eu': qqq3,
+    '1x_gold_us': gld,
+    '2x_gold_us': ugl,
+    '1x_gold_eu': sgld,
+    '3x_gold_eu': gol3,
+    '1x_stt_us': shy,
+    '1x_stt_eu': ibta,
+    '1x_itt_us': vfitx,
+    '2x_itt_us': ust,
+    '3x_itt_us': tyd,
+    '1x_itt_eu': sxrm,
+    '3x_itt_eu': tyl3,
+    '1x_ltt_us': vustx,
+    '2x_ltt_us': ubt,
+    '3x_ltt_us': tmf,
+    '1x_ltt_eu': dtla,
+}
+calibration_report = calibrate_letfs(
+    assets_daily_returns,
+    letf_specs,
+    letf_references,
+    borrowing_rates=borrowing.to_frame(),
+)
+calibration_report
+
+
 # Let's normalize all ETFs to a start of $100 in 1943 and then we draw them all in one graph.
 
 # In[180]:
@@ -3187,7 +3277,7 @@ draw_growth_chart(
 # In[194]:
 
 
-etfs.to_excel(clean_data_path / "etfs.xlsx")
+write_prices(etfs, clean_data_path / "etfs.npy", excel=export_excel)
 
 
 # In[ ]:
@@ -20,9 +20,9 @@ import plotly.graph_objects as go
 
 
 from utils.plots import draw_growth_chart, draw_telltale_chart, draw_risk_reward_chart, draw_periodic_return
-from utils.plots import draw_correlations
+from utils.plots import draw_correlations, report_figure
 from utils.math import gmean, calc_min_returns, calc_max_drawdown, calc_correlations_over_time, normalize, calc_returns
-from utils.data import cached
+from utils.data import cached, load_dataset
 
 
 # In[3]:
@@ -35,16 +35,14 @@ cache_path = Path("cached_data")
 # In[4]:
 
 
-input_path = clean_data_path / "etfs.xlsx"
-etfs = pd.read_excel(input_path, index_col=0)
-etfs.index = pd.to_datetime(etfs.index)
+etfs = load_dataset("etfs")
 etfs
 
 
 # In[5]:
 
 
-min_returns, min_returns_date = cached(cache_path / "06_min_returns.pkl")(calc_min_returns)(
+min_returns, min_returns_date = cached(cache_path)(calc_min_returns)(
     etfs,
     list(range(1,31)),
 )
@@ -61,7 +59,7 @@ def get_annual_roi(roi, years):
 # In[7]:
 
 
-max_drawdown, max_drawdown_start, max_drawdown_end = cached(cache_path / "06_max_drawdown")(calc_max_drawdown)(etfs)
+max_drawdown, max_drawdown_start, max_drawdown_end = cached(cache_path)(calc_max_drawdown)(etfs)
 
 
 # In[8]:
@@ -101,7 +99,7 @@ for asset in risk_reward.index:
 # In[11]:
 
 
-max_drawdown_1986, max_drawdown_start_1986, max_drawdown_end_1986 = cached(cache_path / "06_max_drawdown_1986")(calc_max_drawdown)(etfs.loc['1986':,:])
+max_drawdown_1986, max_drawdown_start_1986, max_drawdown_end_1986 = cached(cache_path)(calc_max_drawdown)(etfs.loc['1986':,:])
 yearly_returns_1986 = etfs.loc['1986':,:].pct_change(1, freq="Y")
 yearly_returns_1986 = yearly_returns_1986.dropna()
 risk_reward_1986 = pd.DataFrame(
@@ -656,8 +654,7 @@ draw_risk_reward_chart(
 # In[59]:
 
 
-ffr = pd.read_excel(clean_data_path / "ffr.xlsx", index_col=0)
-ffr.index = pd.to_datetime(ffr.index)
+ffr = load_dataset("ffr", columns=['ffr'])
 ffr = ffr['ffr']
 ffr
 
@@ -692,7 +689,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # As we can see the long term treasury ETFs with leverage factor are suffering enormously from volatility-decay in the years from 1943 to 1986. While the 2x leveraged ETF is still reaching a slightly positive return at 1986, the 3x leveraged ETF is not even reaching breakeven. 
@@ -719,7 +716,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # In the years after 1986, we can see the oposite effect: interest rates are decreasing and thus long term treasury ETFs are growing. Since it is a time of steady growth the leveraged ETFs are outperfroming the unleveraged ETF drastically. Here the 3x leveraged ETF is the best. 
@@ -881,7 +878,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # It is quite hard to see, but the ITT ETFs show a much faster recovery after the interest rates are decreasing than the LTTs. Thus all ETFs have a positive return on 1986, eventhough the leveraged ETFs drop a lot in the years of high interest rates. 
@@ -906,7 +903,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # For the years after 1986 we also see here a strong growth. The 3x leveraged ETF is growing very fast with more than 11% average annual return, which is similar to the unleveraged S&P 500 ETF. 
@@ -1095,7 +1092,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # And once again: The european ETF is slightly better performaing than the US ETF. In the years from 1943 to 1986 the average annual return was always positive and around 5%, which is similar to the average annual return onf ITT and LTT. 
@@ -1120,7 +1117,7 @@ fig.add_trace(
     secondary_y=True
 )
 
-fig.show()
+report_figure(fig)
 
 
 # In the years after 1986 the returns decreases a little bit to 4-5% While in those years ITT and LTT has an average return of 8% to 11%. 
@@ -24,7 +24,7 @@ from utils.plots import draw_growth_chart, draw_telltale_chart, draw_risk_reward
 from utils.plots import draw_correlations, compare_portfolios, draw_max_portfolio_drawdowns, draw_min_portfolio_returns
 from utils.math import gmean, calc_min_returns, calc_max_drawdown, calc_correlations_over_time, normalize, calc_returns
 from utils.math import to_float, calc_growth, normalize_df
-from utils.data import cached, read_csv
+from utils.data import cached, read_csv, load_dataset
 from utils.portfolio import Portfolio, MAPortfolio
 
 
@@ -38,9 +38,7 @@ cache_path = Path("cached_data")
 # In[4]:
 
 
-input_path = clean_data_path / "etfs.xlsx"
-etfs = pd.read_excel(input_path, index_col=0)
-etfs.index = pd.to_datetime(etfs.index)
+etfs = load_dataset("etfs")
 etfs['cash'] = 100.0
 etfs
 
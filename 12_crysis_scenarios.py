@@ -23,10 +23,10 @@ import itertools
 
 
 from utils.plots import draw_growth_chart, draw_telltale_chart, draw_risk_reward_chart, draw_periodic_return
-from utils.plots import draw_correlations, compare_portfolios, draw_max_portfolio_drawdowns, draw_min_portfolio_returns
+from utils.plots import draw_correlations, compare_portfolios, draw_max_portfolio_drawdowns, draw_min_portfolio_returns, report_figure
 from utils.math import gmean, calc_min_returns, calc_max_drawdown, calc_correlations_over_time, normalize, calc_returns
 from utils.math import to_float, calc_growth, normalize_df
-from utils.data import cached, read_csv
+from utils.data import cached, read_csv, load_dataset
 from utils.portfolio import Portfolio, MAPortfolio, GermanTaxModel
 
 
@@ -40,9 +40,7 @@ cache_path = Path("cached_data")
 # In[4]:
 
 
-input_path = clean_data_path / "etfs.xlsx"
-etfs = pd.read_excel(input_path, index_col=0)
-etfs.index = pd.to_datetime(etfs.index)
+etfs = load_dataset("etfs")
 etfs['cash'] = 100.0
 etfs
 
@@ -50,18 +48,14 @@ etfs
 # In[5]:
 
 
-input_path = clean_data_path / "inflation.xlsx"
-inflation = pd.read_excel(input_path, index_col=0)
-inflation.index = pd.to_datetime(inflation.index)
+inflation = load_dataset("inflation", columns=['yoy'], start=etfs.index[0], end=etfs.index[-1])
 inflation
 
 
 # In[6]:
 
 
-input_path = clean_data_path / "ffr.xlsx"
-interest = pd.read_excel(input_path, index_col=0)
-interest.index = pd.to_datetime(interest.index)
+interest = load_dataset("ffr", columns=['ffr'], start=etfs.index[0], end=etfs.index[-1])
 interest
 
 
@@ -618,7 +612,7 @@ fig = draw_growth_chart(
 #    ),
 #    secondary_y=True
 #)
-fig.show()
+report_figure(fig)
 
 
 # We see a maximum drawdown of 25% in S&P 500. Also a small drawdown in LTTs are visible. The drawdown started around the 20th of March 1962 as the bottom was reached in June 1962. This was before the Cuba Crysis started to became hot. It was called the "Flash Crash of 1962" and one of the reasons for this small crash was probably a long time of strong growting beforehand, which now leads to an substantial correction. 
@@ -689,7 +683,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # Already in January 1973 the stock market started to fade away. In the same time the inflation was increasing drastically from 3% to 7%. In October 1973, the Yom Kippur War started and as reaction to this war OPEC was reducing the Oil production. We can see a first big drop by 16% in the stock market until December, followed by a sideway period. In March 1974, so around 3-4 month after the drop, it seems that a recovery will come, but then the stock market dropped again up to 35% from the value of March 1974. In sum the stock market was dropping 44%. During this time the inflation was reaching a value of up to 12%. 
@@ -768,7 +762,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # We see a strong growth in the stock market of over 40% in the first 7 month of 1987. The ATH is reached at the 25. Aug. 1987. Suddently the stock price corrects by around 8% in September. After this correction is starts to recover up to 2% below ATH and then crashes drastically within few days by 30%. However compared to the stock price beginning of the year, we are jut 5% down. The Nasdaq-100 is moving very similar to S&P 500, but shows in general a higher growth. 
@@ -837,7 +831,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # The stock market reaches a high in Jul. 1990, since then it was dropping. Beginning auf Aug. it starts to drop enormously and reaches around -20% from the last high in Jul 1990. The stock market is recovering even before the US coalition was formed. At the beginning of the coalition attacs in Jan. 1991 the stock market crashes again slightly, but recovers very fast, even before the victory of the coalition. Already in February 1991 the stock market reaches a new high and starts growing strongly the years after. The Nasdaq-100 is following S&P 500 with a higher drop, but then also with a stronger growth afterwards. 
@@ -911,7 +905,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # This was a slow and long crash of the stock market. The S&P 500 went sideways from starting of 2000, after reaching a high in March. Beginning from September it started to fade, with a lot of tries to recover but big drops shortly after such recovery attempt. In March 2001 and Sep. 2001 (probably due to 9/11) the stock price was dropped very fast. The minimum was reached in Oct. 2002 with -48%, when the S&P 500 went sideways again until May 2003 and then breaks out and recovers over many years. Even end of 2005 the S&P 500 have not been recovered completely. 
@@ -980,7 +974,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # The last high was in October 2007. But this high was already just a very small imvprovement compared to the high in Jul 2007. Thus actually the stock market went already sideways at this time. After October 2007 the market dropped. It somehow started to recover, but in the end it just build lower highs and lower lows. Then in September 2008 there was the big crash. Also here we had several attempts to recover. In January 2009 we had a local high, but the bottom was reached on May 2009 with -55% from the last real high in October 2007. So the crash actually last almost 2 years, before the real recovery started. In March 2012 the stock market built a new ATH. Nasdaq-100 was very similar to S&P 500, but it recovered faster. Here already in January 2011 a new ATH was reached. 
@@ -1047,7 +1041,7 @@ fig.add_trace(
     ),
     secondary_y=True
 )
-fig.show()
+report_figure(fig)
 
 
 # Before the crysis the stock market had a high at 19th of February 2020 and then it lost -34% until 23rd of March 2020. After this it started to recover very fast and reached a new ATH in August 2020. The Nasdaq-100 was even faster and reached a new ATH in June. In general the growth of the Nasdaq-100 was superior to the S&P 500 during this time. 
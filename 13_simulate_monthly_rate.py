@@ -27,7 +27,7 @@ from utils.plots import draw_monte_carlo_simulation
 from utils.math import gmean, calc_min_returns, calc_max_drawdown, calc_correlations_over_time, normalize, calc_returns
 from utils.math import to_float, calc_growth, normalize_df, calc_monte_carlo_simulations
 from utils.math import apply_monte_carlo_sim, calc_simulation_characteristics
-from utils.data import cached, read_csv
+from utils.data import cached, read_csv, load_dataset
 from utils.portfolio import Portfolio, Asset, GermanTaxModel, MAPortfolio
 
 
@@ -41,9 +41,7 @@ cache_path = Path("cached_data")
 # In[4]:
 
 
-input_path = clean_data_path / "etfs.xlsx"
-etfs = pd.read_excel(input_path, index_col=0)
-etfs.index = pd.to_datetime(etfs.index)
+etfs = load_dataset("etfs")
 etfs['cash'] = 100.0
 etfs
 
@@ -155,7 +153,7 @@ def perform_monte_carlo_simulation(
         portfolio_simulation, 
         start_value = start_value, 
         periodic_rate = monthly_rate, 
-        rate_interval = 30
+        rate_frequency = "M",
     )
 
     kwargs = {}
@@ -166,7 +164,7 @@ def perform_monte_carlo_simulation(
             reference_simulation, 
             start_value = start_value, 
             periodic_rate = monthly_rate, 
-            rate_interval = 30
+            rate_frequency = "M",
         )
         kwargs['reference']=calc_simulation_characteristics(reference_simulation)['mean']
         kwargs['reference_name']=reference_name  
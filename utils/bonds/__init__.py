@@ -0,0 +1,6 @@
+from .bond_ladder import BondLadder
+from .bond_fund_batch_simulator import BondFundBatchSimulator
+from .bond_fund_simulator import BondFundSimulator
+from .simulate_bond_fund import simulate_bond_fund, simulate_bond_funds
+from .day_count import DAY_COUNT_CONVENTIONS, add_years, fractional_years, to_day_number
+from .yield_curve import YieldCurve
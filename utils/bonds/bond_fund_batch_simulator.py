@@ -0,0 +1,154 @@
+import numpy as np
+from typeguard import typechecked
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bond_ladder import BondLadder
+from .day_count import fractional_years
+
+
+class BondFundBatchSimulator():
+    """
+    Simulates several treasury bond funds at once. Every fund is defined by a spec of
+    (start_years, end_years) and works like 'BondFundSimulator'. All funds share a single bond ladder,
+    where every bond carries the id of its fund, thus every tick is one vectorized calculation over
+    the bonds of all funds.
+    """
+
+    @typechecked()
+    def __init__(self, start_value: float, specs: List[Tuple[int, int]], day_count: str = "YMD"):
+        assert len(specs) > 0, "At least one bond fund spec is required."
+        for start_years, end_years in specs:
+            assert start_years > end_years, \
+                f"The start years must be larger than the end years, but the spec is ({start_years}, {end_years})."
+
+        self._specs = list(specs)
+        self._start_values = np.full(len(specs), start_value, dtype=np.float64)
+        self._ladder = BondLadder(day_count=day_count)
+        self._year1 = np.array([s[0] for s in specs], dtype=np.int64)
+        self._year2 = np.array([s[1] for s in specs], dtype=np.int64)
+        self._fund_ids = np.arange(len(specs), dtype=np.int64)
+        self._interest1 = np.zeros(len(specs), dtype=np.float64)
+        self._interest2 = np.zeros(len(specs), dtype=np.float64)
+        self._curve_rates = None
+        self._last_tick_day = None
+        self._remaining_years = np.zeros(0, dtype=np.float64)
+
+
+    def _tick(
+            self,
+            day: int,
+            interests1: np.ndarray,
+            interests2: np.ndarray,
+            curve_rates: Optional[np.ndarray] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Collects the coupons, sells all bonds below the end years and buys a new bond for every fund.
+
+        :param day: The date of the tick as day number.
+        :param interests1: The yield of bonds with 'start_years' maturity for every fund in percent.
+        :param interests2: The yield of bonds with 'end_years' maturity for every fund in percent.
+        :param curve_rates: The row of a yield curve grid for this day (see 'YieldCurve'). If given, every bond
+            is valued with the rate of its remaining months instead of interpolating between the two yields.
+        :return: Returns the income of every fund or None, if the tick has already been calculated.
+        """
+        if self._last_tick_day == day:
+            return None
+
+        self._interest1 = interests1
+        self._interest2 = interests2
+        self._curve_rates = curve_rates
+        self._last_tick_day = day
+
+        income = self._start_values
+        self._start_values = np.zeros(len(self._specs), dtype=np.float64)
+
+        funds = self._ladder.funds
+        coupons = self._ladder.collect_coupons(day)
+        remaining_years = self._ladder.remaining_years(day)
+        sell = remaining_years <= self._year2[funds]
+        sell_interest = interests2[funds] if curve_rates is None else self._lookup_rates(curve_rates, remaining_years)
+        present_values = self._ladder.present_values(remaining_years, sell_interest)
+        income = income + np.bincount(
+            funds,
+            weights=coupons + np.where(sell, present_values, 0),
+            minlength=len(self._specs),
+        )
+        self._ladder.remove(sell)
+
+        self._ladder.buy(day, income, interests1, self._year1, self._fund_ids)
+        new_remaining_years = fractional_years(day, self._ladder.maturity_days[-len(self._specs):], self._ladder.day_count)
+        self._remaining_years = np.concatenate([remaining_years[~sell], new_remaining_years])
+        return income
+
+
+    @staticmethod
+    def _lookup_rates(curve_rates: np.ndarray, remaining_years: np.ndarray) -> np.ndarray:
+        months = np.clip(np.rint(remaining_years * 12).astype(np.int64), 0, len(curve_rates) - 1)
+        return curve_rates[months]
+
+
+    @property
+    def current_values(self) -> np.ndarray:
+        if self._last_tick_day is None:
+            return np.zeros(len(self._specs), dtype=np.float64)
+
+        if self._curve_rates is not None:
+            present_values = self._ladder.present_values(
+                self._remaining_years,
+                self._lookup_rates(self._curve_rates, self._remaining_years),
+            )
+            return self._start_values + np.bincount(self._ladder.funds, weights=present_values, minlength=len(self._specs))
+
+        funds = self._ladder.funds
+        remaining_years = self._remaining_years
+        year1 = self._year1[funds]
+        year2 = self._year2[funds]
+        interest1 = self._interest1[funds]
+        interest2 = self._interest2[funds]
+        interest = interest2 + (interest1 - interest2) * (remaining_years - year2) / (year1 - year2)
+        present_values = self._ladder.present_values(remaining_years, interest)
+        return self._start_values + np.bincount(funds, weights=present_values, minlength=len(self._specs))
+
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        :return: Returns a snapshot of the simulation (bonds, last tick and current rates), which can be pickled
+            and restored with 'from_state' to continue the simulation later.
+        """
+        return dict(
+            specs=self._specs,
+            start_values=self._start_values.copy(),
+            ladder=self._ladder.get_state(),
+            interest1=np.array(self._interest1, dtype=np.float64),
+            interest2=np.array(self._interest2, dtype=np.float64),
+            curve_rates=None if self._curve_rates is None else np.array(self._curve_rates, dtype=np.float64),
+            last_tick_day=self._last_tick_day,
+            remaining_years=self._remaining_years.copy(),
+        )
+
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "BondFundBatchSimulator":
+        """
+        :param state: A snapshot from 'get_state'.
+        :return: Returns a simulator, which continues after the last tick of the snapshot.
+        """
+        simulator = cls(0.0, state['specs'], state['ladder']['day_count'])
+        simulator._start_values = state['start_values'].copy()
+        simulator._ladder = BondLadder.from_state(state['ladder'])
+        simulator._interest1 = state['interest1']
+        simulator._interest2 = state['interest2']
+        simulator._curve_rates = state['curve_rates']
+        simulator._last_tick_day = state['last_tick_day']
+        simulator._remaining_years = state['remaining_years'].copy()
+        return simulator
+
+
+    @property
+    def specs(self) -> List[Tuple[int, int]]:
+        return self._specs
+
+
+    @property
+    def ladder(self) -> BondLadder:
+        return self._ladder
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Optional
+
+from .bond_ladder import BondLadder
+from .bond_fund_batch_simulator import BondFundBatchSimulator
+from .day_count import to_day_number
+
+
+class BondFundSimulator():
+    """
+    Simulates a treasury bond fund like the approach of the bogleheads user 'longinvest': On every tick the
+    fund buys a new bond with a maturity of 'start_years' and sells all bonds with less than 'end_years'
+    remaining. This is a batch simulation with a single fund (see 'BondFundBatchSimulator').
+    """
+
+    @typechecked()
+    def __init__(self, start_value: float, start_years: int, end_years: int, day_count: str = "YMD"):
+        self._batch = BondFundBatchSimulator(start_value, [(start_years, end_years)], day_count)
+
+
+    @typechecked()
+    def calculate_tick(self, current_date: pd.Timestamp, interest1: float, interest2: float) -> Optional[float]:
+        """
+        Collects the coupons, sells all bonds below the end years and buys a new bond with the income.
+
+        :param current_date: The date of the tick.
+        :param interest1: The yield of bonds with 'start_years' maturity in percent.
+        :param interest2: The yield of bonds with 'end_years' maturity in percent.
+        :return: Returns the income of this tick or None, if the tick has already been calculated.
+        """
+        income = self._batch._tick(to_day_number(current_date), np.array([interest1]), np.array([interest2]))
+        return None if income is None else float(income[0])
+
+
+    @property
+    def current_value(self) -> float:
+        return float(self._batch.current_values[0])
+
+
+    @property
+    def ladder(self) -> BondLadder:
+        return self._batch.ladder
@@ -0,0 +1,193 @@
+import numpy as np
+from typeguard import typechecked
+from typing import Any, Dict, Union
+
+from .day_count import DAY_COUNT_CONVENTIONS, add_years, fractional_years
+
+
+class BondLadder():
+    """
+    A ladder of bonds, which is stored as parallel numpy arrays instead of a list of bond objects.
+    Dates are stored as day numbers (days since 1970-01-01), thus all calculations are done for all
+    bonds at once. Every bond carries the id of its fund, so several funds can share one ladder.
+    """
+
+    @typechecked()
+    def __init__(self, capacity: int = 1024, day_count: str = "YMD"):
+        """
+        :param capacity: The initial number of bonds, which fit into the arrays.
+        :param day_count: The day-count convention for coupons and remaining years (see 'fractional_years').
+        """
+        assert day_count in DAY_COUNT_CONVENTIONS, \
+            f"Unknown day-count convention '{day_count}'. Use one of {DAY_COUNT_CONVENTIONS}."
+        self._day_count = day_count
+        self._size = 0
+        self._buy_day = np.zeros(capacity, dtype=np.int64)
+        self._last_collect_day = np.zeros(capacity, dtype=np.int64)
+        self._maturity_day = np.zeros(capacity, dtype=np.int64)
+        self._value = np.zeros(capacity, dtype=np.float64)
+        self._coupon = np.zeros(capacity, dtype=np.float64)
+        self._fund = np.zeros(capacity, dtype=np.int64)
+
+
+    def buy(
+            self,
+            day: int,
+            value: Union[float, np.ndarray],
+            coupon: Union[float, np.ndarray],
+            years: Union[int, np.ndarray],
+            fund: Union[int, np.ndarray] = 0,
+    ):
+        """
+        Buys new bonds at par. All arguments except the day can be given as arrays to buy several bonds at once.
+
+        :param day: The buy date as day number.
+        :param value: The face value of the bond.
+        :param coupon: The yearly coupon (yield) in percent.
+        :param years: The years until the bond matures.
+        :param fund: The id of the fund, which holds the bond.
+        """
+        value, coupon, years, fund = np.broadcast_arrays(value, coupon, years, fund)
+        count = value.size
+        while self._size + count > len(self._value):
+            self._grow()
+
+        new = slice(self._size, self._size + count)
+        self._buy_day[new] = day
+        self._last_collect_day[new] = day
+        self._maturity_day[new] = add_years(day, years.ravel())
+        self._value[new] = value.ravel()
+        self._coupon[new] = coupon.ravel()
+        self._fund[new] = fund.ravel()
+        self._size += count
+
+
+    def collect_coupons(self, day: int) -> np.ndarray:
+        """
+        Collects the coupons of all bonds since their last collection.
+
+        :param day: The current date as day number.
+        :return: Returns the collected coupon of every bond.
+        """
+        last_collect_day = self._last_collect_day[:self._size]
+        active = (day <= self._maturity_day[:self._size]) & (day >= last_collect_day)
+
+        coupons = np.zeros(self._size, dtype=np.float64)
+        if self._size > 0 and np.all(last_collect_day == last_collect_day[0]):
+            # on regular ticks all bonds have been collected at the same day
+            years = fractional_years(last_collect_day[0], day, self._day_count)
+        else:
+            years = fractional_years(last_collect_day[active], day, self._day_count)
+        coupons[active] = years * (self._coupon[:self._size][active] * self._value[:self._size][active]) / 100
+        last_collect_day[active] = day
+        return coupons
+
+
+    def remaining_years(self, day: int) -> np.ndarray:
+        """
+        :param day: The current date as day number.
+        :return: Returns the fractional years until every bond matures.
+        """
+        return fractional_years(day, self._maturity_day[:self._size], self._day_count)
+
+
+    def present_values(self, remaining_years: np.ndarray, interest: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Calculates the value of all bonds, if they would be sold for the current interest rate. This is the
+        closed form of '-npf.pv(interest, int(remaining_years), value * coupon, value)'.
+
+        :param remaining_years: The remaining years of every bond (see 'remaining_years').
+        :param interest: The current interest rate in percent, either for all bonds or for every bond.
+        :return: Returns the present value of every bond.
+        """
+        periods = np.trunc(remaining_years)
+        rate = np.broadcast_to(np.asarray(interest, dtype=np.float64) / 100, periods.shape)
+        value = self._value[:self._size]
+        payment = value * self._coupon[:self._size] / 100
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discount = (1 + rate) ** periods
+            annuity = np.where(rate == 0, periods, (discount - 1) / rate)
+        return (value + payment * annuity) / discount
+
+
+    def remove(self, mask: np.ndarray):
+        """
+        Removes all bonds, which are selected by the mask.
+
+        :param mask: A boolean array with one entry per bond.
+        """
+        keep = ~mask
+        size = int(np.count_nonzero(keep))
+        for a in [self._buy_day, self._last_collect_day, self._maturity_day, self._value, self._coupon, self._fund]:
+            a[:size] = a[:self._size][keep]
+        self._size = size
+
+
+    _STATE_ARRAYS = ["_buy_day", "_last_collect_day", "_maturity_day", "_value", "_coupon", "_fund"]
+
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        :return: Returns a snapshot of all bonds, which can be pickled and restored with 'from_state'.
+        """
+        state = {name: getattr(self, name)[:self._size].copy() for name in self._STATE_ARRAYS}
+        state['day_count'] = self._day_count
+        return state
+
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "BondLadder":
+        """
+        :param state: A snapshot from 'get_state'.
+        :return: Returns a ladder with the bonds of the snapshot.
+        """
+        size = len(state['_value'])
+        ladder = cls(capacity=max(1024, 2 * size), day_count=state['day_count'])
+        for name in cls._STATE_ARRAYS:
+            getattr(ladder, name)[:size] = state[name]
+        ladder._size = size
+        return ladder
+
+
+    def _grow(self):
+        capacity = 2 * len(self._value)
+        for name in self._STATE_ARRAYS:
+            a = getattr(self, name)
+            grown = np.zeros(capacity, dtype=a.dtype)
+            grown[:self._size] = a[:self._size]
+            setattr(self, name, grown)
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._value[:self._size]
+
+
+    @property
+    def coupons(self) -> np.ndarray:
+        return self._coupon[:self._size]
+
+
+    @property
+    def buy_days(self) -> np.ndarray:
+        return self._buy_day[:self._size]
+
+
+    @property
+    def maturity_days(self) -> np.ndarray:
+        return self._maturity_day[:self._size]
+
+
+    @property
+    def funds(self) -> np.ndarray:
+        return self._fund[:self._size]
+
+
+    @property
+    def day_count(self) -> str:
+        return self._day_count
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+
+
+# All dates are day numbers (days since 1970-01-01, like 'datetime64[D]'). The lookup tables convert them into
+# months and years with pure integer operations, which is much faster than datetime or relativedelta objects.
+_FIRST_YEAR = 1800
+_LAST_YEAR = 2300
+_MONTH_STARTS = np.arange(f"{_FIRST_YEAR}-01", f"{_LAST_YEAR}-02", dtype="datetime64[M]").astype("datetime64[D]").astype(np.int64)
+_YEAR_STARTS = _MONTH_STARTS[::12]
+_FIRST_DAY = _MONTH_STARTS[0]
+_MONTH_OF_DAY = np.repeat(np.arange(len(_MONTH_STARTS) - 1), np.diff(_MONTH_STARTS))
+
+DAY_COUNT_CONVENTIONS = ["YMD", "ACT/365.25", "ACT/ACT", "30/360"]
+
+
+def to_day_number(date: pd.Timestamp) -> int:
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+def _split_days(days: np.ndarray):
+    month = _MONTH_OF_DAY[days - _FIRST_DAY]
+    return month, days - _MONTH_STARTS[month]
+
+
+def _add_months(month: np.ndarray, day_of_month: np.ndarray, months: np.ndarray) -> np.ndarray:
+    target = month + months
+    month_length = _MONTH_STARTS[target + 1] - _MONTH_STARTS[target]
+    return _MONTH_STARTS[target] + np.minimum(day_of_month, month_length - 1)
+
+
+def add_years(days: Union[int, np.ndarray], years: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Adds whole years to day numbers like 'relativedelta(years=years)' does. The 29th of february
+    becomes the 28th of february in years, which are not leap years.
+
+    :param days: The day numbers.
+    :param years: The years to add.
+    :return: Returns the shifted day numbers.
+    """
+    days = np.asarray(days, dtype=np.int64)
+    month, day_of_month = _split_days(days)
+    return _add_months(month, day_of_month, 12 * np.asarray(years, dtype=np.int64))
+
+
+def _ymd_years(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    start_month, start_day_of_month = _split_days(start)
+    months = _MONTH_OF_DAY[end - _FIRST_DAY] - start_month
+
+    shifted = _add_months(start_month, start_day_of_month, months)
+    overshoot = shifted > end
+    months = months - overshoot
+    shifted = np.where(overshoot, _add_months(start_month, start_day_of_month, months), shifted)
+    days = end - shifted
+    return months // 12 + (months % 12) / 12 + days / 365.25
+
+
+def _act_act_years(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    start_year = _MONTH_OF_DAY[start - _FIRST_DAY] // 12
+    end_year = _MONTH_OF_DAY[end - _FIRST_DAY] // 12
+    start_year_length = _YEAR_STARTS[start_year + 1] - _YEAR_STARTS[start_year]
+    end_year_length = _YEAR_STARTS[end_year + 1] - _YEAR_STARTS[end_year]
+
+    same_year = (end - start) / start_year_length
+    first_year = (_YEAR_STARTS[start_year + 1] - start) / start_year_length
+    last_year = (end - _YEAR_STARTS[end_year]) / end_year_length
+    return np.where(start_year == end_year, same_year, first_year + (end_year - start_year - 1) + last_year)
+
+
+def _30_360_years(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    start_month, start_day_of_month = _split_days(start)
+    end_month, end_day_of_month = _split_days(end)
+    start_day = np.minimum(start_day_of_month + 1, 30)
+    end_day = np.where((end_day_of_month + 1 == 31) & (start_day == 30), 30, end_day_of_month + 1)
+    return (30 * (end_month - start_month) + (end_day - start_day)) / 360
+
+
+def fractional_years(
+        start: Union[int, np.ndarray],
+        end: Union[int, np.ndarray],
+        convention: str = "YMD",
+) -> np.ndarray:
+    """
+    Calculates the fractional years between day numbers with integer date arithmetic.
+
+    The following day-count conventions are supported:
+     * YMD: 'years + months/12 + days/365.25' of 'relativedelta(end, start)', which is the original
+       calculation of the bond simulation and gives exactly the same results
+     * ACT/365.25: the actual days divided by 365.25
+     * ACT/ACT: the actual days of every calendar year divided by the length of this year (ISDA)
+     * 30/360: every month has 30 days and every year 360 days (US bond basis)
+
+    :param start: The start day numbers.
+    :param end: The end day numbers. For the 'YMD' convention the end must not be before the start.
+    :param convention: The day-count convention.
+    :return: Returns the fractional years.
+    """
+    assert convention in DAY_COUNT_CONVENTIONS, \
+        f"Unknown day-count convention '{convention}'. Use one of {DAY_COUNT_CONVENTIONS}."
+    start, end = np.broadcast_arrays(np.asarray(start, dtype=np.int64), np.asarray(end, dtype=np.int64))
+
+    if convention == "YMD":
+        return _ymd_years(start, end)
+    elif convention == "ACT/365.25":
+        return (end - start) / 365.25
+    elif convention == "ACT/ACT":
+        return _act_act_years(start, end)
+    else:
+        return _30_360_years(start, end)
@@ -0,0 +1,155 @@
+import hashlib
+import pickle
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Any, Dict, Optional, Tuple
+
+from .bond_fund_batch_simulator import BondFundBatchSimulator
+from .yield_curve import YieldCurve
+
+
+def _hash_yields(yields: pd.DataFrame) -> str:
+    return hashlib.sha256(pd.util.hash_pandas_object(yields, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def _load_state(state_path: Path, parameters: Dict[str, Any], yields: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Loads the snapshot of a previous simulation, if it can be continued with the given yields. This is only the case,
+    if the parameters are the same and the yields of all simulated days did not change.
+    """
+    if not state_path.exists():
+        return None
+
+    with state_path.open("rb") as f:
+        state = pickle.load(f)
+
+    simulated_days = len(state['index'])
+    if state['parameters'] != parameters or simulated_days > len(yields.index):
+        return None
+    if not yields.index[:simulated_days].equals(state['index']):
+        return None
+    if _hash_yields(yields.iloc[:simulated_days]) != state['yields_hash']:
+        return None
+    return state
+
+
+@typechecked()
+def simulate_bond_funds(
+        yields: pd.DataFrame,
+        specs: Dict[str, Tuple[int, int]],
+        start_value: float = 100,
+        progress_output: bool = False,
+        day_count: str = "YMD",
+        yield_curve: Optional[YieldCurve] = None,
+        state_path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Simulates the daily values of several treasury bond funds in a single pass over the yield curve.
+    Funds with identical specs are only simulated once.
+
+    :param yields: The yield curve with a column per maturity ('1y', '3y', ...) in percent.
+    :param specs: The (start_years, end_years) spec of every fund by its name.
+    :param start_value: The start value of every fund.
+    :param progress_output: Prints the income and value of all funds once per month.
+    :param day_count: The day-count convention of the bonds (see 'fractional_years').
+    :param yield_curve: A yield curve grid with the same dates as the yields. If given, all bonds are valued with
+        the rate of their remaining maturity and the specs can use maturities, which are not part of the yields.
+    :param state_path: A file to store the state of the simulation. If the file contains the state of a previous
+        simulation with the same parameters, only the new days of the yields are simulated. If the yields of already
+        simulated days have changed, everything is simulated again.
+    :return: Returns a dataframe with a column per fund and the value for every date of the yield curve.
+    """
+    unique_specs = list(dict.fromkeys(specs.values()))
+    parameters = dict(
+        specs=unique_specs,
+        start_value=start_value,
+        day_count=day_count,
+        yield_curve=None if yield_curve is None else (yield_curve.method, yield_curve.max_months, yield_curve.tau),
+    )
+
+    state = None if state_path is None else _load_state(state_path, parameters, yields)
+    if state is None:
+        bond_funds = BondFundBatchSimulator(start_value, unique_specs, day_count)
+        previous_values = np.zeros((0, len(unique_specs)), dtype=np.float64)
+    else:
+        bond_funds = BondFundBatchSimulator.from_state(state['simulator'])
+        previous_values = state['values']
+
+    first_row = len(previous_values)
+    days = yields.index.to_numpy().astype("datetime64[D]").astype(np.int64)
+    if yield_curve is None:
+        interests1 = np.stack([yields[f'{s[0]}y'].to_numpy(dtype=np.float64) for s in unique_specs], axis=1)
+        interests2 = np.stack([yields[f'{s[1]}y'].to_numpy(dtype=np.float64) for s in unique_specs], axis=1)
+        grid = None
+    else:
+        assert yield_curve.index.equals(yields.index), "The yield curve must have the same dates as the yields."
+        assert all(12 * s[0] <= yield_curve.max_months for s in unique_specs), "The yield curve is too short for the specs."
+        grid = yield_curve.grid
+        interests1 = grid[:, [12 * s[0] for s in unique_specs]]
+        interests2 = grid[:, [12 * s[1] for s in unique_specs]]
+    values = np.zeros((len(days), len(unique_specs)), dtype=np.float64)
+    values[:first_row] = previous_values
+
+    last_month = None
+    for i in range(first_row, len(days)):
+        income = bond_funds._tick(int(days[i]), interests1[i], interests2[i], None if grid is None else grid[i])
+        values[i] = bond_funds.current_values
+        if progress_output and income is not None and yields.index[i].month != last_month:
+            last_month = yields.index[i].month
+            details = ", ".join(f"{s[0]}-{s[1]}y: ${v:.2f} (income: ${c:.2f})" for s, v, c in zip(unique_specs, values[i], income))
+            print(f"{yields.index[i]}: {details}")
+
+    if state_path is not None and (state is None or first_row < len(days)):
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with state_path.open("wb") as f:
+            pickle.dump(
+                dict(
+                    parameters=parameters,
+                    index=yields.index,
+                    yields_hash=_hash_yields(yields),
+                    values=values,
+                    simulator=bond_funds.get_state(),
+                ),
+                f,
+            )
+
+    columns = [unique_specs.index(s) for s in specs.values()]
+    return pd.DataFrame(values[:, columns], index=yields.index, columns=list(specs.keys()))
+
+
+@typechecked()
+def simulate_bond_fund(
+        yields: pd.DataFrame,
+        start_years: int,
+        end_years: int,
+        start_value: float = 100,
+        progress_output: bool = False,
+        day_count: str = "YMD",
+        yield_curve: Optional[YieldCurve] = None,
+        state_path: Optional[Path] = None,
+) -> pd.Series:
+    """
+    Simulates the daily values of a treasury bond fund, which holds bonds from 'start_years' to 'end_years'.
+
+    :param yields: The yield curve with a column per maturity ('1y', '3y', ...) in percent.
+    :param start_years: The maturity of the bonds, which are bought.
+    :param end_years: The remaining years, when the bonds are sold.
+    :param start_value: The start value of the fund.
+    :param progress_output: Prints the income and value of the fund once per month.
+    :param day_count: The day-count convention of the bonds (see 'fractional_years').
+    :param yield_curve: A yield curve grid with the same dates as the yields (see 'simulate_bond_funds').
+    :param state_path: A file to store the state of the simulation (see 'simulate_bond_funds').
+    :return: Returns a series with the value of the fund for every date of the yield curve.
+    """
+    name = f"{start_years}-{end_years}y"
+    return simulate_bond_funds(
+        yields,
+        {name: (start_years, end_years)},
+        start_value,
+        progress_output,
+        day_count,
+        yield_curve,
+        state_path,
+    )[name].rename(None)
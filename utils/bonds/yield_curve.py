@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Union
+
+
+class YieldCurve():
+    """
+    A precomputed yield curve grid with one row per day and one column per maturity in months (0 to 'max_months').
+    The grid is calculated once from the tenors of a yield curve dataframe (columns '1y', '3y', ...), thus the
+    rates for any number of bonds can be looked up by integer (day, remaining months) indexing.
+
+    The following fitting methods are supported:
+     * linear: linear interpolation between the tenors
+     * pchip: monotone cubic interpolation (Fritsch-Carlson), which does not overshoot between the tenors
+     * nelson-siegel: a Nelson-Siegel curve with a fixed 'tau', which is fitted to the tenors of every day
+
+    Linear and pchip keep the rates of the first and last tenor constant outside of the tenors.
+    """
+
+    METHODS = ["linear", "pchip", "nelson-siegel"]
+
+
+    @typechecked()
+    def __init__(self, yields: pd.DataFrame, method: str = "linear", max_months: int = 360, tau: float = 1.37):
+        """
+        :param yields: The yield curve with a column per maturity ('1y', '3y', ...) in percent.
+        :param method: The fitting method, which is used to calculate the grid.
+        :param max_months: The longest maturity of the grid in months.
+        :param tau: The decay of the Nelson-Siegel factors in years.
+        """
+        assert method in self.METHODS, f"Unknown method '{method}'. Use one of {self.METHODS}."
+        assert all(str(c).endswith("y") for c in yields.columns), "All columns must be maturities in years, like '10y'."
+        assert not yields.isna().any().any(), "The yields must not contain missing values."
+
+        tenors = np.array([int(str(c)[:-1]) * 12 for c in yields.columns], dtype=np.float64)
+        order = np.argsort(tenors)
+        tenors = tenors[order]
+        values = yields.to_numpy(dtype=np.float64)[:, order]
+        months = np.arange(max_months + 1, dtype=np.float64)
+
+        if method == "linear":
+            grid = self._linear(tenors, values, months)
+        elif method == "pchip":
+            grid = self._pchip(tenors, values, months)
+        else:
+            grid = self._nelson_siegel(tenors, values, months, tau * 12)
+
+        self._index = yields.index
+        self._days = yields.index.to_numpy().astype("datetime64[D]").astype(np.int64)
+        self._method = method
+        self._tau = tau
+        self._grid = grid
+
+
+    @staticmethod
+    def _segments(tenors: np.ndarray, months: np.ndarray):
+        segment = np.clip(np.searchsorted(tenors, months, side="right") - 1, 0, len(tenors) - 2)
+        t = (np.clip(months, tenors[0], tenors[-1]) - tenors[segment]) / (tenors[segment + 1] - tenors[segment])
+        return segment, t
+
+
+    @classmethod
+    def _linear(cls, tenors: np.ndarray, values: np.ndarray, months: np.ndarray) -> np.ndarray:
+        segment, t = cls._segments(tenors, months)
+        return values[:, segment] * (1 - t) + values[:, segment + 1] * t
+
+
+    @staticmethod
+    def _pchip_edge(h0: float, h1: float, delta0: np.ndarray, delta1: np.ndarray) -> np.ndarray:
+        # three-point formula for the derivative at the first or last tenor, limited to keep the monotonicity
+        d = ((2 * h0 + h1) * delta0 - h0 * delta1) / (h0 + h1)
+        d = np.where(np.sign(d) != np.sign(delta0), 0, d)
+        return np.where((np.sign(delta0) != np.sign(delta1)) & (np.abs(d) > np.abs(3 * delta0)), 3 * delta0, d)
+
+
+    @classmethod
+    def _pchip(cls, tenors: np.ndarray, values: np.ndarray, months: np.ndarray) -> np.ndarray:
+        h = np.diff(tenors)
+        delta = np.diff(values, axis=1) / h
+
+        # derivatives at the inner tenors as weighted harmonic mean of the neighbouring slopes
+        d = np.zeros_like(values)
+        w1 = 2 * h[1:] + h[:-1]
+        w2 = h[1:] + 2 * h[:-1]
+        same_sign = delta[:, :-1] * delta[:, 1:] > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            harmonic = (w1 + w2) / (w1 / delta[:, :-1] + w2 / delta[:, 1:])
+        d[:, 1:-1] = np.where(same_sign, harmonic, 0)
+
+        d[:, 0] = cls._pchip_edge(h[0], h[1], delta[:, 0], delta[:, 1])
+        d[:, -1] = cls._pchip_edge(h[-1], h[-2], delta[:, -1], delta[:, -2])
+
+        segment, t = cls._segments(tenors, months)
+        h00 = (1 + 2 * t) * (1 - t) ** 2
+        h10 = t * (1 - t) ** 2
+        h01 = t ** 2 * (3 - 2 * t)
+        h11 = t ** 2 * (t - 1)
+        return (
+            h00 * values[:, segment] + h10 * h[segment] * d[:, segment] +
+            h01 * values[:, segment + 1] + h11 * h[segment] * d[:, segment + 1]
+        )
+
+
+    @staticmethod
+    def _nelson_siegel_factors(months: np.ndarray, tau: float) -> np.ndarray:
+        x = months / tau
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(x == 0, 1, (1 - np.exp(-x)) / x)
+        curvature = slope - np.exp(-x)
+        return np.stack([np.ones_like(x), slope, curvature], axis=1)
+
+
+    @classmethod
+    def _nelson_siegel(cls, tenors: np.ndarray, values: np.ndarray, months: np.ndarray, tau: float) -> np.ndarray:
+        # with a fixed tau the curve is linear in its three factors, thus all days are fitted by a single lstsq
+        betas, _, _, _ = np.linalg.lstsq(cls._nelson_siegel_factors(tenors, tau), values.T, rcond=None)
+        return (cls._nelson_siegel_factors(months, tau) @ betas).T
+
+
+    def get_row(self, date: Union[pd.Timestamp, int]) -> int:
+        """
+        :param date: A date of the yield curve as timestamp or day number.
+        :return: Returns the row of this date inside the grid.
+        """
+        day = date if isinstance(date, int) else int(np.datetime64(date, "D").astype(np.int64))
+        row = int(np.searchsorted(self._days, day))
+        assert row < len(self._days) and self._days[row] == day, f"The date {date} is not part of the yield curve."
+        return row
+
+
+    def rates(self, rows: Union[int, np.ndarray], months: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Looks up the rates of the grid. Months outside of the grid are clipped to the shortest and longest maturity.
+
+        :param rows: The rows of the days (see 'get_row').
+        :param months: The remaining months of the bonds.
+        :return: Returns the rates in percent.
+        """
+        return self._grid[rows, np.clip(months, 0, self.max_months)]
+
+
+    def to_frame(self, years: Union[int, float, list]) -> pd.DataFrame:
+        """
+        :param years: A maturity or a list of maturities in years.
+        :return: Returns the rates of those maturities as dataframe with the same layout as the input yields.
+        """
+        years = years if isinstance(years, list) else [years]
+        months = [int(round(y * 12)) for y in years]
+        return pd.DataFrame(self._grid[:, months], index=self._index, columns=[f"{y}y" for y in years])
+
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self._index
+
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+
+    @property
+    def tau(self) -> float:
+        return self._tau
+
+
+    @property
+    def grid(self) -> np.ndarray:
+        return self._grid
+
+
+    @property
+    def max_months(self) -> int:
+        return self._grid.shape[1] - 1
@@ -6,3 +6,10 @@ from .download_from_nasdaq import download_from_nasdaq
 from .download_from_fred import download_from_fred
 from .cached import cached
 from .merge import merge_series
+from .fx_rates import FxRates
+from .frame_store import read_frame, write_frame
+from .price_store import PriceStore, load_prices, write_prices
+from .download_manager import DownloadManager, DownloadResponse, get_download_manager, set_download_manager
+from .series_store import SeriesStore
+from .low_frequency_series import EXPANSION_RULES, LowFrequencySeries
+from .datasets import DATASETS, DATASET_KINDS, load_dataset, register_dataset
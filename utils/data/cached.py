@@ -1,25 +1,121 @@
+import hashlib
+import inspect
+import os
 import pickle
+import numpy as np
+import pandas as pd
 from functools import wraps
 from pathlib import Path
 from typeguard import typechecked
+from typing import Any
+
+
+_CACHE_FILE_SUFFIX = ".pkl"
+
+
+def _update_hash(h, value: Any):
+    """
+    Adds a value to the hash. Dataframes, series and arrays are hashed by their content, containers recursively
+    and all other values by their pickled representation.
+    """
+    h.update(type(value).__qualname__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).to_numpy().tobytes())
+        if isinstance(value, pd.DataFrame):
+            _update_hash(h, [str(c) for c in value.columns])
+            _update_hash(h, [str(d) for d in value.dtypes])
+        elif isinstance(value, pd.Series):
+            _update_hash(h, [str(value.name), str(value.dtype)])
+
+    elif isinstance(value, np.ndarray):
+        h.update(str((value.dtype, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+
+    elif isinstance(value, (list, tuple)):
+        h.update(str(len(value)).encode())
+        for v in value:
+            _update_hash(h, v)
+
+    elif isinstance(value, dict):
+        h.update(str(len(value)).encode())
+        for k in sorted(value.keys(), key=str):
+            _update_hash(h, k)
+            _update_hash(h, value[k])
+
+    elif isinstance(value, (str, int, float, bool, Path)) or value is None:
+        h.update(repr(value).encode())
+
+    else:
+        h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _get_source(func) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return func.__code__.co_code.hex() if hasattr(func, "__code__") else ""
+
+
+def _evict(cache_dir_path: Path, max_size: int, keep_path: Path):
+    """
+    Deletes the least recently used entries, until the cache is not larger than the maximal size.
+    The entry of 'keep_path' is never deleted.
+    """
+    entries = []
+    for path in cache_dir_path.glob(f"*{_CACHE_FILE_SUFFIX}"):
+        if path == keep_path:
+            continue
+        stat = path.stat()
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    size = sum(e[1] for e in entries) + keep_path.stat().st_size
+    for _, entry_size, path in sorted(entries, key=lambda e: e[0]):
+        if size <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        size -= entry_size
 
 
 @typechecked()
-def cached(cache_dir_path: Path):
+def cached(cache_dir_path: Path, max_size_mb: float = 1024):
+    """
+    Caches the results of a function on disk. The key of every entry is a hash of the qualified name and the
+    source code of the function together with all arguments. Dataframes and series are hashed by their content,
+    thus a changed input or a changed function leads to a new calculation, while equal inputs are loaded from the
+    cache.
+
+    Every entry is stored as pickle file in the cache directory. If the cache gets larger than the maximal size,
+    the least recently used entries are deleted.
+
+    :param cache_dir_path: The directory of the cache.
+    :param max_size_mb: The maximal size of the cache in megabytes.
+    """
     def inner_cached(func):
+        source = _get_source(func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not cache_dir_path.exists():
-                ret = func(*args, **kwargs)
+            h = hashlib.sha256()
+            _update_hash(h, f"{func.__module__}.{func.__qualname__}")
+            _update_hash(h, source)
+            _update_hash(h, list(args))
+            _update_hash(h, kwargs)
+            entry_path = cache_dir_path / f"{func.__name__}_{h.hexdigest()[:32]}{_CACHE_FILE_SUFFIX}"
 
-                cache_dir_path.parent.mkdir(parents=True, exist_ok=True)
-                with cache_dir_path.open("wb") as f:
-                    pickle.dump(ret, f)
-
-            else:
-                with cache_dir_path.open("rb") as f:
+            if entry_path.exists():
+                with entry_path.open("rb") as f:
                     ret = pickle.load(f)
+                os.utime(entry_path)
+                return ret
+
+            ret = func(*args, **kwargs)
 
+            cache_dir_path.mkdir(parents=True, exist_ok=True)
+            temp_path = entry_path.with_suffix(".tmp")
+            with temp_path.open("wb") as f:
+                pickle.dump(ret, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+            _evict(cache_dir_path, int(max_size_mb * 1024 * 1024), entry_path)
             return ret
 
         return wrapper
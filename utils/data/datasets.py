@@ -0,0 +1,103 @@
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Any, Dict, List, Optional, Tuple, Union
+from utils.math import to_period_end
+from .frame_store import read_frame
+from .price_store import load_prices
+from .low_frequency_series import LowFrequencySeries
+
+
+DATASET_KINDS = ["frame", "prices", "low_frequency"]
+
+DATASETS = {
+    "assets": ("assets.npz", "frame"),
+    "bond_funds": ("bond_funds.npz", "frame"),
+    "borrowing_rate": ("borrowing_rate.npz", "frame"),
+    "hfea_data": ("hfea_data.npz", "frame"),
+    "etfs": ("etfs.npy", "prices"),
+    "inflation": ("inflation.lfs.npz", "low_frequency"),
+    "ffr": ("ffr.lfs.npz", "low_frequency"),
+}
+
+_loaded: Dict[Tuple[Any, ...], pd.DataFrame] = {}
+
+
+@typechecked()
+def register_dataset(name: str, file_name: str, kind: str):
+    """
+    Adds a dataset to the registry or replaces an existing one.
+
+    :param name: The name of the dataset.
+    :param file_name: The file name of the dataset relative to the data directory.
+    :param kind: The storage format of the file (see DATASET_KINDS).
+    """
+    assert kind in DATASET_KINDS, f"Unknown dataset kind '{kind}'. Use one of {DATASET_KINDS}."
+    DATASETS[name] = (file_name, kind)
+
+
+def _read_dataset(
+        file_path: Path,
+        kind: str,
+        columns: Optional[List[str]],
+        start: Optional[Union[str, pd.Timestamp]],
+        end: Optional[Union[str, pd.Timestamp]],
+) -> pd.DataFrame:
+    if kind == "frame":
+        return read_frame(file_path, columns=columns, start=start, end=end)
+
+    if kind == "prices":
+        return load_prices(file_path, columns=columns, start=start, end=end)
+
+    series = LowFrequencySeries.load(file_path)
+    if columns is not None:
+        missing = [c for c in columns if c not in series.observations.columns]
+        assert len(missing) == 0, f"The columns {missing} are not part of {file_path}."
+        series = LowFrequencySeries(series.observations[columns], rule=series.rule, start=series.start, end=series.end)
+    return series.to_daily(
+        start=series.start if start is None else max(pd.Timestamp(start), series.start),
+        end=series.end if end is None else min(to_period_end(end).normalize(), series.end),
+    )
+
+
+@typechecked()
+def load_dataset(
+        name: str,
+        columns: Optional[List[str]] = None,
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+        data_path: Path = Path("clean_data"),
+) -> pd.DataFrame:
+    """
+    Loads a named dataset (see DATASETS) with a datetime index. Only the requested columns and dates are read from
+    the storage and low frequency datasets are only expanded to daily values for the requested dates. Every
+    selection is loaded only once per process and loaded again, if the file was written again.
+
+    The returned dataframe can get new columns, but its values must not be changed in place, since they are shared
+    with later calls.
+
+    :param name: The name of the dataset.
+    :param columns: The columns to load. Loads all columns, if not given.
+    :param start: The first date to load (inclusive).
+    :param end: The last date to load (inclusive). A year or month includes all its days.
+    :param data_path: The directory of the dataset files.
+    :return: Returns the dataset.
+    """
+    assert name in DATASETS, f"Unknown dataset '{name}'. Use one of {list(DATASETS.keys())}."
+    file_name, kind = DATASETS[name]
+    file_path = data_path / file_name
+
+    key = (
+        file_path.resolve(),
+        file_path.stat().st_mtime_ns,
+        None if columns is None else tuple(columns),
+        None if start is None else pd.Timestamp(start),
+        None if end is None else to_period_end(end),
+    )
+    if key not in _loaded:
+        for old_key in [k for k in _loaded.keys() if k[0] == key[0] and k[1] != key[1]]:
+            del _loaded[old_key]
+        data = _read_dataset(file_path, kind, columns, start, end)
+        data.index = pd.to_datetime(data.index)
+        _loaded[key] = data
+    return _loaded[key].copy(deep=False)
@@ -1,23 +1,26 @@
-import requests
 import io
 import pandas as pd
-import numpy as np
-import time
 from typeguard import typechecked
-from typing import Optional
+from typing import Optional, Union
 
 from utils.math import to_float
+from .download_manager import get_download_manager
 
 
 @typechecked()
-def download_from_fred(name: str, column_name: Optional[str] = None):
+def download_from_fred(
+        name: str,
+        column_name: Optional[str] = None,
+        start_date: Optional[Union[str, pd.Timestamp]] = None,
+        refresh: bool = False,
+):
     if column_name is None:
         column_name = name
 
     url = f'https://fred.stlouisfed.org/graph/fredgraph.csv?id={name}'
-    session = requests.Session()
-    time.sleep(np.random.uniform(0.5, 1.5))
-    response = session.get(url)
+    if start_date is not None:
+        url += f'&cosd={pd.Timestamp(start_date).strftime("%Y-%m-%d")}'
+    response = get_download_manager().request(url, refresh=refresh)
     assert response.status_code == 200, f"Error when downloading the data. Status-Code: {response.status_code}\n{response.text}"
     with io.StringIO(response.text) as f:
         data = pd.read_csv(f, index_col=0)
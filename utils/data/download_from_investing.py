@@ -1,15 +1,13 @@
-import requests
-import time
 import re
 import json5
 import datetime
 import pandas as pd
-import numpy as np
 from dateutil.relativedelta import relativedelta
 from typeguard import typechecked
 from typing import Optional, Union
 
 from utils.math import to_float
+from .download_manager import get_download_manager
 
 
 @typechecked()
@@ -34,10 +32,9 @@ def download_from_investing(
     data_excess_info_pattern = re.compile(r"window.histDataExcessInfo = ({[^}]*})", flags=re.DOTALL)
 
     base_url = f"https://www.investing.com/{category}/{name}-historical-data"
-    session = requests.Session()
-    session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2227.0 Safari/537.36'})
-    response = session.get(base_url)
-    time.sleep(np.random.uniform(0.5, 1.5))
+    user_agent = {'User-Agent': 'Mozilla/5.0 (Windows NT 6.1; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2227.0 Safari/537.36'}
+    download_manager = get_download_manager()
+    response = download_manager.request(base_url, headers=user_agent)
     assert response.status_code == 200, f"Request was not successful: {response.status_code}:\n{response.text}"
 
     match = data_excess_info_pattern.search(response.text)
@@ -61,7 +58,8 @@ def download_from_investing(
         'sort_ord': 'DESC',
         'action': 'historical_data',
     }
-    response = session.post(url, data=arguments, headers={
+    response = download_manager.request(url, method="POST", data=arguments, headers={
+        **user_agent,
         'POST': '/instruments/HistoricalDataAjax HTTP/3',
         'Host': 'www.investing.com',
         'Accept': 'text/plain, */*; q=0.01',
@@ -77,7 +75,6 @@ def download_from_investing(
         'Pragma': 'no-cache',
         'Cache-Control': 'no-cache',
     })
-    time.sleep(np.random.uniform(0.5, 1.5))
     assert response.status_code == 200, f"Request was not successful: {response.status_code}:\n{response.text}"
 
     html_content = response.content.decode('utf-8')
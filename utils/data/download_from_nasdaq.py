@@ -5,6 +5,7 @@ from pathlib import Path
 from typeguard import typechecked
 
 from utils.math import to_float
+from .download_manager import get_download_manager
 
 
 @typechecked()
@@ -15,7 +16,7 @@ def download_from_nasdaq(name: str, column_name: str, api_key_path: Path = Path(
         api_key = yaml.safe_load(f)
     quandl.ApiConfig.api_key = api_key['key']
 
-    data = quandl.get(name)
+    data = get_download_manager().call(("nasdaq", name), "data.nasdaq.com", lambda: quandl.get(name), serialize=True)
     data.index = pd.to_datetime(data.index)
     data = data[column_name].apply(to_float)
     data.name = name
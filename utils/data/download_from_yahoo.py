@@ -1,30 +1,48 @@
 import yfinance
 import pandas as pd
 from typeguard import typechecked
-from typing import Optional
+from typing import Optional, Union
 
 from utils.math import to_float, calc_returns, calc_growth, reindex_and_fill
+from .download_manager import get_download_manager
+
+
+_YAHOO_HOST = "query1.finance.yahoo.com"
 
 
 @typechecked()
-def download_from_yahoo(ticker: str, name: Optional[str] = None, adjust=True, dividends=False):
+def download_from_yahoo(
+        ticker: str,
+        name: Optional[str] = None,
+        adjust=True,
+        dividends=False,
+        start_date: Optional[Union[str, pd.Timestamp]] = None,
+        refresh: bool = False,
+):
     if name is None:
         name = ticker
 
-    data = yfinance.download(
+    if start_date is not None:
+        start_date = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+
+    download_manager = get_download_manager()
+    data = download_manager.call(("yahoo", ticker, adjust, start_date), _YAHOO_HOST, lambda: yfinance.download(
         [ticker],
-        start=None,
-        period='max',
+        start=start_date,
+        period='max' if start_date is None else None,
         auto_adjust=adjust,
         actions=False,
         progress=False
-    )['Close'].apply(to_float)
+    ), serialize=True, refresh=refresh)['Close'].apply(to_float)
     data.name = name
     data.index = pd.to_datetime(data.index)
     data = reindex_and_fill(data, min(data.index), max(data.index), freq="D")
 
     if dividends:
-        dividends = yfinance.Ticker(ticker).dividends
+        dividends = download_manager.call(
+            ("yahoo-dividends", ticker), _YAHOO_HOST, lambda: yfinance.Ticker(ticker).dividends,
+            serialize=True, refresh=refresh,
+        )
         value_percent = calc_returns(data, freq="D")
         for i in dividends.index:
             if i in data.index:
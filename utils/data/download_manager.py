@@ -0,0 +1,271 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typeguard import typechecked
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+
+class DownloadResponse():
+    """
+    The response of a download, which is either fresh from the server or loaded from the cache.
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str], from_cache: bool):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class DownloadManager():
+    """
+    Downloads data concurrently over pooled connections. Every thread keeps its own session with a connection pool,
+    and requests to the same host keep a minimal interval between each other.
+
+    All successful responses are stored in an on-disk cache. A cached response is used without request, as long as
+    it is younger than the TTL. An older response is revalidated with its ETag or Last-Modified header, thus an
+    unchanged response is not downloaded again.
+
+    In offline mode, no request is sent at all. Every response is served from the cache, which works as recorded
+    fixtures of a previous online run. A missing response is an error in offline mode.
+    """
+
+    @typechecked()
+    def __init__(
+            self,
+            cache_dir_path: Path = Path("cached_downloads"),
+            ttl: float = 24*60*60,
+            max_workers: int = 8,
+            min_interval: float = 0.5,
+            rate_limits: Optional[Dict[str, float]] = None,
+            offline: bool = False,
+            timeout: float = 60,
+    ):
+        """
+        :param cache_dir_path: The directory of the response cache.
+        :param ttl: The time in seconds, a cached response is used without revalidation.
+        :param max_workers: The number of parallel downloads.
+        :param min_interval: The minimal time in seconds between two requests to the same host.
+        :param rate_limits: The minimal time in seconds between two requests by host, which overwrites the default.
+        :param offline: If true, all responses are served from the cache.
+        :param timeout: The time in seconds to wait for a server, before the request fails.
+        """
+        self._cache_dir_path = cache_dir_path
+        self._ttl = ttl
+        self._max_workers = max_workers
+        self._min_interval = min_interval
+        self._rate_limits = {} if rate_limits is None else dict(rate_limits)
+        self._offline = offline
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._host_locks = {}
+        self._client_locks = {}
+        self._next_request_time = {}
+
+
+    def _get_session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self._max_workers, pool_maxsize=self._max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return self._local.session
+
+
+    def _wait_for_host(self, host: str):
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        with host_lock:
+            wait_time = self._next_request_time.get(host, 0) - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            self._next_request_time[host] = time.monotonic() + self._rate_limits.get(host, self._min_interval)
+
+
+    def _get_client_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._client_locks.setdefault(host, threading.Lock())
+
+
+    def _get_entry_path(self, key: Any) -> Path:
+        return self._cache_dir_path / f"{hashlib.sha256(repr(key).encode()).hexdigest()}.pkl"
+
+
+    def _load_entry(self, key: Any) -> Optional[Dict[str, Any]]:
+        entry_path = self._get_entry_path(key)
+        if not entry_path.exists():
+            return None
+        with entry_path.open("rb") as f:
+            return pickle.load(f)
+
+
+    def _store_entry(self, key: Any, entry: Dict[str, Any]):
+        entry_path = self._get_entry_path(key)
+        self._cache_dir_path.mkdir(parents=True, exist_ok=True)
+        temp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with temp_path.open("wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+
+
+    @typechecked()
+    def request(
+            self,
+            url: str,
+            method: str = "GET",
+            params: Optional[Dict[str, str]] = None,
+            data: Optional[Dict[str, str]] = None,
+            headers: Optional[Dict[str, str]] = None,
+            refresh: bool = False,
+    ) -> DownloadResponse:
+        """
+        Sends a request or serves it from the cache. Only successful responses are cached.
+
+        :param url: The url.
+        :param method: The HTTP method.
+        :param params: The query parameters.
+        :param data: The form data of the request.
+        :param headers: Additional headers of the request.
+        :param refresh: If true, a cached response is always revalidated, even if it is younger than the TTL.
+        :return: Returns the response.
+        """
+        key = ("request", method, url, sorted((params or {}).items()), sorted((data or {}).items()))
+        entry = self._load_entry(key)
+        if self._offline:
+            assert entry is not None, f"There is no recorded response for {method} {url} in offline mode."
+            return DownloadResponse(url, entry['status_code'], entry['content'], entry['headers'], from_cache=True)
+
+        if not refresh and entry is not None and time.time() - entry['time'] < self._ttl:
+            return DownloadResponse(url, entry['status_code'], entry['content'], entry['headers'], from_cache=True)
+
+        headers = dict(headers or {})
+        if entry is not None:
+            # Header names are case-insensitive and servers differ in their spelling
+            entry_headers = CaseInsensitiveDict(entry['headers'])
+            if 'ETag' in entry_headers:
+                headers['If-None-Match'] = entry_headers['ETag']
+            if 'Last-Modified' in entry_headers:
+                headers['If-Modified-Since'] = entry_headers['Last-Modified']
+
+        self._wait_for_host(urlparse(url).netloc)
+        response = self._get_session().request(
+            method, url, params=params, data=data, headers=headers, timeout=self._timeout
+        )
+
+        if response.status_code == 304 and entry is not None:
+            entry['time'] = time.time()
+            self._store_entry(key, entry)
+            return DownloadResponse(url, entry['status_code'], entry['content'], entry['headers'], from_cache=True)
+
+        response_headers = CaseInsensitiveDict(response.headers)
+        if response.status_code == 200:
+            self._store_entry(key, dict(
+                status_code=response.status_code,
+                content=response.content,
+                headers=response_headers,
+                time=time.time(),
+            ))
+        return DownloadResponse(url, response.status_code, response.content, response_headers, from_cache=False)
+
+
+    @typechecked()
+    def call(
+            self,
+            key: Any,
+            host: str,
+            func: Callable[[], Any],
+            serialize: bool = False,
+            refresh: bool = False,
+    ) -> Any:
+        """
+        Calls a download function, which does not use plain HTTP requests (e.g. a client library), with the same
+        rate limits, cache and offline mode as the requests. The return value of the function is cached by the key.
+
+        :param key: A key, which identifies the download. Its representation must be stable between runs.
+        :param host: The host, which is used for the rate limit.
+        :param func: The download function.
+        :param serialize: If true, only one function runs at a time for this host. This is needed for clients,
+            which are not thread-safe (e.g. yfinance.download, which shares module-level result dicts).
+        :param refresh: If true, the function is called again, even if the cached result is younger than the TTL.
+        :return: Returns the return value of the function.
+        """
+        key = ("call", key)
+        entry = self._load_entry(key)
+        if self._offline:
+            assert entry is not None, f"There is no recorded result for {key} in offline mode."
+            return entry['value']
+
+        if not refresh and entry is not None and time.time() - entry['time'] < self._ttl:
+            return entry['value']
+
+        if serialize:
+            with self._get_client_lock(host):
+                self._wait_for_host(host)
+                value = func()
+        else:
+            self._wait_for_host(host)
+            value = func()
+        self._store_entry(key, dict(value=value, time=time.time()))
+        return value
+
+
+    @typechecked()
+    def download_all(self, downloads: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Runs many downloads concurrently in a thread pool.
+
+        :param downloads: The download functions by name.
+        :return: Returns the results by name.
+        """
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {name: executor.submit(func) for name, func in downloads.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+
+    @property
+    def offline(self) -> bool:
+        return self._offline
+
+
+_download_manager: Optional[DownloadManager] = None
+_download_manager_lock = threading.Lock()
+
+
+@typechecked()
+def get_download_manager() -> DownloadManager:
+    """
+    Returns the download manager, which is used by all download functions. If none was set, a manager with default
+    arguments is created. The offline mode of this manager can be enabled with the environment variable
+    DOWNLOAD_OFFLINE=1.
+    """
+    global _download_manager
+    with _download_manager_lock:
+        if _download_manager is None:
+            _download_manager = DownloadManager(offline=os.environ.get("DOWNLOAD_OFFLINE", "0") == "1")
+        return _download_manager
+
+
+@typechecked()
+def set_download_manager(download_manager: DownloadManager):
+    """
+    Sets the download manager, which is used by all download functions.
+    """
+    global _download_manager
+    with _download_manager_lock:
+        _download_manager = download_manager
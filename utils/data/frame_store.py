@@ -0,0 +1,98 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import List, Optional, Union
+
+from utils.math import to_period_end
+
+
+_FORMAT_VERSION = 1
+
+
+def _to_datetime64(date: Union[str, pd.Timestamp]) -> np.datetime64:
+    return pd.Timestamp(date).to_datetime64()
+
+
+@typechecked()
+def write_frame(
+        data: Union[pd.DataFrame, pd.Series],
+        file_path: Path,
+        excel: bool = False,
+):
+    """
+    Writes a dataframe in a columnar binary format (uncompressed .npz). The index and every column are stored as
+    separate numpy arrays, so single columns can be loaded without reading the whole file (see 'read_frame').
+
+    :param data: The data. A series is stored as dataframe with a single column.
+    :param file_path: The path of the .npz file.
+    :param excel: If true, the data is also exported as Excel file next to the .npz file.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame(name=data.name if data.name is not None else 0)
+
+    assert not isinstance(data.columns, pd.MultiIndex), "Multi index columns are not supported."
+    assert data.columns.is_unique, "The column names must be unique."
+    meta = dict(
+        version=_FORMAT_VERSION,
+        columns=[str(c) for c in data.columns],
+        index_name=data.index.name,
+    )
+
+    arrays = {
+        "meta": np.array(json.dumps(meta)),
+        "index": data.index.to_numpy(),
+    }
+    for i, column in enumerate(data.columns):
+        values = data[column].to_numpy()
+        assert values.dtype != object, f"The column '{column}' has no numeric type."
+        arrays[f"column_{i}"] = values
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_suffix(".tmp.npz")
+    np.savez(temp_path, **arrays)
+    temp_path.replace(file_path)
+
+    if excel:
+        data.to_excel(file_path.with_suffix(".xlsx"))
+
+
+@typechecked()
+def read_frame(
+        file_path: Path,
+        columns: Optional[List[str]] = None,
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    """
+    Reads a dataframe, which was written by 'write_frame'. Only the requested columns are loaded from the file.
+
+    :param file_path: The path of the .npz file.
+    :param columns: The columns to load. Loads all columns, if not given.
+    :param start: The first date to load (inclusive). Requires a sorted datetime index.
+    :param end: The last date to load (inclusive). A year or month includes all its days. Requires a sorted datetime
+                index.
+    :return: Returns the dataframe.
+    """
+    with np.load(file_path, allow_pickle=False) as f:
+        meta = json.loads(str(f["meta"]))
+        assert meta["version"] == _FORMAT_VERSION, f"The format version {meta['version']} is not supported."
+        all_columns = meta["columns"]
+        if columns is None:
+            columns = all_columns
+        missing = [c for c in columns if c not in all_columns]
+        assert len(missing) == 0, f"The columns {missing} are not part of {file_path}."
+
+        index = f["index"]
+        rows = slice(None)
+        if start is not None or end is not None:
+            assert np.issubdtype(index.dtype, np.datetime64), "A date range requires a datetime index."
+            assert np.all(index[1:] >= index[:-1]), "A date range requires a sorted index."
+            first = 0 if start is None else np.searchsorted(index, _to_datetime64(start), side="left")
+            last = len(index) if end is None else np.searchsorted(index, to_period_end(end).to_datetime64(), side="right")
+            rows = slice(first, last)
+
+        values = {c: f[f"column_{all_columns.index(c)}"][rows] for c in columns}
+
+    return pd.DataFrame(values, index=pd.Index(index[rows], name=meta["index_name"]), columns=columns)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .download_from_yahoo import download_from_yahoo
+
+
+def _download_fx_rate(currency: str, base: str) -> pd.Series:
+    return download_from_yahoo(f"{currency}{base}=X", adjust=False)
+
+
+class FxRates():
+    """
+    Converts values between currencies. Every currency pair is loaded only once and kept as float64 array,
+    which is aligned to a master daily index. Thus whole dataframes with columns in different currencies
+    can be converted with a single multiplication.
+
+    All rates are stored as the price of one unit of the currency in the base currency (e.g. EURUSD for EUR,
+    if the base currency is USD). Days without rate are forward filled, days before the first rate are NaN.
+    """
+
+    @typechecked()
+    def __init__(
+            self,
+            index: pd.DatetimeIndex,
+            base: str = "USD",
+            loader: Optional[Callable[[str, str], pd.Series]] = None,
+    ):
+        """
+        :param index: The master daily index, which all rates are aligned to.
+        :param base: The base currency.
+        :param loader: A function, which loads the rates of a currency in the base currency. Downloads the rates
+            from yahoo by default.
+        """
+        self._index = index
+        self._base = base
+        self._loader = loader if loader is not None else _download_fx_rate
+        self._rates = {base: np.ones(len(index), dtype=np.float64)}
+        self._factors = {}
+
+
+    @typechecked()
+    def add_rates(self, currency: str, rates: pd.Series):
+        """
+        Adds the rates of a currency without loading them.
+
+        :param currency: The currency.
+        :param rates: The price of one unit of the currency in the base currency.
+        """
+        rates = rates.reindex(rates.index.union(self._index)).ffill().reindex(self._index)
+        self._rates[currency] = rates.to_numpy(dtype=np.float64)
+        self._factors = {k: v for k, v in self._factors.items() if currency not in k[0] and currency != k[1]}
+
+
+    @typechecked()
+    def get_rates(self, currency: str) -> np.ndarray:
+        """
+        :param currency: The currency.
+        :return: Returns the price of one unit of the currency in the base currency for every day of the index.
+        """
+        if currency not in self._rates:
+            self.add_rates(currency, self._loader(currency, self._base))
+        return self._rates[currency]
+
+
+    def _get_factors(self, currencies: Tuple[str, ...], to_currency: str) -> np.ndarray:
+        key = (currencies, to_currency)
+        if key not in self._factors:
+            rates = np.stack([self.get_rates(c) for c in currencies], axis=1)
+            self._factors[key] = rates / self.get_rates(to_currency)[:, np.newaxis]
+        return self._factors[key]
+
+
+    @typechecked()
+    def convert(
+            self,
+            data: Union[pd.DataFrame, pd.Series],
+            currencies: Union[str, Dict[str, str]],
+            to_currency: Optional[str] = None,
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        Converts values into another currency.
+
+        :param data: The values. The dates must be part of the master index.
+        :param currencies: The currency of the values or, for a dataframe, the currency of every column.
+            Columns, which are not part of the currency map, are not converted.
+        :param to_currency: The target currency. Uses the base currency, if not given.
+        :return: Returns the converted values.
+        """
+        to_currency = self._base if to_currency is None else to_currency
+        if isinstance(data, pd.Series):
+            assert isinstance(currencies, str), "The currency of a series must be a string."
+            columns = [currencies]
+        else:
+            currencies = {c: currencies for c in data.columns} if isinstance(currencies, str) else currencies
+            columns = [currencies.get(c, to_currency) for c in data.columns]
+
+        if data.index.equals(self._index):
+            rows = slice(None)
+        else:
+            rows = self._index.get_indexer(data.index)
+            assert np.all(rows >= 0), "The values contain dates, which are not part of the master index."
+
+        factors = self._get_factors(tuple(columns), to_currency)[rows]
+        assert not np.isnan(factors).any(), \
+            f"There are no rates for all dates between {min(data.index)} and {max(data.index)}."
+
+        if isinstance(data, pd.Series):
+            return data * factors[:, 0]
+        return data * factors
+
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self._index
+
+
+    @property
+    def base(self) -> str:
+        return self._base
@@ -0,0 +1,282 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Optional, Union
+
+
+EXPANSION_RULES = ["ffill", "step", "linear"]
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def _to_day(date: Union[str, pd.Timestamp, np.datetime64]) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(date).normalize().to_datetime64(), "D")
+
+
+class LowFrequencySeries():
+    """
+    A monthly or yearly time series, which is stored with its native observations and an expansion rule instead of
+    daily values. Daily values are only calculated on request and only for the requested date range.
+
+    The expansion rules are:
+     * ffill: every observation is valid until the next observation. Days before the first observation get the
+       first value (like 'reindex_and_fill').
+     * step: like ffill, but days before the first observation are NaN.
+     * linear: days between two observations are interpolated linearly. Days after the last observation keep the
+       last value and days before the first observation are NaN (like 'reindex_and_interpolate').
+
+    The observations can be a series or a dataframe. Missing values of a column are skipped, so every column can
+    have its own observation dates. A row without any value marks a gap: the days from this row until the next
+    observation are NaN and the values are not interpolated across the gap.
+    """
+
+    @typechecked()
+    def __init__(
+            self,
+            observations: Union[pd.Series, pd.DataFrame],
+            rule: str = "linear",
+            start: Optional[Union[str, pd.Timestamp]] = None,
+            end: Optional[Union[str, pd.Timestamp]] = None,
+    ):
+        """
+        :param observations: The native observations with a datetime index.
+        :param rule: The expansion rule (see EXPANSION_RULES).
+        :param start: The first day of the daily values by default. Uses the first observation, if not given.
+        :param end: The last day of the daily values by default. Uses the last observation, if not given.
+        """
+        assert rule in EXPANSION_RULES, f"Unknown expansion rule '{rule}'. Use one of {EXPANSION_RULES}."
+        assert len(observations.index) > 0, "There must be at least one observation."
+        self._observations = observations.sort_index()
+        self._observations.index = pd.DatetimeIndex(self._observations.index).normalize()
+        assert self._observations.index.is_unique, "There must be at most one observation per day."
+        self._rule = rule
+        self._start = _to_day(self._observations.index[0] if start is None else start)
+        self._end = _to_day(self._observations.index[-1] if end is None else end)
+
+
+    def _expand_column(self, dates: np.ndarray, values: np.ndarray, days: np.ndarray, gaps: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(values)
+        dates, values = dates[valid], values[valid]
+        result = np.full(len(days), np.nan, dtype=np.float64)
+        if len(values) == 0:
+            return result
+
+        positions = np.searchsorted(dates, days, side="right") - 1
+        if self._rule == "linear":
+            result[:] = np.interp(days.astype(np.int64), dates.astype(np.int64), values)
+            result[days < dates[0]] = np.nan
+        else:
+            result[positions >= 0] = values[positions[positions >= 0]]
+            if self._rule == "ffill":
+                result[positions < 0] = values[0]
+
+        if len(gaps) > 0:
+            # Days after the last observation before a gap keep its value and days from the gap until the next
+            # observation are NaN
+            next_gaps = np.searchsorted(gaps, days, side="right")
+            has_previous = positions >= 0
+            next_positions = np.minimum(positions + 1, len(dates) - 1)
+            before_gap = has_previous & (positions + 1 < len(dates)) & (next_gaps < len(gaps))
+            before_gap[before_gap] = gaps[next_gaps[before_gap]] < dates[next_positions[before_gap]]
+            result[before_gap] = values[positions[before_gap]]
+
+            in_gap = next_gaps > 0
+            previous_gaps = gaps[np.maximum(next_gaps - 1, 0)]
+            in_gap[has_previous] &= previous_gaps[has_previous] > dates[positions[has_previous]]
+            result[in_gap] = np.nan
+        return result
+
+
+    @typechecked()
+    def to_daily(
+            self,
+            start: Optional[Union[str, pd.Timestamp]] = None,
+            end: Optional[Union[str, pd.Timestamp]] = None,
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Calculates the daily values.
+
+        :param start: The first day. Uses the default start, if not given.
+        :param end: The last day. Uses the default end, if not given.
+        :return: Returns the daily values as series or dataframe (like the observations).
+        """
+        start = self._start if start is None else _to_day(start)
+        end = self._end if end is None else _to_day(end)
+        days = np.arange(start, end + _ONE_DAY, dtype="datetime64[D]")
+        dates = self._observations.index.to_numpy().astype("datetime64[D]")
+        index = pd.DatetimeIndex(days.astype("datetime64[ns]"), freq="D")
+        gaps = dates[self._observations.isna().to_numpy().reshape(len(dates), -1).all(axis=1)]
+
+        if isinstance(self._observations, pd.Series):
+            values = self._expand_column(dates, self._observations.to_numpy(dtype=np.float64), days, gaps)
+            return pd.Series(values, index=index, name=self._observations.name)
+
+        return pd.DataFrame(
+            {c: self._expand_column(dates, self._observations[c].to_numpy(dtype=np.float64), days, gaps) for c in self._observations.columns},
+            index=index,
+            columns=self._observations.columns,
+        )
+
+
+    @typechecked()
+    def merge(self, other: "LowFrequencySeries") -> "LowFrequencySeries":
+        """
+        Combines two series like 'merge_series' does with daily values: the other series replaces this series between
+        its first and last observation. The daily values of the result are exactly the combined daily values of both
+        series, since the days right before and after the other series are added as observations. If this series ends
+        before the other series starts (or starts after it ends), the days in between are marked as gap and stay NaN.
+
+        :param other: The series, which has priority.
+        :return: Returns the combined series.
+        """
+        assert self._rule == other._rule, "Only series with the same expansion rule can be merged."
+        one_day = pd.Timedelta(days=1)
+        first = other._observations.index[0]
+        last = other._observations.index[-1]
+        before = self._observations.loc[:first - one_day]
+        after = self._observations.loc[last + one_day:]
+        parts = [before]
+        if len(before.index) > 0:
+            boundary = min(self.end, first - one_day)
+            parts.append(self.to_daily(boundary, boundary))
+            if boundary < first - one_day:
+                parts.append(self.to_daily(boundary + one_day, boundary + one_day) * np.nan)
+        parts.append(other._observations)
+        if len(after.index) > 0:
+            boundary = max(self.start, last + one_day)
+            if boundary > last + one_day:
+                parts.append(self.to_daily(last + one_day, last + one_day) * np.nan)
+            parts.append(self.to_daily(boundary, boundary))
+        parts.append(after)
+
+        observations = pd.concat(parts)
+        observations = observations[~observations.index.duplicated(keep="last")]
+        return LowFrequencySeries(
+            observations,
+            rule=self._rule,
+            start=min(self.start, other.start),
+            end=max(self.end, other.end),
+        )
+
+
+    @typechecked()
+    def scale(self, factor: float) -> "LowFrequencySeries":
+        """
+        :param factor: The factor.
+        :return: Returns a series with all values multiplied by the factor.
+        """
+        return LowFrequencySeries(self._observations * factor, rule=self._rule, start=self.start, end=self.end)
+
+
+    @typechecked()
+    def with_range(
+            self,
+            start: Optional[Union[str, pd.Timestamp]] = None,
+            end: Optional[Union[str, pd.Timestamp]] = None,
+    ) -> "LowFrequencySeries":
+        """
+        :param start: The new default start.
+        :param end: The new default end.
+        :return: Returns the same series with another default range of the daily values.
+        """
+        return LowFrequencySeries(
+            self._observations,
+            rule=self._rule,
+            start=self.start if start is None else start,
+            end=self.end if end is None else end,
+        )
+
+
+    @classmethod
+    @typechecked()
+    def from_daily(
+            cls,
+            daily: Union[pd.Series, pd.DataFrame],
+            rule: str = "linear",
+            rtol: float = 1e-12,
+    ) -> "LowFrequencySeries":
+        """
+        Compresses daily values, which were expanded from low frequency data, back to the observations, which are
+        needed to reproduce them. For the linear rule, only the days, where the slope changes, are kept. For the other
+        rules, only the days, where the value changes, are kept.
+
+        :param daily: The daily values without gaps.
+        :param rule: The expansion rule.
+        :param rtol: The tolerance of the reproduced values relative to the largest value of every column.
+        :return: Returns the series, which expands to the same daily values.
+        """
+        assert rule in EXPANSION_RULES, f"Unknown expansion rule '{rule}'. Use one of {EXPANSION_RULES}."
+        values = daily.to_numpy(dtype=np.float64).reshape(len(daily.index), -1)
+        tolerance = rtol * np.maximum(np.nanmax(np.abs(values), axis=0), 1)
+        if rule == "linear" and len(values) > 2:
+            slopes = np.diff(values, axis=0)
+            changes = np.any(~(np.abs(slopes[1:] - slopes[:-1]) <= tolerance), axis=1)
+            keep = np.concatenate([[True], changes, [True]])
+        else:
+            keep = np.concatenate([[True], np.any(~(np.abs(values[1:] - values[:-1]) <= tolerance), axis=1)])
+
+        expanded = cls(daily.iloc[keep], rule).to_daily(daily.index[0], daily.index[-1])
+        difference = np.abs(expanded.to_numpy(dtype=np.float64).reshape(len(daily.index), -1) - values)
+        keep |= np.any(~(difference <= tolerance), axis=1)
+        return cls(daily.iloc[keep], rule, start=daily.index[0], end=daily.index[-1])
+
+
+    @typechecked()
+    def save(self, file_path: Path):
+        """
+        Stores the observations and the expansion rule in a .npz file.
+
+        :param file_path: The path of the file.
+        """
+        frame = self._observations if isinstance(self._observations, pd.DataFrame) else self._observations.to_frame()
+        meta = dict(
+            rule=self._rule,
+            start=str(self._start),
+            end=str(self._end),
+            columns=[str(c) for c in frame.columns],
+            is_series=isinstance(self._observations, pd.Series),
+        )
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            file_path,
+            meta=np.array(json.dumps(meta)),
+            dates=frame.index.to_numpy(dtype="datetime64[ns]"),
+            values=frame.to_numpy(dtype=np.float64),
+        )
+
+
+    @classmethod
+    @typechecked()
+    def load(cls, file_path: Path) -> "LowFrequencySeries":
+        """
+        :param file_path: The path of a file, which was written by 'save'.
+        :return: Returns the series.
+        """
+        with np.load(file_path, allow_pickle=False) as f:
+            meta = json.loads(str(f["meta"]))
+            observations = pd.DataFrame(f["values"], index=pd.DatetimeIndex(f["dates"]), columns=meta["columns"])
+        if meta["is_series"]:
+            observations = observations.iloc[:, 0]
+        return cls(observations, rule=meta["rule"], start=meta["start"], end=meta["end"])
+
+
+    @property
+    def observations(self) -> Union[pd.Series, pd.DataFrame]:
+        return self._observations
+
+
+    @property
+    def rule(self) -> str:
+        return self._rule
+
+
+    @property
+    def start(self) -> pd.Timestamp:
+        return pd.Timestamp(self._start)
+
+
+    @property
+    def end(self) -> pd.Timestamp:
+        return pd.Timestamp(self._end)
@@ -0,0 +1,203 @@
+import os
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.math import to_period_end
+
+
+_TOKEN_SIZE = 16
+_OPEN_ATTEMPTS = 20
+
+
+def _get_sidecar_path(file_path: Path) -> Path:
+    return file_path.with_suffix(".meta.npz")
+
+
+def _open_matrix(file_path: Path) -> Tuple[np.ndarray, bytes]:
+    # The matrix and its token are read from the same open file, so they always belong together, even if the file
+    # is replaced in the meantime
+    with file_path.open("rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+        size = offset + int(np.prod(shape)) * dtype.itemsize
+        f.seek(0, os.SEEK_END)
+        if f.tell() != size + _TOKEN_SIZE:
+            return np.empty((0, 0)), b""
+        f.seek(size)
+        token = f.read(_TOKEN_SIZE)
+        values = np.memmap(f, dtype=dtype, mode="r", shape=shape, order="F" if fortran_order else "C", offset=offset)
+    return values, token
+
+
+@typechecked()
+def write_prices(
+        data: pd.DataFrame,
+        file_path: Path,
+        excel: bool = False,
+):
+    """
+    Writes prices into a price store (see 'PriceStore'). The values are stored as float64 matrix in a .npy file
+    in column-major order, thus every column is a contiguous block in the file. The index and the column names are
+    stored in a small sidecar file next to it. Both files get the same random token, so a reader can check, that the
+    sidecar belongs to the matrix.
+
+    :param data: The prices with a sorted datetime index.
+    :param file_path: The path of the .npy file.
+    :param excel: If true, the prices are also exported as Excel file next to the .npy file.
+    """
+    assert isinstance(data.index, pd.DatetimeIndex), "The prices must have a datetime index."
+    assert data.index.is_monotonic_increasing, "The index of the prices must be sorted."
+    assert data.columns.is_unique, "The column names must be unique."
+
+    # The token is stored in the sidecar and behind the data of the .npy file, where numpy ignores it. The sidecar
+    # is replaced before the matrix, thus a reader sees different tokens only while a write is in progress.
+    token = uuid.uuid4().bytes
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    sidecar_path = _get_sidecar_path(file_path)
+    temp_sidecar_path = sidecar_path.with_suffix(".tmp.npz")
+    np.savez(
+        temp_sidecar_path,
+        index=data.index.to_numpy(dtype="datetime64[ns]"),
+        columns=np.array([str(c) for c in data.columns]),
+        token=np.frombuffer(token, dtype=np.uint8),
+    )
+    temp_path = file_path.with_suffix(".tmp.npy")
+    with temp_path.open("wb") as f:
+        np.save(f, np.asfortranarray(data.to_numpy(dtype=np.float64)))
+        f.write(token)
+    temp_sidecar_path.replace(sidecar_path)
+    temp_path.replace(file_path)
+
+    if excel:
+        data.to_excel(file_path.with_suffix(".xlsx"))
+
+
+class PriceStore():
+    """
+    Read-only access to a price matrix, which was written by 'write_prices'. The matrix is memory mapped, thus all
+    processes, which open the same store, share one physical copy of the prices in the page cache.
+
+    A selection of a date range and a contiguous range of columns is returned as view into the memory map without
+    copying any data. Other column selections need a copy of the selected columns.
+    """
+
+    @typechecked()
+    def __init__(self, file_path: Path):
+        """
+        :param file_path: The path of the .npy file.
+        """
+        self._file_path = file_path
+        for _ in range(_OPEN_ATTEMPTS):
+            self._values, token = _open_matrix(file_path)
+            with np.load(_get_sidecar_path(file_path), allow_pickle=False) as f:
+                self._index = pd.DatetimeIndex(f["index"])
+                self._columns = [str(c) for c in f["columns"]]
+                sidecar_token = f["token"].tobytes() if "token" in f.files else None
+            if token == sidecar_token:
+                break
+            # A write is in progress
+            time.sleep(0.05)
+
+        assert token == sidecar_token, \
+            f"The sidecar of {file_path} does not belong to the prices. Write the prices again."
+        assert self._values.shape == (len(self._index), len(self._columns)), \
+            f"The sidecar of {file_path} does not fit to the prices."
+        self._column_positions = {c: i for i, c in enumerate(self._columns)}
+
+
+    def _get_rows(
+            self,
+            start: Optional[Union[str, pd.Timestamp]],
+            end: Optional[Union[str, pd.Timestamp]],
+    ) -> slice:
+        first = 0 if start is None else self._index.searchsorted(pd.Timestamp(start), side="left")
+        last = len(self._index) if end is None else self._index.searchsorted(to_period_end(end), side="right")
+        return slice(first, last)
+
+
+    def _get_columns(self, columns: Optional[List[str]]) -> Union[slice, np.ndarray]:
+        if columns is None:
+            return slice(None)
+
+        missing = [c for c in columns if c not in self._column_positions]
+        assert len(missing) == 0, f"The columns {missing} are not part of {self._file_path}."
+        positions = np.array([self._column_positions[c] for c in columns], dtype=np.int64)
+        if len(positions) > 0 and np.all(np.diff(positions) == 1):
+            return slice(int(positions[0]), int(positions[-1]) + 1)
+        return positions
+
+
+    @typechecked()
+    def load_prices(
+            self,
+            columns: Optional[List[str]] = None,
+            start: Optional[Union[str, pd.Timestamp]] = None,
+            end: Optional[Union[str, pd.Timestamp]] = None,
+            as_frame: bool = True,
+    ) -> Union[pd.DataFrame, np.ndarray]:
+        """
+        Loads prices out of the store. The result is read-only, if it is a view into the memory map.
+
+        :param columns: The columns to load. Loads all columns, if not given.
+        :param start: The first date to load (inclusive).
+        :param end: The last date to load (inclusive). A year or month includes all its days.
+        :param as_frame: If true, a dataframe is returned, otherwise a numpy array.
+        :return: Returns the prices.
+        """
+        rows = self._get_rows(start, end)
+        column_selection = self._get_columns(columns)
+        values = self._values[rows, column_selection]
+        if not as_frame:
+            return values
+
+        column_names = self._columns[column_selection] if isinstance(column_selection, slice) else columns
+        return pd.DataFrame(values, index=self._index[rows], columns=column_names, copy=False)
+
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self._index
+
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+
+_stores: Dict[Tuple[Path, int], PriceStore] = {}
+
+
+@typechecked()
+def load_prices(
+        file_path: Path,
+        columns: Optional[List[str]] = None,
+        start: Optional[Union[str, pd.Timestamp]] = None,
+        end: Optional[Union[str, pd.Timestamp]] = None,
+        as_frame: bool = True,
+) -> Union[pd.DataFrame, np.ndarray]:
+    """
+    Loads prices out of a price store (see 'PriceStore'). Every store is opened only once per process and reopened,
+    if the file was written again.
+
+    :param file_path: The path of the .npy file.
+    :param columns: The columns to load. Loads all columns, if not given.
+    :param start: The first date to load (inclusive).
+    :param end: The last date to load (inclusive). A year or month includes all its days.
+    :param as_frame: If true, a dataframe is returned, otherwise a numpy array.
+    :return: Returns the prices.
+    """
+    key = (file_path.resolve(), file_path.stat().st_mtime_ns)
+    if key not in _stores:
+        for old_key in [k for k in _stores.keys() if k[0] == key[0]]:
+            del _stores[old_key]
+        _stores[key] = PriceStore(file_path)
+    return _stores[key].load_prices(columns=columns, start=start, end=end, as_frame=as_frame)
@@ -3,7 +3,7 @@ from pathlib import Path
 from typeguard import typechecked
 from typing import Optional, Callable, Any
 
-from utils.math import to_float
+from utils.math import to_numeric, parse_dates
 
 
 @typechecked()
@@ -11,16 +11,38 @@ def read_excel(
         file_path: Path,
         column_name: str,
         name: Optional[str] = None,
-        index_mapping: Callable[[pd.RangeIndex], pd.RangeIndex] = pd.to_datetime,
-        value_mapping: Callable[[Any], float] = to_float,
+        index_mapping: Optional[Callable[[pd.Index], pd.Index]] = None,
+        value_mapping: Optional[Callable[[Any], float]] = None,
         skiprows=0,
+        date_format: Optional[str] = None,
+        thousands: Optional[str] = ",",
+        decimal: str = ".",
+        percent: bool = False,
 ):
+    """
+    Reads a single column of an Excel file as series. The conversion is the same as in 'read_csv'.
+
+    :param file_path: The path of the Excel file. The first column must contain the dates.
+    :param column_name: The column to read.
+    :param name: The name of the series. Uses the file name, if not given.
+    :param index_mapping: A custom mapping of the whole index to dates.
+    :param value_mapping: A custom mapping of every single value to float.
+    :param skiprows: The number of rows to skip at the beginning of the sheet.
+    :param date_format: The format of the dates (e.g. "%Y-%m-%d"). The format is inferred, if not given.
+    :param thousands: The thousands separator of the values.
+    :param decimal: The decimal separator of the values.
+    :param percent: If true, the values are given in percent (e.g. "1.5%") and are divided by 100.
+    :return: Returns the series.
+    """
     if name is None:
         name = file_path.stem
 
     data = pd.read_excel(file_path, index_col=0, skiprows=skiprows)
-    data.index = index_mapping(data.index)
+    data.index = parse_dates(data.index, date_format) if index_mapping is None else index_mapping(data.index)
     assert column_name in data.columns, f"Column '{column_name}' is not in {list(data.columns)}"
-    data = data[column_name].apply(value_mapping)
+    if value_mapping is None:
+        data = to_numeric(data[column_name], thousands=thousands, decimal=decimal, percent=percent)
+    else:
+        data = data[column_name].apply(value_mapping)
     data.name = name
     return data
@@ -0,0 +1,134 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Callable, Optional, Tuple
+
+
+class SeriesStore():
+    """
+    Keeps downloaded time series locally and fetches only the missing tail of every series. Every series is stored
+    as two raw binary files (dates as int64 nanoseconds and values as float64), so new values are appended to the
+    files without rewriting the history. An interrupted write can leave one file longer than the other, thus both files
+    are cut to their common length before the next write.
+
+    An update fetches the data from a few days before the last stored date. The overlapping values must be equal to
+    the stored values. Otherwise, the source has restated its history and the whole series is fetched again.
+    """
+
+    @typechecked()
+    def __init__(self, store_path: Path, overlap_days: int = 14, rtol: float = 1e-6):
+        """
+        :param store_path: The directory of the store.
+        :param overlap_days: The number of days before the last stored date, which are fetched again to detect
+            restatements.
+        :param rtol: The relative tolerance, when comparing the overlapping values.
+        """
+        self._store_path = store_path
+        self._overlap_days = overlap_days
+        self._rtol = rtol
+
+
+    def _get_paths(self, name: str) -> Tuple[Path, Path]:
+        file_name = re.sub(r"[^\w.-]", "_", name)
+        return self._store_path / f"{file_name}.dates", self._store_path / f"{file_name}.values"
+
+
+    @typechecked()
+    def get(self, name: str) -> Optional[pd.Series]:
+        """
+        :param name: The name of the series.
+        :return: Returns the stored series or None, if the series is not stored.
+        """
+        dates_path, values_path = self._get_paths(name)
+        if not dates_path.exists() or not values_path.exists():
+            return None
+
+        dates = np.fromfile(dates_path, dtype=np.int64)
+        values = np.fromfile(values_path, dtype=np.float64)
+        length = min(len(dates), len(values))
+        return pd.Series(values[:length], index=pd.DatetimeIndex(dates[:length].astype("datetime64[ns]")), name=name)
+
+
+    def _truncate(self, name: str):
+        dates_path, values_path = self._get_paths(name)
+        if not dates_path.exists() or not values_path.exists():
+            return
+
+        # Both files are cut to the rows, which are complete in both of them, so every value keeps its date
+        size = min(dates_path.stat().st_size, values_path.stat().st_size) // 8 * 8
+        for path in [dates_path, values_path]:
+            if path.stat().st_size != size:
+                os.truncate(path, size)
+
+
+    def _write(self, name: str, data: pd.Series, append: bool):
+        assert data.index.is_monotonic_increasing, f"The index of the series '{name}' must be sorted."
+        self._store_path.mkdir(parents=True, exist_ok=True)
+        dates_path, values_path = self._get_paths(name)
+        dates = pd.DatetimeIndex(data.index).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        values = data.to_numpy(dtype=np.float64)
+
+        if append:
+            self._truncate(name)
+            with values_path.open("ab") as f:
+                values.tofile(f)
+            with dates_path.open("ab") as f:
+                dates.tofile(f)
+            return
+
+        dates_temp_path = dates_path.with_name(dates_path.name + ".tmp")
+        values_temp_path = values_path.with_name(values_path.name + ".tmp")
+        dates.tofile(dates_temp_path)
+        values.tofile(values_temp_path)
+        # The old values are removed first, so an interrupted replace leaves an empty series, which is fetched again,
+        # instead of new dates with old values
+        if values_path.exists():
+            os.truncate(values_path, 0)
+        os.replace(dates_temp_path, dates_path)
+        os.replace(values_temp_path, values_path)
+
+
+    def _is_consistent(self, stored: pd.Series, fetched: pd.Series) -> bool:
+        common = fetched.index.intersection(stored.index)
+        stored_values = stored.reindex(common).to_numpy(dtype=np.float64)
+        fetched_values = fetched.reindex(common).to_numpy(dtype=np.float64)
+        valid = ~np.isnan(stored_values) & ~np.isnan(fetched_values)
+        if not valid.any():
+            return False
+        if (np.isnan(stored_values) != np.isnan(fetched_values)).any():
+            return False
+        return bool(np.allclose(fetched_values[valid], stored_values[valid], rtol=self._rtol, atol=0))
+
+
+    @typechecked()
+    def update(self, name: str, fetch: Callable[..., pd.Series]) -> pd.Series:
+        """
+        Fetches the missing tail of a series and appends it to the store.
+
+        :param name: The name of the series.
+        :param fetch: A function, which fetches the series. It is called with the keyword argument 'start_date',
+            which is None to fetch the whole history. The whole history after a restatement is fetched with the
+            additional keyword argument 'refresh=True', so the download does not use cached responses.
+        :return: Returns the whole updated series.
+        """
+        self._truncate(name)
+        stored = self.get(name)
+        if stored is None or len(stored.index) == 0:
+            data = fetch(start_date=None).sort_index()
+            self._write(name, data, append=False)
+            return self.get(name)
+
+        last_date = stored.index[-1]
+        fetched = fetch(start_date=last_date - pd.Timedelta(days=self._overlap_days)).sort_index()
+        if not self._is_consistent(stored, fetched.loc[:last_date]):
+            data = fetch(start_date=None, refresh=True).sort_index()
+            self._write(name, data, append=False)
+            return self.get(name)
+
+        tail = fetched.loc[fetched.index > last_date]
+        if len(tail.index) > 0:
+            self._write(name, tail, append=True)
+        return self.get(name)
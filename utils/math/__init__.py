@@ -1,4 +1,4 @@
-from .misc import to_float, normalize, normalize_df
+from .misc import to_float, to_numeric, normalize, normalize_df, add_months, to_period_end, parse_dates, align_to_returns
 from .reindex import reindex_and_fill, reindex_and_interpolate
 from .calc_growth import calc_growth
 from .calc_returns import calc_returns
@@ -10,5 +10,14 @@ from .calc_correlations_over_time import calc_correlations_over_time
 from .calc_average_return_over_time import calc_average_return_over_time
 from .calc_monte_carlo_simulations import calc_monte_carlo_simulations
 from .calc_growth_with_periodic_rate import calc_growth_with_periodic_rate
+from .calc_letf import calc_letf, calc_letf_costs
+from .calc_letfs import calc_letfs
+from .calibrate_letf import calibrate_letf, calibrate_letfs
+from .calc_contribution_schedule import calc_contribution_schedule
 from .apply_monte_carlo_simulations import apply_monte_carlo_sim
-from .calc_simulation_characteristics import calc_simulation_characteristics
+from .simulation_store import SimulationStore
+from .calc_simulation_characteristics import calc_simulation_characteristics, calc_simulation_percentiles
+from .calc_simulation_characteristics import calc_terminal_value_histogram
+from .store_monte_carlo_simulations import store_monte_carlo_simulations
+from .calc_portfolio_metrics import calc_portfolio_metrics
+from .calc_rolling_metrics import calc_rolling_metrics, ROLLING_METRICS
@@ -1,8 +1,9 @@
 from typeguard import typechecked
 import pandas as pd
+import numpy as np
 from typing import Optional
 
-from utils.math import calc_growth_with_periodic_rate
+from .calc_contribution_schedule import calc_contribution_schedule
 
 
 @typechecked
@@ -10,15 +11,55 @@ def apply_monte_carlo_sim(
         simulations: pd.DataFrame,
         start_value: float,
         periodic_rate: float = 0,
-        rate_interval: Optional[int] = None
+        rate_interval: Optional[int] = None,
+        rate_frequency: Optional[str] = None,
+        rate_increase: float = 0,
+        contributions: Optional[np.ndarray] = None,
 ):
-    applied_simulations = pd.DataFrame()
-    for c in simulations.columns:
-        applied_simulations[c] = calc_growth_with_periodic_rate(
-            simulations[c],
-            start_value = start_value,
-            periodic_rate = periodic_rate,
-            rate_interval = rate_interval,
-        )
-
-    return applied_simulations
+    """
+    Applies the daily returns of all simulations to a start value and adds periodic contributions.
+    All simulations are calculated at once: With the cumulative growth G(t), the value of a simulation is
+    V(t) = G(t) * (start_value + sum(c(k) / G(k-1) for k <= t)), where c(k) is the contribution on day k.
+
+    :param simulations: The daily returns, one column per simulation (see 'calc_monte_carlo_simulations').
+    :param start_value: The start value of every simulation.
+    :param periodic_rate: The contribution, which is added periodically.
+    :param rate_interval: Adds the contribution every n days.
+    :param rate_frequency: Adds the contribution on calendar anniversaries ("M", "Q" or "Y") of the start date,
+                           which is taken from the column name of every simulation.
+    :param rate_increase: The yearly increase of the contribution in percent (only with rate_frequency).
+    :param contributions: A custom schedule, either with one value per day or a (days x simulations) matrix.
+    :return: Returns a dataframe with the values of all simulations.
+    """
+    assert (rate_interval is None) or (rate_frequency is None), "Use either a rate interval or a rate frequency."
+
+    returns = simulations.to_numpy(dtype=np.float64)
+    number_of_days = returns.shape[0]
+
+    if contributions is None:
+        contributions = np.zeros(number_of_days, dtype=np.float64)
+        if rate_frequency is not None:
+            contributions = calc_contribution_schedule(
+                pd.DatetimeIndex(pd.to_datetime(simulations.columns)),
+                number_of_days,
+                periodic_rate = periodic_rate,
+                frequency = rate_frequency,
+                rate_increase = rate_increase,
+            )
+        elif rate_interval is not None:
+            contributions[rate_interval - 1::rate_interval] = periodic_rate
+
+    if contributions.ndim == 1:
+        assert len(contributions) == number_of_days, f"The schedule must contain {number_of_days} days."
+        contributions = contributions[:, np.newaxis]
+
+    # the calculation is done in-place, since the matrices can get very large
+    growth = 1 + returns
+    np.cumprod(growth, axis=0, out=growth)
+    values = np.array(np.broadcast_to(contributions, growth.shape), dtype=np.float64)
+    values[1:] /= growth[:-1]
+    np.cumsum(values, axis=0, out=values)
+    values += start_value
+    values *= growth
+
+    return pd.DataFrame(values, index=simulations.index, columns=simulations.columns)
@@ -0,0 +1,51 @@
+import pandas as pd
+import numpy as np
+from typeguard import typechecked
+
+from .misc import add_months
+
+
+_MONTHS_PER_PERIOD = {
+    "M": 1,
+    "Q": 3,
+    "Y": 12,
+}
+
+
+@typechecked
+def calc_contribution_schedule(
+        start_dates: pd.DatetimeIndex,
+        number_of_days: int,
+        periodic_rate: float,
+        frequency: str = "M",
+        rate_increase: float = 0,
+) -> np.ndarray:
+    """
+    Calculates calendar aware contributions for simulations, which start at different dates. A contribution
+    is added on every monthly (quarterly, yearly) anniversary of the start date of a simulation, thus it
+    does not drift away from the real months like a fixed number of days would do.
+
+    :param start_dates: The start date of every simulation.
+    :param number_of_days: The number of days of every simulation.
+    :param periodic_rate: The contribution in the first year.
+    :param frequency: "M" for monthly, "Q" for quarterly or "Y" for yearly contributions.
+    :param rate_increase: The yearly increase of the contribution in percent.
+    :return: Returns a (days x simulations) matrix with the contribution for every day and simulation.
+    """
+    assert frequency in _MONTHS_PER_PERIOD, f"Unknown frequency '{frequency}'. Use one of {list(_MONTHS_PER_PERIOD.keys())}."
+
+    starts = start_dates.to_numpy().astype("datetime64[D]")
+    months_per_period = _MONTHS_PER_PERIOD[frequency]
+    number_of_periods = int(np.ceil(number_of_days / (28 * months_per_period))) + 1
+    months = np.arange(1, number_of_periods + 1) * months_per_period
+
+    offsets = (add_months(starts[np.newaxis, :], months[:, np.newaxis]) - starts[np.newaxis, :]).astype(np.int64)
+    amounts = periodic_rate * (1 + rate_increase / 100) ** ((months - months_per_period) // 12)
+    amounts = np.broadcast_to(amounts[:, np.newaxis], offsets.shape)
+    sims = np.broadcast_to(np.arange(len(starts))[np.newaxis, :], offsets.shape)
+
+    # the anniversaries of a simulation are strictly increasing, so every (day, simulation) pair is unique
+    valid = offsets < number_of_days
+    contributions = np.zeros((number_of_days, len(starts)), dtype=np.float64)
+    contributions[offsets[valid], sims[valid]] = amounts[valid]
+    return contributions
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Dict, Optional, Union
+
+from .misc import align_to_returns
+
+
+Rate = Union[float, pd.Series, np.ndarray]
+
+
+@typechecked()
+def calc_letf_costs(
+        daily_returns: Union[pd.Series, np.ndarray],
+        er: Rate,
+        borrowing_rate: Optional[Rate] = None,
+        leverage: Union[float, np.ndarray] = 1,
+        adjustment_factor: Rate = 0,
+        borrowing_spread: Rate = 0,
+        slippage: Rate = 0,
+        days_in_year: int = 365,
+        percent: float = 100,
+) -> Dict[str, Union[float, pd.Series, np.ndarray]]:
+    """
+    Calculates the daily cost components of a (leveraged) ETF. Every component is either a constant or a daily
+    array, which is aligned with the daily returns, thus all components can be combined by broadcasting.
+
+    The following components are calculated:
+     * er: the expense ratio
+     * borrowing: the borrowing costs of the leverage, based on the borrowing rate plus the borrowing spread
+       (for example the spread of a swap)
+     * adjustment: the adjustment factor for further costs or tracking errors
+     * slippage: the costs of the daily rebalancing, which trades |L * (L - 1) * r| of the fund value
+
+    All yearly rates are converted to daily rates by the geometric mean. Yearly rates can be given as series to
+    model costs, which change over time. Such a series is forward filled to the days of the returns and must start at or before the first return.
+
+    :param daily_returns: The daily returns of the underlying.
+    :param er: The yearly expense ratio.
+    :param borrowing_rate: The yearly borrowing rate for every day. Must be given, if the leverage is not 1.
+    :param leverage: The leverage of the ETF.
+    :param adjustment_factor: A yearly adjustment factor for further costs or tracking errors.
+    :param borrowing_spread: A yearly spread, which is added to the borrowing rate.
+    :param slippage: The costs of every rebalancing relative to the traded value.
+    :param days_in_year: The number of days per year.
+    :param percent: The scale of the rates (100 for percent values).
+    :return: Returns the daily costs by component as negative (or positive) returns.
+    """
+    def gmean(x):
+        return (x + 1)**(1 / days_in_year) - 1
+
+    assert np.all(np.asarray(leverage) == 1) or (borrowing_rate is not None), \
+        "If leverage is not 1, you must provide the borrowing_rate argument!"
+
+    er = align_to_returns(er, daily_returns)
+    adjustment_factor = align_to_returns(adjustment_factor, daily_returns)
+    borrowing_spread = align_to_returns(borrowing_spread, daily_returns)
+    slippage = align_to_returns(slippage, daily_returns)
+
+    if borrowing_rate is not None:
+        borrowing_rate = align_to_returns(borrowing_rate, daily_returns)
+        daily_borrowing_rate = (leverage - 1) * gmean(-(borrowing_rate + borrowing_spread)/percent)
+    else:
+        daily_borrowing_rate = 0
+
+    if np.any(np.asarray(slippage) != 0):
+        daily_slippage = -np.abs(leverage * (leverage - 1) * daily_returns) * slippage/percent
+    else:
+        daily_slippage = 0
+
+    return {
+        'er': gmean(-er/percent),
+        'borrowing': daily_borrowing_rate,
+        'adjustment': gmean(adjustment_factor/percent),
+        'slippage': daily_slippage,
+    }
+
+
+@typechecked()
+def calc_letf(
+        daily_returns: Union[pd.Series, np.ndarray],
+        er: Rate,
+        borrowing_rate: Optional[Rate] = None,
+        leverage: Union[float, np.ndarray] = 1,
+        adjustment_factor: Rate = 0,
+        days_in_year: int = 365,
+        percent: float = 100,
+        borrowing_spread: Rate = 0,
+        slippage: Rate = 0,
+):
+    """
+    Models the daily returns of a (leveraged) ETF out of the daily returns of its underlying (model of the
+    bogleheads user 'siamond'). The costs are calculated by 'calc_letf_costs' and added to the leveraged returns.
+
+    All arguments can also be numpy arrays, which are broadcasted against each other. So a (days x etfs) matrix
+    of returns can be modelled at once with one value per etf for the leverage, er and adjustment factor.
+
+    :param daily_returns: The daily returns of the underlying.
+    :param er: The yearly expense ratio.
+    :param borrowing_rate: The yearly borrowing rate for every day. Must be given, if the leverage is not 1.
+    :param leverage: The leverage of the ETF.
+    :param adjustment_factor: A yearly adjustment factor for further costs or tracking errors.
+    :param days_in_year: The number of days per year.
+    :param percent: The scale of the rates (100 for percent values).
+    :param borrowing_spread: A yearly spread, which is added to the borrowing rate.
+    :param slippage: The costs of every rebalancing relative to the traded value.
+    :return: Returns the daily returns of the ETF.
+    """
+    costs = calc_letf_costs(
+        daily_returns,
+        er=er,
+        borrowing_rate=borrowing_rate,
+        leverage=leverage,
+        adjustment_factor=adjustment_factor,
+        borrowing_spread=borrowing_spread,
+        slippage=slippage,
+        days_in_year=days_in_year,
+        percent=percent,
+    )
+
+    letf_returns = daily_returns * leverage
+    for cost in costs.values():
+        letf_returns = letf_returns + cost
+    return letf_returns
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Any, Optional
+
+from .calc_letf import calc_letf
+from .misc import align_to_returns
+
+
+def _get_column(specs: pd.DataFrame, column: str, daily_returns: pd.DataFrame, optional: bool = False) -> np.ndarray:
+    if column not in specs.columns:
+        assert optional, f"The spec table has no column '{column}'."
+        return np.zeros(len(specs.index), dtype=np.float64)
+
+    values = specs[column]
+    if not any(isinstance(v, pd.Series) for v in values):
+        return (values.fillna(0) if optional else values).to_numpy(dtype=np.float64)
+
+    # Dated values are aligned to a (days x etfs) matrix, constant values are repeated for every day
+    days = pd.Series(0.0, index=daily_returns.index)
+    return np.column_stack([
+        align_to_returns(v, days).to_numpy(dtype=np.float64) if isinstance(v, pd.Series)
+        else np.full(len(days.index), 0.0 if optional and pd.isna(v) else float(v))
+        for v in values
+    ])
+
+
+@typechecked()
+def calc_letfs(
+        daily_returns: pd.DataFrame,
+        specs: pd.DataFrame,
+        borrowing_rates: Optional[pd.DataFrame] = None,
+        fx_rates: Optional[Any] = None,
+        start_value: float = 100,
+        days_in_year: int = 365,
+        percent: float = 100,
+) -> pd.DataFrame:
+    """
+    Models many (leveraged) ETFs at once out of a spec table. All daily ETF returns are calculated as a single
+    (days x etfs) matrix operation (see 'calc_letf') and compounded with one cumulative product.
+
+    The spec table has one row per ETF (the index is the name of the ETF) and the following columns:
+     * underlying: the column of the daily returns, which is the underlying of the ETF
+     * leverage: the leverage of the ETF
+     * er: the yearly expense ratio in percent
+     * adjustment_factor: the yearly adjustment factor in percent
+     * borrowing (optional): the column of the borrowing rates, which is used for the leverage
+     * currency (optional): the currency of the ETF values. Values in USD are not converted.
+     * borrowing_spread (optional): the yearly spread on top of the borrowing rate in percent
+     * slippage (optional): the costs of the daily rebalancing relative to the traded value in percent
+
+    The cells of er, adjustment_factor, borrowing_spread and slippage can also be series with the dates, where the
+    value changes (see 'calc_letf_costs'), to model costs, which change over time.
+
+    :param daily_returns: The daily returns of all underlyings in USD.
+    :param specs: The spec table of the ETFs.
+    :param borrowing_rates: The yearly borrowing rates in percent. Required, if any ETF is leveraged.
+    :param fx_rates: An 'FxRates' instance (see 'utils.data'), which converts the ETF values into the currencies of
+                     the spec table. Its master index must contain all dates of the daily returns. Required, if any
+                     ETF is not in USD.
+    :param start_value: The start value of every ETF.
+    :param days_in_year: The number of days per year.
+    :param percent: The scale of the yearly rates (100 for percent values).
+    :return: Returns a dataframe with the growth of every ETF.
+    """
+    for column in ["underlying", "leverage", "er", "adjustment_factor"]:
+        assert column in specs.columns, f"The spec table has no column '{column}'."
+    missing = set(specs['underlying']) - set(daily_returns.columns)
+    assert len(missing) == 0, f"The underlyings {sorted(missing)} are not part of the daily returns."
+
+    leverage = specs['leverage'].to_numpy(dtype=np.float64)
+    borrowing_rate = None
+    if borrowing_rates is not None and 'borrowing' in specs.columns:
+        borrowing_columns = specs['borrowing'].where(specs['borrowing'].notna(), None)
+        assert all(c is None or c in borrowing_rates.columns for c in borrowing_columns), \
+            "The spec table references unknown borrowing rates."
+        rates = borrowing_rates.reindex(daily_returns.index)
+        borrowing_rate = np.stack(
+            [np.zeros(len(rates.index)) if c is None else rates[c].to_numpy(dtype=np.float64) for c in borrowing_columns],
+            axis=1,
+        )
+        leveraged = (leverage != 1)
+        assert all(c is not None for c in borrowing_columns[leveraged]), "All leveraged ETFs need borrowing rates."
+        assert not np.isnan(borrowing_rate[:, leveraged]).any(), "The borrowing rates do not cover all days."
+
+    letf_returns = calc_letf(
+        daily_returns[specs['underlying']].to_numpy(dtype=np.float64),
+        er=_get_column(specs, 'er', daily_returns),
+        borrowing_rate=borrowing_rate,
+        leverage=leverage,
+        adjustment_factor=_get_column(specs, 'adjustment_factor', daily_returns),
+        days_in_year=days_in_year,
+        percent=percent,
+        borrowing_spread=_get_column(specs, 'borrowing_spread', daily_returns, optional=True),
+        slippage=_get_column(specs, 'slippage', daily_returns, optional=True),
+    )
+
+    growth = 1 + letf_returns
+    growth[0] *= start_value
+    np.cumprod(growth, axis=0, out=growth)
+    etfs = pd.DataFrame(growth, index=daily_returns.index, columns=specs.index)
+
+    if 'currency' in specs.columns:
+        for currency in specs['currency'].unique():
+            if currency == "USD":
+                continue
+            assert fx_rates is not None, f"The fx rates are required for the currency '{currency}'."
+            names = specs.index[specs['currency'] == currency]
+            converted = fx_rates.convert(etfs[names], "USD", currency)
+            etfs[names] = converted / converted.iloc[0] * etfs[names].iloc[0]
+
+    return etfs
@@ -0,0 +1,87 @@
+import pandas as pd
+import numpy as np
+from typeguard import typechecked
+
+
+def _calc_annual_returns(values: np.ndarray, index: pd.DatetimeIndex) -> np.ndarray:
+    # Like 'pct_change(1, freq="Y")': the value at the end of a year is compared with the value at the end of the
+    # previous year or, if this date is missing, with the first value after it.
+    is_year_end = np.asarray((index.month == 12) & (index.day == 31))
+    period = np.asarray(index.year) + is_year_end
+    first_values = pd.DataFrame(values).groupby(period).first()
+    year_end_values = values[is_year_end]
+    base_values = first_values.reindex(np.asarray(index.year)[is_year_end]).to_numpy(dtype=np.float64)
+    return year_end_values / base_values - 1
+
+
+def _calc_max_drawdown(values: np.ndarray):
+    # Uses the same strict comparisons as 'calc_max_drawdown': the drawdown starts at the first date, the maximum
+    # was reached and ends at the first date with the lowest value. Missing values are skipped.
+    rows = np.arange(values.shape[0])[:, None]
+    max_values = np.fmax.accumulate(values, axis=0)
+    previous_max_values = np.vstack([np.full((1, values.shape[1]), np.nan), max_values[:-1]])
+    is_new_max = (max_values > previous_max_values) | (np.isnan(previous_max_values) & ~np.isnan(max_values))
+    max_rows = np.maximum.accumulate(np.where(is_new_max, rows, 0), axis=0)
+
+    drawdowns = (values / max_values - 1) * 100
+    end_rows = np.nanargmin(drawdowns, axis=0)
+    columns = np.arange(values.shape[1])
+    return drawdowns[end_rows, columns], max_rows[end_rows, columns], end_rows
+
+
+@typechecked()
+def calc_portfolio_metrics(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculates the summary metrics of many portfolios at once. All portfolios are processed as one aligned matrix,
+    thus the calculation time hardly depends on the number of portfolios.
+
+    :param data: A dataframe with the growth of all portfolios (one column per portfolio) and a datetime index.
+                 Missing values (e.g. before a portfolio starts) are skipped.
+    :return: Returns a dataframe with one row per portfolio and the columns 'start' and 'end' (first and last
+             value), 'cagr', 'min' and 'max' (average, lowest and highest annual return in percent), 'volatility'
+             (standard deviation of the annual returns in percent), 'max_drawdown' (in percent),
+             'max_drawdown_start' and 'max_drawdown_end' (dates).
+    """
+    index = pd.DatetimeIndex(data.index)
+    assert index.is_monotonic_increasing, "The index must be sorted."
+    values = data.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    assert np.all(valid.any(axis=0)), "Every portfolio must have at least one value."
+
+    columns = np.arange(values.shape[1])
+    first_rows = np.argmax(valid, axis=0)
+    last_rows = len(index) - 1 - np.argmax(valid[::-1], axis=0)
+
+    annual_returns = _calc_annual_returns(values, index)
+    number_of_years = np.sum(~np.isnan(annual_returns), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = np.where(
+            number_of_years > 0,
+            np.nanprod(annual_returns + 1, axis=0)**(1.0/number_of_years) - 1,
+            np.nan,
+        )
+    has_years = number_of_years > 0
+    annual_min = np.full(values.shape[1], np.nan)
+    annual_max = np.full(values.shape[1], np.nan)
+    volatility = np.full(values.shape[1], np.nan)
+    annual_min[has_years] = np.nanmin(annual_returns[:, has_years], axis=0)
+    annual_max[has_years] = np.nanmax(annual_returns[:, has_years], axis=0)
+    has_deviation = number_of_years > 1
+    volatility[has_deviation] = np.nanstd(annual_returns[:, has_deviation], axis=0, ddof=1)
+
+    max_drawdown, max_drawdown_start_rows, max_drawdown_end_rows = _calc_max_drawdown(values)
+
+    return pd.DataFrame(
+        {
+            'start': values[first_rows, columns],
+            'end': values[last_rows, columns],
+            'cagr': cagr*100,
+            'min': annual_min*100,
+            'max': annual_max*100,
+            'volatility': volatility*100,
+            'max_drawdown': max_drawdown,
+            'max_drawdown_start': index[max_drawdown_start_rows],
+            'max_drawdown_end': index[max_drawdown_end_rows],
+        },
+        index=data.columns,
+    )
@@ -0,0 +1,127 @@
+import pandas as pd
+import numpy as np
+from typeguard import typechecked
+from typing import List, Optional
+
+
+ROLLING_METRICS = ["cagr", "volatility", "sharpe", "sortino", "max_drawdown", "correlation"]
+
+
+def _calc_cumulative_sums(values: np.ndarray) -> np.ndarray:
+    return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+
+def _calc_rolling_max_drop(values: np.ndarray, window: int) -> np.ndarray:
+    # The largest drop (values[i] - values[j] with i <= j) in every window of the given length. The values are
+    # split into blocks of the window length (van Herk/Gil-Werman). Every window is either one block or the suffix
+    # of one block followed by the prefix of the next block, thus it is combined from running aggregates.
+    length, columns = values.shape
+    block_count = int(np.ceil(length / window))
+    padded = np.vstack([values, np.repeat(values[-1:], block_count * window - length, axis=0)])
+    blocks = padded.reshape(block_count, window, columns)
+
+    prefix_max = np.maximum.accumulate(blocks, axis=1)
+    prefix_min = np.minimum.accumulate(blocks, axis=1).reshape(-1, columns)
+    prefix_drop = np.maximum.accumulate(prefix_max - blocks, axis=1).reshape(-1, columns)
+
+    reversed_blocks = blocks[:, ::-1]
+    reversed_min = np.minimum.accumulate(reversed_blocks, axis=1)
+    suffix_max = np.maximum.accumulate(reversed_blocks, axis=1)[:, ::-1].reshape(-1, columns)
+    suffix_drop = np.maximum.accumulate(reversed_blocks - reversed_min, axis=1)[:, ::-1].reshape(-1, columns)
+
+    starts = np.arange(length - window + 1)
+    ends = starts + window - 1
+    combined_drop = np.maximum(
+        np.maximum(suffix_drop[starts], prefix_drop[ends]),
+        suffix_max[starts] - prefix_min[ends],
+    )
+    return np.where((starts % window == 0)[:, None], suffix_drop[starts], combined_drop)
+
+
+@typechecked()
+def calc_rolling_metrics(
+        data: pd.DataFrame,
+        years: List[float],
+        benchmark: Optional[str] = None,
+        risk_free_rate: float = 0.0,
+        periods_per_year: Optional[float] = None,
+        step: int = 1,
+) -> pd.DataFrame:
+    """
+    Calculates rolling performance metrics of all portfolios for all window lengths at once. All sums over a window
+    are calculated from cumulative sums and the max. drawdown from running maxima and minima of blocks, thus every
+    window length needs O(n) time, independent of its length.
+
+    :param data: A dataframe with the growth of all portfolios (one column per portfolio), without missing values.
+    :param years: The window lengths in years.
+    :param benchmark: The column, which is used for the correlation. The correlation is skipped, if not given.
+    :param risk_free_rate: The annual risk free rate in percent, which is used for the Sharpe and Sortino ratio.
+    :param periods_per_year: The number of rows per year. Is derived from the index, if not given.
+    :param step: Only every n-th window is returned (e.g. 21 for roughly monthly values of daily data).
+    :return: Returns a long-format dataframe with the columns 'date' (end of the window), 'portfolio', 'years',
+             'metric' (see ROLLING_METRICS) and 'value'. CAGR, volatility and max. drawdown are given in percent.
+    """
+    assert step >= 1, "The step must be at least 1."
+    assert not data.isna().any().any(), "The data must not contain missing values."
+    assert (data > 0).all().all(), "The growth of all portfolios must be positive."
+    if benchmark is not None:
+        assert benchmark in data.columns, f"The benchmark '{benchmark}' is not part of the data."
+
+    index = pd.DatetimeIndex(data.index)
+    if periods_per_year is None:
+        periods_per_year = (len(index) - 1) / ((index[-1] - index[0]).days / 365.25)
+
+    values = data.to_numpy(dtype=np.float64)
+    returns = values[1:] / values[:-1] - 1
+    # Centering the returns keeps the cumulative sums of squares precise
+    centered_returns = returns - returns.mean(axis=0)
+    daily_risk_free_rate = (1 + risk_free_rate / 100)**(1 / periods_per_year) - 1
+    downside_returns = np.minimum(returns - daily_risk_free_rate, 0)
+    log_values = np.log(values)
+
+    cumulative_returns = _calc_cumulative_sums(returns)
+    cumulative_centered_returns = _calc_cumulative_sums(centered_returns)
+    cumulative_squares = _calc_cumulative_sums(centered_returns**2)
+    cumulative_downside_squares = _calc_cumulative_sums(downside_returns**2)
+    if benchmark is not None:
+        b = data.columns.get_loc(benchmark)
+        cumulative_products = _calc_cumulative_sums(centered_returns * centered_returns[:, [b]])
+
+    results = []
+    for y in years:
+        window = int(round(y * periods_per_year))
+        assert 2 <= window < len(index), f"The window of {y} years does not fit into the data."
+        rows = np.arange(window, len(index), step)
+        selection = rows - window
+
+        mean = (cumulative_returns[rows] - cumulative_returns[selection]) / window
+        centered_sums = cumulative_centered_returns[rows] - cumulative_centered_returns[selection]
+        variance = (cumulative_squares[rows] - cumulative_squares[selection] - centered_sums**2 / window) / (window - 1)
+        deviation = np.sqrt(np.maximum(variance, 0))
+        downside_deviation = np.sqrt((cumulative_downside_squares[rows] - cumulative_downside_squares[selection]) / window)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = {
+                "cagr": ((values[rows] / values[rows - window])**(periods_per_year / window) - 1) * 100,
+                "volatility": deviation * np.sqrt(periods_per_year) * 100,
+                "sharpe": (mean - daily_risk_free_rate) / deviation * np.sqrt(periods_per_year),
+                "sortino": (mean - daily_risk_free_rate) / downside_deviation * np.sqrt(periods_per_year),
+                "max_drawdown": (np.exp(-_calc_rolling_max_drop(log_values, window + 1)[selection]) - 1) * 100,
+            }
+            if benchmark is not None:
+                covariance = (
+                    cumulative_products[rows] - cumulative_products[selection]
+                    - centered_sums * centered_sums[:, [b]] / window
+                ) / (window - 1)
+                metrics["correlation"] = covariance / (deviation * deviation[:, [b]])
+
+        for metric, metric_values in metrics.items():
+            results.append(pd.DataFrame({
+                'date': np.repeat(index[rows], len(data.columns)),
+                'portfolio': np.tile(np.asarray(data.columns), len(rows)),
+                'years': y,
+                'metric': metric,
+                'value': metric_values.ravel(),
+            }))
+
+    return pd.concat(results, ignore_index=True)
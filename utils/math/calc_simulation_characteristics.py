@@ -1,13 +1,93 @@
 import pandas as pd
+import numpy as np
 from typeguard import typechecked
+from typing import Union, Iterator, Tuple
+
+from .simulation_store import SimulationStore
+
+
+def _iter_simulation_blocks(
+        simulations: Union[pd.DataFrame, SimulationStore],
+        block_size: int,
+) -> Iterator[Tuple[slice, np.ndarray]]:
+    if isinstance(simulations, SimulationStore):
+        yield from simulations.iter_blocks(block_size)
+    else:
+        yield slice(0, len(simulations.index)), simulations.to_numpy(dtype=np.float64)
+
+
+def _get_simulation_index(simulations: Union[pd.DataFrame, SimulationStore]) -> pd.Index:
+    if isinstance(simulations, SimulationStore):
+        return pd.RangeIndex(simulations.number_of_days)
+    return simulations.index
 
 
 @typechecked
-def calc_simulation_characteristics(simulations: pd.DataFrame):
-    characteristics = pd.DataFrame()
-    characteristics['mean'] = simulations.mean(axis=1)
-    characteristics['min'] = simulations.min(axis=1)
-    characteristics['max'] = simulations.max(axis=1)
-    characteristics['stddev_up'] = simulations.mean(axis=1) + simulations.std(axis=1)
-    characteristics['stddev_low'] = simulations.mean(axis=1) - simulations.std(axis=1)
+def calc_simulation_characteristics(simulations: Union[pd.DataFrame, SimulationStore], block_size: int = 64):
+    """
+    Calculates the mean, min, max and the standard deviation band of all simulations for every day.
+
+    :param simulations: The applied simulations, either as dataframe or as simulation store.
+    :param block_size: The number of days, which are loaded at once from a simulation store.
+    :return: Returns a dataframe with the columns mean, min, max, stddev_up and stddev_low.
+    """
+    characteristics = pd.DataFrame(
+        index=_get_simulation_index(simulations),
+        columns=['mean', 'min', 'max', 'stddev_up', 'stddev_low'],
+        dtype=np.float64,
+    )
+    for rows, values in _iter_simulation_blocks(simulations, block_size):
+        mean = np.nanmean(values, axis=1)
+        stddev = np.nanstd(values, axis=1, ddof=1)
+        characteristics.iloc[rows, 0] = mean
+        characteristics.iloc[rows, 1] = np.nanmin(values, axis=1)
+        characteristics.iloc[rows, 2] = np.nanmax(values, axis=1)
+        characteristics.iloc[rows, 3] = mean + stddev
+        characteristics.iloc[rows, 4] = mean - stddev
     return characteristics
+
+
+@typechecked
+def calc_simulation_percentiles(
+        simulations: Union[pd.DataFrame, SimulationStore],
+        percentiles: Tuple[float, ...] = (5, 25, 50, 75, 95),
+        block_size: int = 64,
+):
+    """
+    Calculates percentile bands of all simulations for every day.
+
+    :param simulations: The applied simulations, either as dataframe or as simulation store.
+    :param percentiles: The percentiles to calculate (0 to 100).
+    :param block_size: The number of days, which are loaded at once from a simulation store.
+    :return: Returns a dataframe with one column per percentile.
+    """
+    bands = pd.DataFrame(
+        index=_get_simulation_index(simulations),
+        columns=list(percentiles),
+        dtype=np.float64,
+    )
+    for rows, values in _iter_simulation_blocks(simulations, block_size):
+        bands.iloc[rows, :] = np.nanpercentile(values, percentiles, axis=1).T
+    return bands
+
+
+@typechecked
+def calc_terminal_value_histogram(simulations: Union[pd.DataFrame, SimulationStore], bins: int = 50):
+    """
+    Calculates the histogram of the values on the last day of all simulations.
+
+    :param simulations: The applied simulations, either as dataframe or as simulation store.
+    :param bins: The number of bins.
+    :return: Returns a dataframe with the columns 'from', 'to' and 'count'.
+    """
+    if isinstance(simulations, SimulationStore):
+        terminal_values = np.asarray(simulations.values[-1, :], dtype=np.float64)
+    else:
+        terminal_values = simulations.iloc[-1].to_numpy(dtype=np.float64)
+
+    counts, edges = np.histogram(terminal_values[~np.isnan(terminal_values)], bins=bins)
+    return pd.DataFrame({
+        'from': edges[:-1],
+        'to': edges[1:],
+        'count': counts,
+    })
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Dict, Optional, Sequence, Union
+
+from .calc_letf import calc_letf
+
+
+def _calc_residuals(
+        daily_returns: np.ndarray,
+        reference_rows: np.ndarray,
+        reference_log_growth: np.ndarray,
+        er: np.ndarray,
+        adjustment_factor: np.ndarray,
+        borrowing_rate: Optional[np.ndarray],
+        leverage: float,
+        days_in_year: int,
+        percent: float,
+) -> np.ndarray:
+    """
+    Calculates the log deviation of every candidate from the reference as (reference days x candidates) matrix.
+    """
+    letf_returns = calc_letf(
+        daily_returns[:, np.newaxis],
+        er=er[np.newaxis, :],
+        borrowing_rate=None if borrowing_rate is None else borrowing_rate[:, np.newaxis],
+        leverage=leverage,
+        adjustment_factor=adjustment_factor[np.newaxis, :],
+        days_in_year=days_in_year,
+        percent=percent,
+    )
+    log_growth = np.cumsum(np.log1p(letf_returns), axis=0)
+    log_growth -= log_growth[reference_rows[0]]
+    return log_growth[reference_rows] - reference_log_growth[:, np.newaxis]
+
+
+@typechecked()
+def calibrate_letf(
+        daily_returns: pd.Series,
+        reference: pd.Series,
+        er: Union[float, Sequence[float], np.ndarray],
+        adjustment_factor: Union[Sequence[float], np.ndarray] = np.arange(-5, 2.0001, 0.05),
+        borrowing_rate: Optional[pd.Series] = None,
+        leverage: float = 1,
+        refinements: int = 2,
+        days_in_year: int = 365,
+        percent: float = 100,
+        chunk_size: int = 256,
+) -> pd.Series:
+    """
+    Searches the expense ratio and adjustment factor of a (L)ETF model (see 'calc_letf'), which tracks a reference
+    ETF best. All (er, adjustment factor) candidates are evaluated at once as matrix against the reference. The
+    tracking error is the root mean square of the log deviation between model and reference over the overlapping
+    period. After the grid search, the grid is refined around the best candidate with a ten times smaller step.
+
+    Keep in mind, that the expense ratio and the adjustment factor are almost collinear. If both are given as grid,
+    many candidates have the same tracking error and the first of them (smallest er) is chosen. Thus it is best to
+    keep the published expense ratio fixed and just search the adjustment factor.
+
+    :param daily_returns: The daily returns of the underlying.
+    :param reference: The values of the reference ETF.
+    :param er: The expense ratio or a grid of expense ratios.
+    :param adjustment_factor: A grid of adjustment factors.
+    :param borrowing_rate: The yearly borrowing rate for every day. Must be given, if the leverage is not 1.
+    :param leverage: The leverage of the ETF.
+    :param refinements: The number of refinement steps after the grid search.
+    :param days_in_year: The number of days per year.
+    :param percent: The scale of the yearly rates (100 for percent values).
+    :param chunk_size: The number of candidates, which are evaluated at once.
+    :return: Returns a series with the best 'er', 'adjustment_factor', 'tracking_error', the yearly 'drift' of the
+        model against the reference in percent and the 'start' and 'end' of the overlapping period.
+    """
+    reference = reference.dropna()
+    start = max(min(daily_returns.index), min(reference.index))
+    end = min(max(daily_returns.index), max(reference.index))
+    assert start < end, "The reference does not overlap with the daily returns."
+
+    returns = daily_returns.loc[start:end]
+    reference = reference.loc[start:end]
+    reference = reference[reference.index.isin(returns.index)]
+    reference_rows = returns.index.get_indexer(reference.index)
+    reference_log_growth = np.log(reference.to_numpy(dtype=np.float64) / reference.iloc[0])
+    returns_values = returns.to_numpy(dtype=np.float64)
+    borrowing_values = None
+    if borrowing_rate is not None:
+        borrowing_values = borrowing_rate.reindex(returns.index).to_numpy(dtype=np.float64)
+
+    def search(er_grid: np.ndarray, adjustment_grid: np.ndarray):
+        candidates_er, candidates_adjustment = [a.ravel() for a in np.meshgrid(er_grid, adjustment_grid, indexing="ij")]
+        tracking_errors = np.empty(len(candidates_er), dtype=np.float64)
+        for first in range(0, len(candidates_er), chunk_size):
+            chunk = slice(first, first + chunk_size)
+            residuals = _calc_residuals(
+                returns_values, reference_rows, reference_log_growth, candidates_er[chunk],
+                candidates_adjustment[chunk], borrowing_values, leverage, days_in_year, percent,
+            )
+            tracking_errors[chunk] = np.sqrt(np.mean(residuals ** 2, axis=0))
+        best = int(np.argmin(tracking_errors))
+        return candidates_er[best], candidates_adjustment[best]
+
+    def refine(grid: np.ndarray, best: float) -> np.ndarray:
+        if len(grid) < 2:
+            return grid
+        step = np.min(np.diff(np.unique(grid)))
+        return best + np.arange(-10, 11) * step / 10
+
+    er_grid = np.atleast_1d(np.asarray(er, dtype=np.float64))
+    adjustment_grid = np.atleast_1d(np.asarray(adjustment_factor, dtype=np.float64))
+    best_er, best_adjustment = search(er_grid, adjustment_grid)
+    for _ in range(refinements):
+        er_grid = np.unique(np.maximum(refine(er_grid, best_er), 0))
+        adjustment_grid = refine(adjustment_grid, best_adjustment)
+        best_er, best_adjustment = search(er_grid, adjustment_grid)
+
+    residuals = _calc_residuals(
+        returns_values, reference_rows, reference_log_growth, np.array([best_er]), np.array([best_adjustment]),
+        borrowing_values, leverage, days_in_year, percent,
+    )[:, 0]
+    years = (reference.index[-1] - reference.index[0]).days / 365.25
+    return pd.Series(dict(
+        er=round(float(best_er), 6),
+        adjustment_factor=round(float(best_adjustment), 6),
+        tracking_error=np.sqrt(np.mean(residuals ** 2)) * 100,
+        drift=np.expm1(residuals[-1] / years) * 100 if years > 0 else np.nan,
+        start=reference.index[0],
+        end=reference.index[-1],
+    ))
+
+
+@typechecked()
+def calibrate_letfs(
+        daily_returns: pd.DataFrame,
+        specs: pd.DataFrame,
+        references: Dict[str, pd.Series],
+        borrowing_rates: Optional[pd.DataFrame] = None,
+        adjustment_factor: Union[Sequence[float], np.ndarray] = np.arange(-5, 2.0001, 0.05),
+        er: Optional[Union[Sequence[float], np.ndarray]] = None,
+        refinements: int = 2,
+) -> pd.DataFrame:
+    """
+    Calibrates all ETFs of a spec table (see 'calc_letfs') against their reference ETFs and reports the fitted
+    parameters next to the parameters of the spec table.
+
+    :param daily_returns: The daily returns of all underlyings.
+    :param specs: The spec table of the ETFs.
+    :param references: The values of the reference ETF by the name of the ETF. ETFs without reference are skipped.
+    :param borrowing_rates: The yearly borrowing rates in percent.
+    :param adjustment_factor: The grid of adjustment factors.
+    :param er: A grid of expense ratios. If not given, the expense ratio of the spec table is kept.
+    :param refinements: The number of refinement steps after the grid search.
+    :return: Returns a report with one row per calibrated ETF.
+    """
+    report = []
+    for name, reference in references.items():
+        assert name in specs.index, f"There is no spec for the ETF '{name}'."
+        spec = specs.loc[name]
+        borrowing_rate = None
+        if borrowing_rates is not None and 'borrowing' in specs.columns and pd.notna(spec['borrowing']):
+            borrowing_rate = borrowing_rates[spec['borrowing']]
+
+        parameters = dict(
+            daily_returns=daily_returns[spec['underlying']],
+            reference=reference,
+            borrowing_rate=borrowing_rate,
+            leverage=float(spec['leverage']),
+        )
+        fitted = calibrate_letf(
+            er=float(spec['er']) if er is None else er,
+            adjustment_factor=adjustment_factor,
+            refinements=refinements,
+            **parameters,
+        )
+        current = calibrate_letf(
+            er=float(spec['er']),
+            adjustment_factor=[float(spec['adjustment_factor'])],
+            refinements=0,
+            **parameters,
+        )
+
+        report.append(pd.Series(dict(
+            underlying=spec['underlying'],
+            leverage=spec['leverage'],
+            er=fitted['er'],
+            adjustment_factor=fitted['adjustment_factor'],
+            tracking_error=fitted['tracking_error'],
+            drift=fitted['drift'],
+            spec_er=spec['er'],
+            spec_adjustment_factor=spec['adjustment_factor'],
+            spec_tracking_error=current['tracking_error'],
+            spec_drift=current['drift'],
+            start=fitted['start'],
+            end=fitted['end'],
+        ), name=name))
+
+    return pd.DataFrame(report)
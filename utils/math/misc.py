@@ -1,5 +1,6 @@
 from typeguard import typechecked
-from typing import Optional
+from typing import Optional, Union
+import numpy as np
 import pandas as pd
 
 
@@ -13,6 +14,40 @@ def to_float(value):
         return None
 
 
+@typechecked
+def to_numeric(
+        values: pd.Series,
+        thousands: Optional[str] = ",",
+        decimal: str = ".",
+        percent: bool = False,
+) -> pd.Series:
+    """
+    Converts all values of a series to float like 'to_float' does, but with vectorized string operations on the
+    whole column. Values, which cannot be converted, become NaN.
+
+    :param values: The values, either as numbers or as strings.
+    :param thousands: The thousands separator, which is removed. None, if there is no thousands separator.
+    :param decimal: The decimal separator.
+    :param percent: If true, a trailing '%' is removed and the values are divided by 100.
+    :return: Returns the values as float64 series.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        result = values.astype(np.float64)
+    else:
+        strings = values.astype(str).str.strip()
+        if thousands is not None:
+            strings = strings.str.replace(thousands, "", regex=False)
+        if percent:
+            strings = strings.str.rstrip("%")
+        if decimal != ".":
+            strings = strings.str.replace(decimal, ".", regex=False)
+        result = pd.to_numeric(strings, errors="coerce").astype(np.float64)
+
+    if percent:
+        result = result / 100
+    return result
+
+
 @typechecked
 def normalize(values: pd.Series, reference: Optional[pd.Series] = None, start_value: Optional[float] = None):
     assert (reference is not None) or (start_value is not None), \
@@ -39,3 +74,77 @@ def normalize_df(values: pd.DataFrame, reference: Optional[pd.Series] = None, st
     if start_value is not None:
         first_common_date = min(values.index)
         return (values / values.loc[first_common_date, :]) * start_value
+
+
+def add_months(dates: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """
+    Adds a number of calendar months to dates like 'relativedelta(months=n)' does, but for whole arrays.
+    If the day does not exist in the target month (e.g. 31st of April), the last day of this month is taken.
+
+    :param dates: The dates as numpy datetime64 array.
+    :param months: The number of months to add. It is broadcasted against the dates.
+    :return: Returns the shifted dates as datetime64[D] array.
+    """
+    dates = np.asarray(dates).astype("datetime64[D]")
+    first_of_month = dates.astype("datetime64[M]")
+    day_of_month = (dates - first_of_month.astype("datetime64[D]")).astype(np.int64)
+
+    target_month = first_of_month + np.asarray(months).astype(np.int64)
+    target_month_start = target_month.astype("datetime64[D]")
+    target_month_length = ((target_month + 1).astype("datetime64[D]") - target_month_start).astype(np.int64)
+    return target_month_start + np.minimum(day_of_month, target_month_length - 1)
+
+
+@typechecked
+def to_period_end(end: Union[str, pd.Timestamp]) -> pd.Timestamp:
+    """
+    Converts the end of a date range into a timestamp. A year or month includes all its days, like in
+    '.loc[:"1986"]'.
+
+    :param end: The end as string (e.g. '1986', '1986-03' or '1986-03-15') or timestamp.
+    :return: Returns the last moment of the period of a string or the timestamp itself.
+    """
+    if isinstance(end, str):
+        return pd.Period(end).end_time
+    return pd.Timestamp(end)
+
+
+@typechecked
+def parse_dates(index: pd.Index, date_format: Optional[str]) -> pd.DatetimeIndex:
+    """
+    Converts a whole index into dates. Surrounding spaces of strings are removed.
+
+    :param index: The index.
+    :param date_format: The date format (e.g. '%b %d, %Y'). The format is inferred, if not given.
+    :return: Returns the dates.
+    """
+    if index.inferred_type == "string":
+        index = index.str.strip()
+    return pd.DatetimeIndex(pd.to_datetime(index, format=date_format))
+
+
+def align_to_returns(
+        value: Union[float, pd.Series, np.ndarray],
+        daily_returns: Union[pd.Series, np.ndarray],
+) -> Union[float, pd.Series, np.ndarray]:
+    """
+    Aligns a time-varying value with the daily returns. A series is forward filled to every day of the returns,
+    so it can also just contain the dates, where the value changes. The series must start at or before the first
+    return, since values are never filled backwards. Constants and arrays are returned unchanged.
+
+    :param value: The value as constant, series or array.
+    :param daily_returns: The daily returns. For an array, the series must have one value per row.
+    :return: Returns the aligned value.
+    """
+    if not isinstance(value, pd.Series):
+        return value
+
+    if isinstance(daily_returns, pd.Series):
+        assert len(value.dropna().index) > 0 and value.dropna().index[0] <= daily_returns.index[0], \
+            f"The series must start at or before the first return ({daily_returns.index[0]}). " \
+            f"Add an initial value for the earlier days."
+        return value.reindex(value.index.union(daily_returns.index)).ffill().reindex(daily_returns.index)
+
+    assert len(value.index) == daily_returns.shape[0], "A series must have the same length as the daily returns."
+    values = value.to_numpy(dtype=np.float64)
+    return values[:, np.newaxis] if daily_returns.ndim == 2 else values
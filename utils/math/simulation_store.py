@@ -0,0 +1,187 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typeguard import typechecked
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class SimulationStore():
+    """
+    A matrix of simulated paths, which is stored on disk instead of the memory. The values are stored as
+    memory-mapped numpy file with one row per day and one column per simulation. Thus any number of
+    processes can map the same store read-only, while only the rows they touch are loaded into the memory.
+
+    A store is a directory with the following files:
+     * values.npy: the (days x simulations) float64 matrix
+     * start_dates.npy: the start date of every simulation
+     * meta.json: a small sidecar with the shape, the number of written simulations and free attributes
+    """
+
+    _VALUES_FILE = "values.npy"
+    _START_DATES_FILE = "start_dates.npy"
+    _META_FILE = "meta.json"
+
+
+    @typechecked
+    def __init__(self, path: Path, mode: str = "r"):
+        """
+        Opens an existing store.
+
+        :param path: The directory of the store.
+        :param mode: "r" to map the store read-only or "r+" to continue writing into it.
+        """
+        assert mode in ["r", "r+"], f"Unknown mode '{mode}'. Use 'r' or 'r+'."
+        assert (path / self._META_FILE).exists(), f"'{path.absolute()}' is not a simulation store."
+
+        self._path = path
+        self._mode = mode
+        with (path / self._META_FILE).open("r") as f:
+            self._meta = json.load(f)
+
+        self._values = np.load(path / self._VALUES_FILE, mmap_mode=mode)
+        self._start_dates = np.load(path / self._START_DATES_FILE, mmap_mode=mode)
+
+
+    @classmethod
+    @typechecked
+    def create(
+            cls,
+            path: Path,
+            number_of_days: int,
+            number_of_sims: int,
+            attributes: Optional[Dict[str, Any]] = None,
+    ) -> "SimulationStore":
+        """
+        Creates a new and empty store. An existing store at the same path is overwritten.
+
+        :param path: The directory of the store.
+        :param number_of_days: The number of days (rows) of every simulation.
+        :param number_of_sims: The number of simulations (columns).
+        :param attributes: Additional json serializable attributes, like the simulation parameters.
+        :return: Returns the store opened for writing.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        values = np.lib.format.open_memmap(
+            path / cls._VALUES_FILE,
+            mode="w+",
+            dtype=np.float64,
+            shape=(number_of_days, number_of_sims),
+        )
+        start_dates = np.lib.format.open_memmap(
+            path / cls._START_DATES_FILE,
+            mode="w+",
+            dtype="datetime64[D]",
+            shape=(number_of_sims,),
+        )
+        del values, start_dates
+
+        meta = dict(
+            number_of_days=number_of_days,
+            number_of_sims=number_of_sims,
+            written_sims=0,
+            attributes=attributes if attributes is not None else {},
+        )
+        with (path / cls._META_FILE).open("w") as f:
+            json.dump(meta, f, indent=2)
+
+        return cls(path, mode="r+")
+
+
+    @typechecked
+    def write(self, first_sim: int, values: np.ndarray, start_dates: Optional[np.ndarray] = None):
+        """
+        Writes a chunk of simulations into the store.
+
+        :param first_sim: The column of the first simulation inside the chunk.
+        :param values: A (days x chunk size) matrix with the simulated values.
+        :param start_dates: The start dates of the simulations inside the chunk.
+        """
+        assert self._mode == "r+", "The store is opened read-only."
+        assert values.ndim == 2 and values.shape[0] == self.number_of_days, \
+            f"The chunk must have the shape ({self.number_of_days}, n), but has {values.shape}."
+        last_sim = first_sim + values.shape[1]
+        assert 0 <= first_sim and last_sim <= self.number_of_sims, \
+            f"The chunk [{first_sim}:{last_sim}] does not fit into {self.number_of_sims} simulations."
+
+        self._values[:, first_sim:last_sim] = values
+        if start_dates is not None:
+            self._start_dates[first_sim:last_sim] = start_dates.astype("datetime64[D]")
+
+        self._meta['written_sims'] = max(self._meta['written_sims'], last_sim)
+
+
+    def flush(self):
+        """
+        Writes all pending changes of the memory-map and the sidecar to the disk.
+        """
+        assert self._mode == "r+", "The store is opened read-only."
+        self._values.flush()
+        self._start_dates.flush()
+        with (self._path / self._META_FILE).open("w") as f:
+            json.dump(self._meta, f, indent=2)
+
+
+    @typechecked
+    def iter_blocks(self, block_size: int = 64) -> Iterator[Tuple[slice, np.ndarray]]:
+        """
+        Iterates over blocks of days. Every block contains the values of all simulations for those days.
+
+        :param block_size: The number of days inside every block.
+        :return: Yields tuples of the row slice and the (block size x simulations) values.
+        """
+        assert self.is_complete, f"Only {self.written_sims} of {self.number_of_sims} simulations are written."
+        for start in range(0, self.number_of_days, block_size):
+            rows = slice(start, min(start + block_size, self.number_of_days))
+            yield rows, self._values[rows, :]
+
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Loads the whole store into a dataframe, which has the same layout as the result of
+        'calc_monte_carlo_simulations'. This should only be used for small stores.
+        """
+        return pd.DataFrame(
+            np.array(self._values),
+            columns=[str(pd.Timestamp(d)) for d in self._start_dates],
+        )
+
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+
+    @property
+    def start_dates(self) -> np.ndarray:
+        return self._start_dates
+
+
+    @property
+    def number_of_days(self) -> int:
+        return self._meta['number_of_days']
+
+
+    @property
+    def number_of_sims(self) -> int:
+        return self._meta['number_of_sims']
+
+
+    @property
+    def written_sims(self) -> int:
+        return self._meta['written_sims']
+
+
+    @property
+    def is_complete(self) -> bool:
+        return self.written_sims == self.number_of_sims
+
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return self._meta['attributes']
@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from dateutil.relativedelta import relativedelta
+from typeguard import typechecked
+from typing import Optional
+
+from utils.math import calc_returns, apply_monte_carlo_sim
+from .simulation_store import SimulationStore
+
+
+@typechecked
+def store_monte_carlo_simulations(
+        portfolio: pd.DataFrame,
+        number_of_sims: int,
+        time_interval: relativedelta,
+        store_path: Path,
+        start_value: float,
+        periodic_rate: float = 0,
+        rate_interval: Optional[int] = None,
+        rate_frequency: Optional[str] = None,
+        rate_increase: float = 0,
+        chunk_size: int = 10000,
+) -> SimulationStore:
+    """
+    Calculates monte-carlo simulations like 'calc_monte_carlo_simulations' and applies them like
+    'apply_monte_carlo_sim', but writes the resulting values chunk by chunk into a simulation store
+    on disk. Thus the number of simulations is not limited by the memory.
+
+    :param portfolio: The backtest result of a portfolio with a 'sum' column.
+    :param number_of_sims: The number of simulations.
+    :param time_interval: The length of every simulation.
+    :param store_path: The directory of the simulation store.
+    :param start_value: The start value of every simulation.
+    :param periodic_rate: The value to add periodically.
+    :param rate_interval: The number of days between two periodic rates.
+    :param rate_frequency: Adds the periodic rate on calendar anniversaries ("M", "Q" or "Y") instead.
+    :param rate_increase: The yearly increase of the periodic rate in percent.
+    :param chunk_size: The number of simulations, which are calculated at once.
+    :return: Returns the complete store, opened read-only.
+    """
+    returns = calc_returns(portfolio['sum'], "D")
+    end_date = max(returns.index) - time_interval
+    possible_start_dates = returns.index[returns.index < end_date]
+    possible_end_dates = pd.DatetimeIndex([d + time_interval for d in possible_start_dates])
+
+    start_positions = returns.index.get_indexer(possible_start_dates)
+    end_positions = returns.index.searchsorted(possible_end_dates, side="right")
+
+    chosen = np.random.randint(0, len(possible_start_dates), number_of_sims)
+    chosen_start_positions = start_positions[chosen]
+    days = int(np.min(end_positions[chosen] - chosen_start_positions))
+    returns_values = returns.to_numpy(dtype=np.float64)
+
+    store = SimulationStore.create(
+        store_path,
+        number_of_days=days,
+        number_of_sims=number_of_sims,
+        attributes=dict(
+            start_value=start_value,
+            periodic_rate=periodic_rate,
+            rate_interval=rate_interval,
+            rate_frequency=rate_frequency,
+            rate_increase=rate_increase,
+            time_interval=str(time_interval),
+        )
+    )
+
+    day_offsets = np.arange(days)[:, np.newaxis]
+    for first_sim in range(0, number_of_sims, chunk_size):
+        positions = chosen_start_positions[first_sim:first_sim + chunk_size]
+        start_dates = returns.index[positions]
+        simulations = pd.DataFrame(
+            returns_values[day_offsets + positions[np.newaxis, :]],
+            columns=[str(d) for d in start_dates],
+        )
+        applied_simulations = apply_monte_carlo_sim(
+            simulations,
+            start_value = start_value,
+            periodic_rate = periodic_rate,
+            rate_interval = rate_interval,
+            rate_frequency = rate_frequency,
+            rate_increase = rate_increase,
+        )
+        store.write(
+            first_sim,
+            applied_simulations.to_numpy(dtype=np.float64),
+            start_dates=start_dates.to_numpy(),
+        )
+
+    store.flush()
+    return SimulationStore(store_path, mode="r")
@@ -0,0 +1,3 @@
+from .stage import Stage
+from .pipeline import Pipeline
+from .stages import create_pipeline
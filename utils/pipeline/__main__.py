@@ -0,0 +1,20 @@
+import argparse
+
+from .stages import create_pipeline
+
+
+parser = argparse.ArgumentParser(description="Runs all pipeline stages, which are not up to date.")
+parser.add_argument("targets", nargs="*", help="The stages to build. Builds all stages, if not given.")
+parser.add_argument("-j", "--jobs", type=int, default=4, help="The maximal number of stages, which run at once.")
+parser.add_argument("-f", "--force", action="store_true", help="Runs all stages, even if they are up to date.")
+parser.add_argument("-n", "--dry-run", action="store_true", help="Only shows, which stages would run.")
+args = parser.parse_args()
+
+results = create_pipeline().run(
+    targets=args.targets if len(args.targets) > 0 else None,
+    max_workers=args.jobs,
+    force=args.force,
+    dry_run=args.dry_run,
+)
+for name, result in sorted(results.items()):
+    print(f"{name}: {result}")
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typeguard import typechecked
+from typing import Dict, List, Optional, Set
+
+from .stage import Stage
+
+
+def _iter_files(path: Path) -> List[Path]:
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts)
+    return [path]
+
+
+def _hash_files(h, root_path: Path, paths: List[Path]):
+    # The paths are hashed relative to the root, thus the fingerprints do not depend on the location of the checkout
+    for path in paths:
+        for file_path in _iter_files(root_path / path):
+            h.update(file_path.relative_to(root_path).as_posix().encode())
+            if not file_path.exists():
+                h.update(b"<missing>")
+                continue
+            with file_path.open("rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+
+
+class Pipeline():
+    """
+    Runs stages like make does. Every stage is fingerprinted by the content of its inputs and code. A stage runs
+    only, if its fingerprint differs from the last successful run or if one of its outputs is missing. Thus a
+    changed input file rebuilds only the stages, which depend on it directly or through the outputs of other
+    stages.
+
+    Stages, whose inputs are not written by any pending stage, run in parallel.
+    """
+
+    @typechecked()
+    def __init__(self, stages: List[Stage], state_path: Path, log_path: Path, root_path: Path = Path(".")):
+        """
+        :param stages: All stages of the pipeline.
+        :param state_path: The json file, which stores the fingerprints of the last successful runs (relative to the
+                           root path).
+        :param log_path: The directory for the output of every stage (relative to the root path).
+        :param root_path: The working directory of the scripts. All paths are relative to this directory.
+        """
+        self._stages = {s.name: s for s in stages}
+        assert len(self._stages) == len(stages), "The stage names must be unique."
+        self._state_path = root_path / state_path
+        self._log_path = root_path / log_path
+        self._root_path = root_path
+
+        self._producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                assert output not in self._producers, \
+                    f"The output '{output}' is written by '{self._producers.get(output)}' and '{stage.name}'."
+                self._producers[output] = stage.name
+
+        self._dependencies = {
+            s.name: {self._producers[i] for i in s.inputs if i in self._producers and self._producers[i] != s.name}
+            for s in stages
+        }
+        self._check_cycles()
+
+
+    def _check_cycles(self):
+        visited = set()
+        def visit(name: str, path: List[str]):
+            assert name not in path, f"The stages have a cycle: {' -> '.join(path + [name])}"
+            if name in visited:
+                return
+            for dependency in self._dependencies[name]:
+                visit(dependency, path + [name])
+            visited.add(name)
+
+        for name in self._stages.keys():
+            visit(name, [])
+
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self._state_path.exists():
+            return {}
+        with self._state_path.open("r") as f:
+            return json.load(f)
+
+
+    def _store_state(self, state: Dict[str, str]):
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._state_path.open("w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+
+
+    @typechecked()
+    def fingerprint(self, name: str) -> str:
+        """
+        :param name: The name of the stage.
+        :return: Returns the hash of all inputs and the code of the stage.
+        """
+        stage = self._stages[name]
+        h = hashlib.sha256()
+        _hash_files(h, self._root_path, stage.code)
+        h.update(b"<inputs>")
+        _hash_files(h, self._root_path, stage.inputs)
+        return h.hexdigest()
+
+
+    @typechecked()
+    def is_up_to_date(self, name: str, state: Optional[Dict[str, str]] = None) -> bool:
+        """
+        :param name: The name of the stage.
+        :param state: The stored fingerprints. Loads them, if not given.
+        :return: Returns true, if the stage does not need to run.
+        """
+        state = self._load_state() if state is None else state
+        stage = self._stages[name]
+        if not all((self._root_path / o).exists() for o in stage.outputs):
+            return False
+        return state.get(name) == self.fingerprint(name)
+
+
+    def _get_required_stages(self, targets: Optional[List[str]]) -> Set[str]:
+        if targets is None:
+            return set(self._stages.keys())
+
+        required = set()
+        pending = list(targets)
+        while len(pending) > 0:
+            name = pending.pop()
+            assert name in self._stages, f"There is no stage '{name}'."
+            if name not in required:
+                required.add(name)
+                pending.extend(self._dependencies[name])
+        return required
+
+
+    def _run_stage(self, name: str) -> int:
+        stage = self._stages[name]
+        self._log_path.mkdir(parents=True, exist_ok=True)
+        with (self._log_path / f"{name}.log").open("w") as log:
+            process = subprocess.run(
+                [sys.executable, str(stage.script)],
+                cwd=self._root_path,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=dict(os.environ),
+            )
+        return process.returncode
+
+
+    @typechecked()
+    def run(
+            self,
+            targets: Optional[List[str]] = None,
+            max_workers: int = 4,
+            force: bool = False,
+            dry_run: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Runs all stages, which are not up to date, in the order of their dependencies.
+
+        :param targets: The stages to build, together with all stages they depend on. Builds all stages, if not given.
+        :param max_workers: The maximal number of stages, which run at once.
+        :param force: If true, all required stages run, even if they are up to date.
+        :param dry_run: If true, no stage runs. The result shows, which stages would run.
+        :return: Returns the result of every required stage ("skipped", "done", "failed", "blocked" or "pending").
+        """
+        required = self._get_required_stages(targets)
+        state = self._load_state()
+        results = {}
+
+        def is_ready(name: str) -> bool:
+            return all(results.get(d) in ["skipped", "done"] for d in self._dependencies[name] if d in required)
+
+        def is_blocked(name: str) -> bool:
+            return any(results.get(d) in ["failed", "blocked"] for d in self._dependencies[name] if d in required)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while len(results) < len(required):
+                changed = True
+                while changed:
+                    changed = False
+                    for name in sorted(required - set(results.keys()) - set(running.values())):
+                        if is_blocked(name):
+                            results[name] = "blocked"
+                        elif not is_ready(name):
+                            continue
+                        elif not force and self.is_up_to_date(name, state):
+                            results[name] = "skipped"
+                        elif dry_run:
+                            results[name] = "pending"
+                        else:
+                            print(f"Running stage '{name}'")
+                            running[executor.submit(self._run_stage, name)] = name
+                        changed = True
+
+                if len(running) == 0:
+                    # Stages, which wait for a pending stage in a dry run
+                    for name in required - set(results.keys()):
+                        results[name] = "pending"
+                    break
+
+                finished, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.result() == 0:
+                        results[name] = "done"
+                        state[name] = self.fingerprint(name)
+                        self._store_state(state)
+                    else:
+                        results[name] = "failed"
+                        print(f"Stage '{name}' failed, see {self._log_path / (name + '.log')}")
+
+        return results
+
+
+    @property
+    def stages(self) -> List[Stage]:
+        return list(self._stages.values())
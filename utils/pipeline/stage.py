@@ -0,0 +1,57 @@
+from pathlib import Path
+from typeguard import typechecked
+from typing import List, Optional
+
+
+class Stage():
+    """
+    A single step of the pipeline, which runs a script. The stage declares the files it reads (inputs) and writes
+    (outputs). Inputs and code can also be directories, which stand for all files inside of them.
+    """
+
+    @typechecked()
+    def __init__(
+            self,
+            name: str,
+            script: Path,
+            inputs: Optional[List[Path]] = None,
+            outputs: Optional[List[Path]] = None,
+            code: Optional[List[Path]] = None,
+    ):
+        """
+        :param name: The unique name of the stage.
+        :param script: The script, which is executed by the stage.
+        :param inputs: The files, which are read by the script.
+        :param outputs: The files, which are written by the script.
+        :param code: Further source files, the script depends on (e.g. the utils package).
+        """
+        self._name = name
+        self._script = script
+        self._inputs = [] if inputs is None else list(inputs)
+        self._outputs = [] if outputs is None else list(outputs)
+        self._code = [] if code is None else list(code)
+
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+    @property
+    def script(self) -> Path:
+        return self._script
+
+
+    @property
+    def inputs(self) -> List[Path]:
+        return self._inputs
+
+
+    @property
+    def outputs(self) -> List[Path]:
+        return self._outputs
+
+
+    @property
+    def code(self) -> List[Path]:
+        return [self._script] + self._code
@@ -0,0 +1,79 @@
+from pathlib import Path
+from typeguard import typechecked
+from typing import List
+
+from .pipeline import Pipeline
+from .stage import Stage
+
+
+_RAW = Path("raw_data")
+_CLEAN = Path("clean_data")
+_UTILS = [Path("utils")]
+_ETFS = [_CLEAN / "etfs.npy", _CLEAN / "etfs.meta.npz"]
+
+
+def _analysis_stage(script: str, inputs: List[Path]) -> Stage:
+    return Stage(Path(script).stem, Path(script), inputs=inputs, code=_UTILS)
+
+
+@typechecked()
+def create_pipeline(root_path: Path = Path(".")) -> Pipeline:
+    """
+    Creates the pipeline of all numbered scripts with their inputs and outputs.
+
+    :param root_path: The root directory of the repository.
+    :return: Returns the pipeline.
+    """
+    stages = [
+        Stage(
+            "01_prepare_treasury_yield_curves",
+            Path("01_prepare_treasury_yield_curves.py"),
+            inputs=[_RAW / "bogleheads_yield_curves.xlsx"] + [_RAW / f"DGS{y}.csv" for y in [1, 3, 5, 7, 10, 20, 30]],
+            outputs=[_CLEAN / "yield_curve.npz"],
+            code=_UTILS,
+        ),
+        Stage(
+            "02_simulate_treasury_bond_fund",
+            Path("02_simulate_treasury_bond_fund.py"),
+            inputs=[_CLEAN / "yield_curve.npz"] + [_RAW / f for f in ["simba_data.xlsx", "IBTA.csv", "SXRM.csv", "DTLA.csv"]],
+            outputs=[_CLEAN / "bond_funds.npz"],
+            code=_UTILS,
+        ),
+        Stage(
+            "03_prepare_data_for_analysis",
+            Path("03_prepare_data_for_analysis.py"),
+            inputs=[_CLEAN / "bond_funds.npz"] + [_RAW / f for f in [
+                "s&p500_raw.csv", "s&p500_dividends.csv", "nasdaq-100.csv", "nasdaq-100-tr_1.csv",
+                "nasdaq-100-tr_2.csv", "gold_yearly.xlsx", "gold_web.xlsx", "us_inflation.csv", "CPIAUCNS.csv",
+                "FEDFUNDS.csv", "FFWSJLOW.csv", "USDONTD156N.csv", "UPROSIM.csv", "TMFSIM.csv",
+            ]],
+            outputs=[_CLEAN / f"{n}.npz" for n in ["assets", "inflation.lfs", "ffr.lfs", "borrowing_rate", "hfea_data"]],
+            code=_UTILS,
+        ),
+        Stage(
+            "05_modelling_of_letf",
+            Path("05_modelling_of_letf.py"),
+            inputs=[_CLEAN / "assets.npz", _CLEAN / "borrowing_rate.npz"],
+            outputs=_ETFS,
+            code=_UTILS,
+        ),
+        _analysis_stage("04_basic_data_analysis.py", [_CLEAN / f"{n}.npz" for n in ["assets", "inflation.lfs", "ffr.lfs"]]),
+        _analysis_stage("06_basic_etf_analysis.py", _ETFS + [_CLEAN / "ffr.lfs.npz"]),
+        _analysis_stage("07_backtests_hfea_without_tax.py", _ETFS + [_CLEAN / "hfea_data.npz"]),
+        _analysis_stage("08_backtests_hfea_without_tax_gold_vs_cash.py", _ETFS),
+        _analysis_stage("09_backtest_hfea_without_tax_nasdaq_vs_gold.py", _ETFS),
+        _analysis_stage("10a_ema_buy_and_sell_strategie_shares.py", _ETFS),
+        _analysis_stage("10b_ema_buy_and_sell_strategie_bonds.py", _ETFS),
+        _analysis_stage("10c_ema_buy_and_sell_strategie.py", _ETFS),
+        _analysis_stage("10d_ema_buy_and_sell_test.py", _ETFS),
+        _analysis_stage("10e_additional_analysis_requests.py", _ETFS),
+        _analysis_stage("11_tax_simulation.py", _ETFS),
+        _analysis_stage("12_crysis_scenarios.py", _ETFS + [_CLEAN / "inflation.lfs.npz", _CLEAN / "ffr.lfs.npz"]),
+        _analysis_stage("13_simulate_monthly_rate.py", _ETFS),
+    ]
+    return Pipeline(
+        stages,
+        state_path=Path("cached_data") / "pipeline_state.json",
+        log_path=Path("cached_data") / "pipeline_logs",
+        root_path=root_path,
+    )
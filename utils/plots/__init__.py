@@ -1,3 +1,6 @@
+from .report import REPORT_MODES, IMAGE_FORMATS, set_report_mode, get_report_mode, is_report_enabled, report_figure
+from .report import get_collected_figures, wait_for_reports
+from .downsample import downsample_series
 from .draw_growth_chart import draw_growth_chart
 from .draw_telltale_chart import draw_telltale_chart
 from .draw_risk_reward_chart import draw_risk_reward_chart
@@ -2,7 +2,7 @@ import pandas as pd
 from typeguard import typechecked
 from typing import Dict, Optional, List
 
-from utils.math import normalize, gmean, calc_max_drawdown
+from utils.math import normalize, calc_portfolio_metrics
 from utils.plots import draw_growth_chart, draw_risk_reward_chart
 
 
@@ -33,27 +33,15 @@ def compare_portfolios(
                                                              f"It must contain {len(list(portfolios.keys()))} entries. " \
                                                              f"But only {len(short_names)} are given."
 
-    portfolio_results = pd.DataFrame()
-    annual_results = pd.DataFrame(columns=['start', 'end', 'cagr', 'min', 'max'])
-    for i, (name, results) in enumerate(data.items()):
-        portfolio_results[i] = results
-        yearly_results = results.pct_change(1, freq="Y").dropna()
-        annual_results.loc[i, 'start'] = results.iloc[0]
-        annual_results.loc[i, 'end'] = results.iloc[-1]
-        annual_results.loc[i, 'cagr'] = gmean(yearly_results)*100
-        annual_results.loc[i, 'min'] = yearly_results.min()*100
-        annual_results.loc[i, 'max'] = yearly_results.max()*100
+    metrics = calc_portfolio_metrics(pd.concat(list(data.values()), axis=1, keys=range(len(data))))
 
     if details:
-        max_drawdown, drawdown_start_date, drawdown_end_date = calc_max_drawdown(portfolio_results)
-
         risk_reward = pd.DataFrame(
             index = short_names,
             columns = ['risk', 'reward']
         )
-        for i, asset in enumerate(risk_reward.index):
-            risk_reward.loc[asset, 'risk'] = max_drawdown[i] * -1
-            risk_reward.loc[asset, 'reward'] = annual_results.loc[i, 'cagr']
+        risk_reward['risk'] = metrics['max_drawdown'].to_numpy() * -1
+        risk_reward['reward'] = metrics['cagr'].to_numpy()
 
         draw_risk_reward_chart(
             risk_reward,
@@ -63,10 +51,10 @@ def compare_portfolios(
         )
 
 
-    for i, (name, results) in enumerate(data.items()):
+    for i, name in enumerate(data.keys()):
         max_drawdown_string = ""
         if details:
-            max_drawdown_string = f" max. drawdown: {max_drawdown[i]:.2f}%"
-        print(f"[{short_names[i]}] {name}: ${annual_results.loc[i, 'start']:.2f}->${annual_results.loc[i, 'end']:.2f} "
-              f"(CAGR: {annual_results.loc[i, 'cagr']:.2f}%, max: {annual_results.loc[i, 'max']:.2f}% "
-              f"min: {annual_results.loc[i, 'min']:.2f}%{max_drawdown_string})")
+            max_drawdown_string = f" max. drawdown: {metrics.loc[i, 'max_drawdown']:.2f}%"
+        print(f"[{short_names[i]}] {name}: ${metrics.loc[i, 'start']:.2f}->${metrics.loc[i, 'end']:.2f} "
+              f"(CAGR: {metrics.loc[i, 'cagr']:.2f}%, max: {metrics.loc[i, 'max']:.2f}% "
+              f"min: {metrics.loc[i, 'min']:.2f}%{max_drawdown_string})")
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from typeguard import typechecked
+from typing import Dict, List
+
+
+def _calc_min_max_rows(values: np.ndarray, buckets: int) -> List[np.ndarray]:
+    length, columns = values.shape
+    bucket_size = int(np.ceil(length / buckets))
+    bucket_count = int(np.ceil(length / bucket_size))
+    padded = np.full((bucket_count * bucket_size, columns), np.nan)
+    padded[:length] = values
+    blocks = padded.reshape(bucket_count, bucket_size, columns)
+
+    valid = ~np.isnan(blocks)
+    has_values = valid.any(axis=1)
+    offsets = np.arange(bucket_count)[:, None] * bucket_size
+    min_rows = np.argmin(np.where(valid, blocks, np.inf), axis=1) + offsets
+    max_rows = np.argmax(np.where(valid, blocks, -np.inf), axis=1) + offsets
+
+    # The first missing value of every gap is kept, thus the line is still interrupted there
+    missing = np.isnan(values)
+    gap_starts = missing & ~np.vstack([np.zeros((1, columns), dtype=bool), missing[:-1]])
+
+    rows = []
+    for c in range(columns):
+        rows.append(np.unique(np.concatenate([
+            [0, length - 1],
+            min_rows[has_values[:, c], c],
+            max_rows[has_values[:, c], c],
+            np.flatnonzero(gap_starts[:, c]),
+        ])))
+    return rows
+
+
+@typechecked()
+def downsample_series(data: Dict[str, pd.Series], resolution: int) -> Dict[str, pd.Series]:
+    """
+    Reduces the number of points of time series for drawing. Every series is split into as many buckets as the
+    resolution and only the lowest and highest point of every bucket are kept. Thus all peaks and drawdown
+    extremes are still visible and the drawn line looks the same as with all points, when every bucket is at most
+    one pixel wide.
+
+    Series with the same index are downsampled together as one matrix.
+
+    :param data: The series by name.
+    :param resolution: The number of buckets, usually the width of the chart in pixels. Series with at most four
+                       points per bucket are not changed.
+    :return: Returns the downsampled series by name.
+    """
+    assert resolution > 0, "The resolution must be positive."
+    groups = []
+    for name, series in data.items():
+        if len(series.index) <= 4 * resolution:
+            continue
+        for group in groups:
+            if group[0].index.equals(series.index):
+                group[1].append(name)
+                break
+        else:
+            groups.append((series, [name]))
+
+    result = dict(data)
+    for series, names in groups:
+        values = np.column_stack([data[n].to_numpy(dtype=np.float64) for n in names])
+        for name, rows in zip(names, _calc_min_max_rows(values, resolution)):
+            result[name] = data[name].iloc[rows]
+    return result
@@ -6,11 +6,19 @@ from plotly.subplots import make_subplots
 from typeguard import typechecked
 from typing import List
 from itertools import combinations
+from .report import is_report_enabled, report_figure
 
 
 @typechecked()
 def draw_correlations(correlations: pd.DataFrame, returns: pd.DataFrame, return_type: str, selection: List[str], rows: int):
     corr = correlations.reindex(selection)[selection]
+    plot_list = list(combinations(corr.columns.to_list(), 2))
+
+    if not is_report_enabled():
+        # The samples are still drawn, so the random state stays the same as with figures
+        for _ in plot_list:
+            np.random.choice(returns.index, min(2000, len(returns.index)), False)
+        return
 
     fig = px.imshow(
         corr,
@@ -19,9 +27,8 @@ def draw_correlations(correlations: pd.DataFrame, returns: pd.DataFrame, return_
         aspect="auto",
         range_color=[-1, 1],
     )
-    fig.show()
+    report_figure(fig, f"{return_type} correlations")
 
-    plot_list = list(combinations(corr.columns.to_list(), 2))
     cols = int(np.ceil(len(plot_list)/rows))
 
     fig = make_subplots(
@@ -51,4 +58,4 @@ def draw_correlations(correlations: pd.DataFrame, returns: pd.DataFrame, return_
         height=rows*400,
         width=cols*400,
     )
-    fig.show()
+    report_figure(fig, f"{return_type} returns")
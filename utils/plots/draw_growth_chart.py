@@ -3,6 +3,8 @@ import plotly.graph_objects as go
 import pandas as pd
 from typeguard import typechecked
 from plotly.subplots import make_subplots
+from .report import is_report_enabled, report_figure
+from .downsample import downsample_series
 
 
 @typechecked()
@@ -15,7 +17,19 @@ def draw_growth_chart(
         y_range: Optional[List[float]] = None,
         overlapping_only: bool = False,
         show = True,
+        resolution: Optional[int] = 1500,
+        webgl: bool = False,
 ):
+    """
+    Draws the growth of time series as line chart.
+
+    :param resolution: The target width of the chart in pixels. Long series are reduced to the lowest and highest
+                       point per pixel (see 'downsample_series'). Uses all points, if None.
+    :param webgl: If true, the lines are drawn with WebGL (Scattergl), which is faster for many traces.
+    """
+    if show and not is_report_enabled():
+        return
+
     if overlapping_only:
         first_common_date = max([min(d.index) for d in data.values()])
         last_common_date = min([max(d.index) for d in data.values()])
@@ -26,10 +40,13 @@ def draw_growth_chart(
 
         data = new_data
 
+    if resolution is not None:
+        data = downsample_series(data, resolution)
 
+    scatter = go.Scattergl if webgl else go.Scatter
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     for n, d in data.items():
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=d.index,
             y=d,
             mode='lines',
@@ -45,6 +62,6 @@ def draw_growth_chart(
         title = name,
     )
     if show:
-        fig.show()
+        report_figure(fig, name)
     else:
         return fig
@@ -2,6 +2,7 @@ import pandas as pd
 import plotly.graph_objs as go
 from typing import Optional
 from typeguard import typechecked
+from .report import is_report_enabled, report_figure
 
 
 @typechecked
@@ -25,6 +26,18 @@ def draw_monte_carlo_simulation(
     colour = 'rgba(0,0,100,{a})'
     reference_colour = 'rgba(100,0, 0,{a})'
 
+    sim_string += f"\n * average: ${simulation.iloc[-1]['mean']:.2f}"
+    if draw_stddev:
+        sim_string += f"\n * 95% confidence interval: ${simulation.iloc[-1]['stddev_low']:.2f} to ${simulation.iloc[-1]['stddev_up']:.2f}"
+    if draw_minmax:
+        sim_string += f"\n * 100% interval: ${simulation.iloc[-1]['min']:.2f} to ${simulation.iloc[-1]['max']:.2f}"
+
+    if not is_report_enabled():
+        print(sim_string)
+        if reference is not None:
+            print(f"[{reference_name}] ({years} years) ${reference.iloc[-1]:.2f}")
+        return
+
     plot_list = []
     plot_list.append(
         go.Scatter(
@@ -35,7 +48,6 @@ def draw_monte_carlo_simulation(
             name=simulation_name,
         )
     )
-    sim_string += f"\n * average: ${simulation.iloc[-1]['mean']:.2f}"
 
     if draw_stddev:
         plot_list.append(
@@ -67,7 +79,6 @@ def draw_monte_carlo_simulation(
                 showlegend=False
             )
         )
-        sim_string += f"\n * 95% confidence interval: ${simulation.iloc[-1]['stddev_low']:.2f} to ${simulation.iloc[-1]['stddev_up']:.2f}"
 
     if draw_minmax:
         plot_list.append(
@@ -99,7 +110,6 @@ def draw_monte_carlo_simulation(
                 showlegend=False
             )
         )
-        sim_string += f"\n * 100% interval: ${simulation.iloc[-1]['min']:.2f} to ${simulation.iloc[-1]['max']:.2f}"
 
     if reference is not None:
         plot_list.append(
@@ -118,7 +128,7 @@ def draw_monte_carlo_simulation(
     fig.update_yaxes(title_text=y_title, type="log" if y_log == True else "linear")
     fig.update_layout(title = name)
 
-    fig.show()
+    report_figure(fig, name)
 
     print(sim_string)
     if reference is not None:
@@ -3,6 +3,7 @@ import plotly.graph_objects as go
 from typeguard import typechecked
 from typing import Dict
 from plotly.subplots import make_subplots
+from .report import is_report_enabled, report_figure
 
 
 @typechecked()
@@ -13,6 +14,9 @@ def draw_periodic_return(
         y_title: str = "return in %",
         show: bool = True
 ):
+    if show and not is_report_enabled():
+        return
+
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     for n, d in data.items():
         fig.add_trace(go.Bar(
@@ -27,6 +31,6 @@ def draw_periodic_return(
         title = title,
     )
     if show:
-        fig.show()
+        report_figure(fig, title)
     else:
         return fig
@@ -1,6 +1,7 @@
 import plotly.graph_objects as go
 import pandas as pd
 from typeguard import typechecked
+from .report import is_report_enabled, report_figure
 
 
 @typechecked()
@@ -10,6 +11,9 @@ def draw_risk_reward_chart(
         x_title: str = "Risk",
         y_title: str = "Reward",
 ):
+    if not is_report_enabled():
+        return
+
     layout = go.Layout(
         title=title,
         xaxis=dict(
@@ -30,4 +34,4 @@ def draw_risk_reward_chart(
             textposition="top center",
             text = n,
         ))
-    fig.show()
+    report_figure(fig, title)
@@ -2,6 +2,7 @@ import plotly.graph_objects as go
 import pandas as pd
 from typing import Dict, Optional, List
 from typeguard import typechecked
+from .report import is_report_enabled, report_figure
 
 
 @typechecked()
@@ -14,6 +15,9 @@ def draw_telltale_chart(
         y_range: Optional[List[float]] = None,
         overlapping_only: bool = False,
 ):
+    if not is_report_enabled():
+        return
+
     if overlapping_only:
         all_data = list(data.values()) + [reference]
         first_common_date = max([min(d.index) for d in all_data])
@@ -54,4 +58,4 @@ def draw_telltale_chart(
     if y_range is not None:
         fig.update_yaxes(range=y_range)
 
-    fig.show()
+    report_figure(fig, name)
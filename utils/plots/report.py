@@ -0,0 +1,172 @@
+import atexit
+import os
+import re
+import sys
+import threading
+import traceback
+import plotly.graph_objects as go
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typeguard import typechecked
+from typing import List, Optional, Tuple
+
+
+REPORT_MODES = ["show", "off", "collect", "file"]
+IMAGE_FORMATS = ["html", "png"]
+
+
+class _ReportSettings():
+    def __init__(self):
+        self.mode = os.environ.get("REPORT_MODE", "show")
+        self.output_path = Path(os.environ.get("REPORT_PATH", "reports"))
+        self.image_format = os.environ.get("REPORT_FORMAT", "html")
+        self.max_workers = 4
+        self.lock = threading.Lock()
+        self.counter = 0
+        self.collected: List[Tuple[str, go.Figure]] = []
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.futures: List[Future] = []
+
+
+_settings = _ReportSettings()
+
+
+@typechecked()
+def set_report_mode(
+        mode: str,
+        output_path: Optional[Path] = None,
+        image_format: Optional[str] = None,
+        max_workers: int = 4,
+):
+    """
+    Sets how the plotting helpers handle their figures. The default mode can also be set with the environment
+    variables REPORT_MODE, REPORT_PATH and REPORT_FORMAT.
+
+    The modes are:
+     * show: every figure is shown directly (interactive use).
+     * off: no figure is created at all. Printed and returned values are still calculated.
+     * collect: the figures are kept in memory and can be fetched with 'get_collected_figures'.
+     * file: the figures are written as numbered files into the output directory by background threads.
+
+    :param mode: The report mode (see REPORT_MODES).
+    :param output_path: The output directory of the file mode.
+    :param image_format: The file format of the file mode (see IMAGE_FORMATS). PNG requires the package kaleido.
+    :param max_workers: The number of background threads, which write the files.
+    """
+    assert mode in REPORT_MODES, f"Unknown report mode '{mode}'. Use one of {REPORT_MODES}."
+    if image_format is not None:
+        assert image_format in IMAGE_FORMATS, f"Unknown image format '{image_format}'. Use one of {IMAGE_FORMATS}."
+
+    wait_for_reports()
+    _settings.mode = mode
+    if output_path is not None:
+        _settings.output_path = output_path
+    if image_format is not None:
+        _settings.image_format = image_format
+    _settings.max_workers = max_workers
+
+
+@typechecked()
+def get_report_mode() -> str:
+    """
+    :return: Returns the current report mode (see 'set_report_mode').
+    """
+    assert _settings.mode in REPORT_MODES, f"Unknown report mode '{_settings.mode}'. Use one of {REPORT_MODES}."
+    return _settings.mode
+
+
+@typechecked()
+def is_report_enabled() -> bool:
+    """
+    :return: Returns true, if figures should be created at all. Plotting helpers skip the figure construction
+             otherwise.
+    """
+    return get_report_mode() != "off"
+
+
+def _write_figure(fig: go.Figure, file_path: Path, image_format: str):
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    if image_format == "png":
+        fig.write_image(file_path)
+    else:
+        fig.write_html(file_path, include_plotlyjs="cdn")
+
+
+@typechecked()
+def report_figure(fig: go.Figure, name: Optional[str] = None):
+    """
+    Passes a figure to the current report mode. This replaces 'fig.show()' in all plotting helpers.
+
+    :param fig: The figure.
+    :param name: The name of the figure, which is used for the file name in file mode. Uses the figure title,
+                 if not given.
+    """
+    mode = get_report_mode()
+    if mode == "off":
+        return
+
+    if mode == "show":
+        fig.show()
+        return
+
+    if name is None:
+        name = fig.layout.title.text if fig.layout.title.text is not None else "figure"
+
+    with _settings.lock:
+        _settings.counter += 1
+        counter = _settings.counter
+        if mode == "collect":
+            _settings.collected.append((name, fig))
+            return
+
+        if _settings.executor is None:
+            _settings.executor = ThreadPoolExecutor(max_workers=_settings.max_workers)
+        file_name = f"{counter:04d}_{re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_')[:80]}.{_settings.image_format}"
+        _settings.futures.append(_settings.executor.submit(
+            _write_figure, fig, _settings.output_path / file_name, _settings.image_format
+        ))
+
+
+@typechecked()
+def get_collected_figures(clear: bool = True) -> List[Tuple[str, go.Figure]]:
+    """
+    :param clear: If true, the collected figures are removed from the report.
+    :return: Returns the names and figures, which were collected in collect mode.
+    """
+    with _settings.lock:
+        figures = list(_settings.collected)
+        if clear:
+            _settings.collected.clear()
+    return figures
+
+
+def wait_for_reports():
+    """
+    Waits until all figures of the file mode are written. Errors of the background threads are raised here.
+    This is called automatically at the end of the process, where an error sets the exit code to 1.
+    """
+    with _settings.lock:
+        futures = _settings.futures
+        _settings.futures = []
+        executor = _settings.executor
+        _settings.executor = None
+
+    for future in futures:
+        future.result()
+    if executor is not None:
+        executor.shutdown()
+
+
+def _wait_for_reports_at_exit():
+    # Exceptions of exit handlers are only printed, thus a failed figure would not change the exit code and a
+    # pipeline would treat the script as successful
+    try:
+        wait_for_reports()
+    except Exception:
+        traceback.print_exc()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(1)
+
+
+atexit.register(_wait_for_reports_at_exit)